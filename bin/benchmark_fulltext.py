@@ -0,0 +1,127 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Compare LIKE and FULLTEXT search latencies on a synthetic dataset.
+
+The script creates a scratch copy of fulltext_record_properties with the
+fulltext index, fills it with random records and runs the same search terms
+with and without the index. The scratch table is dropped at the end.
+
+Usage:
+  python bin/benchmark_fulltext.py [record_count]
+"""
+
+import random
+import sys
+import time
+
+import sqlalchemy as sa
+
+import ggrc.app  # noqa pylint: disable=unused-import
+from ggrc import db
+from ggrc.fulltext import mysql
+
+TABLE_NAME = "fulltext_benchmark_records"
+INSERT_CHUNK_SIZE = 10000
+REPEAT_COUNT = 5
+SEARCH_TERMS = (
+    u"control",
+    u"audit evidence",
+    u"quarterly access review",
+    u"nonexistingword",
+)
+WORDS = (
+    u"access", u"account", u"approval", u"asset", u"audit", u"backup",
+    u"change", u"compliance", u"control", u"data", u"evidence", u"finance",
+    u"incident", u"inventory", u"key", u"management", u"monitoring",
+    u"network", u"password", u"payroll", u"policy", u"process", u"quarterly",
+    u"recovery", u"report", u"review", u"risk", u"security", u"system",
+    u"vendor",
+)
+PROPERTIES = (u"title", u"description", u"notes", u"slug")
+
+
+def create_table():
+  """Create scratch table with the same schema and indexes."""
+  db.session.execute("DROP TABLE IF EXISTS {}".format(TABLE_NAME))
+  db.session.execute("CREATE TABLE {} LIKE fulltext_record_properties".format(
+      TABLE_NAME
+  ))
+  db.session.commit()
+
+
+def _random_content():
+  """Get random content of a record."""
+  return u" ".join(random.choice(WORDS) for _ in range(random.randint(2, 30)))
+
+
+def fill_table(record_count):
+  """Insert record_count random records into the scratch table."""
+  table = sa.table(
+      TABLE_NAME,
+      sa.column("key"),
+      sa.column("type"),
+      sa.column("property"),
+      sa.column("subproperty"),
+      sa.column("content"),
+  )
+  for start in range(0, record_count, INSERT_CHUNK_SIZE):
+    rows = [{
+        "key": idx // len(PROPERTIES) + 1,
+        "type": u"Control",
+        "property": PROPERTIES[idx % len(PROPERTIES)],
+        "subproperty": u"",
+        "content": _random_content(),
+    } for idx in range(start, min(start + INSERT_CHUNK_SIZE, record_count))]
+    db.session.execute(table.insert(), rows)
+    db.session.commit()
+
+
+def _run(where, params):
+  """Run search query and return duration and count of found records."""
+  started = time.time()
+  count = db.session.execute(
+      "SELECT COUNT(*) FROM {} WHERE {}".format(TABLE_NAME, where), params
+  ).scalar()
+  return time.time() - started, count
+
+
+def benchmark(terms):
+  """Print median LIKE and FULLTEXT latencies for the terms."""
+  tokens = mysql.get_search_tokens(terms)
+  match = u" ".join(u"+{}*".format(token) for token in tokens)
+  like = u"%{}%".format(terms)
+  queries = (
+      ("LIKE", "content LIKE :like"),
+      ("FULLTEXT", "MATCH (content) AGAINST (:match IN BOOLEAN MODE) "
+                   "AND content LIKE :like"),
+  )
+  for name, where in queries:
+    results = [_run(where, {"like": like, "match": match})
+               for _ in range(REPEAT_COUNT)]
+    durations = sorted(duration for duration, _ in results)
+    print u"{:<28} {:<9} {:>9.4f}s {:>9} records".format(
+        terms, name, durations[len(durations) // 2], results[0][1],
+    )
+
+
+def main():
+  """Create dataset, run benchmarks and clean up."""
+  record_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+  create_table()
+  try:
+    started = time.time()
+    fill_table(record_count)
+    print "Inserted {} records in {:.1f}s".format(
+        record_count, time.time() - started
+    )
+    for terms in SEARCH_TERMS:
+      benchmark(terms)
+  finally:
+    db.session.rollback()
+    db.session.execute("DROP TABLE IF EXISTS {}".format(TABLE_NAME))
+    db.session.commit()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,94 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Compare serial and concurrent Issue Tracker bulk synchronization.
+
+Requests are served by the Issue Tracker urlfetch mock with added latency,
+a part of requests is answered with 429 to exercise the rate limiter. No
+database is needed, only the request phase of bulk sync is measured.
+
+Usage:
+  python bin/benchmark_issuetracker_sync.py [issues_count] [latency_ms]
+      [rate_limited_percent]
+"""
+
+import logging
+import random
+import sys
+import threading
+import time
+
+import mock
+from google.appengine.api import apiproxy_stub_map
+
+from ggrc import settings
+from ggrc.integrations import issuetracker_bulk_sync
+from ggrc.utils import issue_tracker_mock
+
+WORKERS = (1, 2, 4, 8)
+
+
+class SlowFetchServiceMock(issue_tracker_mock.FetchServiceMock):
+  """Issue Tracker mock with latency and rate limited responses."""
+
+  def __init__(self, latency, rate_limited):
+    super(SlowFetchServiceMock, self).__init__()
+    self.latency = latency
+    self.rate_limited = rate_limited
+    self.requests_count = 0
+    self._lock = threading.Lock()
+
+  # pylint: disable=invalid-name
+  def _Dynamic_Fetch(self, request, response):
+    """Answer request after latency, some of them with 429 status."""
+    with self._lock:
+      self.requests_count += 1
+    time.sleep(self.latency)
+    if random.random() < self.rate_limited:
+      response.set_content("Rate limited")
+      response.set_statuscode(429)
+    else:
+      response.set_content(self.mock_response_issue)
+      response.set_statuscode(200)
+    header = response.add_header()
+    header.set_key('Content-type')
+    header.set_value('application/json')
+    response.set_finalurl(request.url())
+    response.set_contentwastruncated(False)
+
+
+def benchmark(fetch_mock, issues_count, workers):
+  """Print duration of synchronization of issues_count issues."""
+  fetch_mock.requests_count = 0
+  creator = issuetracker_bulk_sync.IssueTrackerBulkCreator()
+  jobs = [({"title": "Issue {}".format(i)}, None)
+          for i in range(issues_count)]
+  with mock.patch.object(settings, "ISSUE_TRACKER_BULK_SYNC_WORKERS",
+                         workers):
+    started = time.time()
+    results = creator.sync_issues(jobs)
+    duration = time.time() - started
+  failed = len([error for _, error in results if error])
+  print u"{:>8} {:>9.2f}s {:>9} {:>7}".format(
+      workers, duration, fetch_mock.requests_count, failed,
+  )
+
+
+def main():
+  """Run benchmark for several numbers of workers."""
+  issues_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+  latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.2
+  rate_limited = float(sys.argv[3]) / 100 if len(sys.argv) > 3 else 0.05
+  # Rate limited requests are logged as errors, they are expected here.
+  logging.disable(logging.ERROR)
+  fetch_mock = SlowFetchServiceMock(latency, rate_limited)
+  apiproxy_stub_map.apiproxy.ReplaceStub('urlfetch', fetch_mock)
+  print u"{:>8} {:>10} {:>9} {:>7}".format(
+      "workers", "duration", "requests", "failed",
+  )
+  for workers in WORKERS:
+    benchmark(fetch_mock, issues_count, workers)
+
+
+if __name__ == "__main__":
+  main()
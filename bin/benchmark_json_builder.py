@@ -0,0 +1,77 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Compare JSON publishing with and without compiled attribute publishers.
+
+The script loads up to object_count objects of every model with a REST
+service from the current database, publishes them with both builder
+implementations, checks that the results are equal and prints median
+durations per model.
+
+Usage:
+  python bin/benchmark_json_builder.py [object_count]
+"""
+
+import sys
+import time
+
+import mock
+
+from ggrc.app import app
+from ggrc import settings
+from ggrc import utils
+from ggrc.builder import json
+from ggrc.models import all_models
+
+REPEAT_COUNT = 5
+
+
+def _publish(objects, compiled):
+  """Publish objects and return duration and published representation."""
+  with mock.patch.object(settings, "COMPILED_JSON_BUILDER", compiled):
+    started = time.time()
+    published = [json.publish(obj) for obj in objects]
+    duration = time.time() - started
+  return duration, json.publish_representation(published)
+
+
+def _median(durations):
+  return sorted(durations)[len(durations) // 2]
+
+
+def benchmark(model, object_count):
+  """Print median publish durations of the model objects."""
+  objects = model.eager_query().limit(object_count).all()
+  if not objects:
+    return
+  # Warm up builders and compiled publishers.
+  dynamic = _publish(objects, False)[1]
+  compiled = _publish(objects, True)[1]
+  if dynamic != compiled:
+    print u"{:<28} published values differ".format(model.__name__)
+  dynamic_durations = [_publish(objects, False)[0]
+                       for _ in range(REPEAT_COUNT)]
+  compiled_durations = [_publish(objects, True)[0]
+                        for _ in range(REPEAT_COUNT)]
+  dynamic_time = _median(dynamic_durations)
+  compiled_time = _median(compiled_durations)
+  print u"{:<28} {:>6} objects {:>9.4f}s {:>9.4f}s {:>7.2f}x".format(
+      model.__name__, len(objects), dynamic_time, compiled_time,
+      dynamic_time / compiled_time if compiled_time else 0,
+  )
+
+
+def main():
+  """Run benchmarks for all models with REST services."""
+  object_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+  print u"{:<28} {:>14} {:>10} {:>10} {:>8}".format(
+      "model", "", "dynamic", "compiled", "speedup",
+  )
+  with app.test_request_context():
+    for model in sorted(all_models.all_models, key=lambda m: m.__name__):
+      if hasattr(model, "eager_query") and utils.service_for(model.__name__):
+        benchmark(model, object_count)
+
+
+if __name__ == "__main__":
+  main()
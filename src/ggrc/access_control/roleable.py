@@ -42,6 +42,7 @@ class Roleable(object):
   # _access_control_list in this file which gives off a false warning.
 
   _update_raw = ['access_control_list', ]
+  _log_json_preload = ['_access_control_list.access_control_people.person']
   _fulltext_attrs = [CustomRoleAttr('access_control_list'), ]
   _api_attrs = reflection.ApiAttributes(
       reflection.Attribute('access_control_list', True, True, True))
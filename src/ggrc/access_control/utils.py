@@ -35,6 +35,9 @@ def insert_select_acls(select_statement):
       parent_id,
       parent_id_nn,
       base_id,
+
+  Returns:
+    number of selected acl records.
   """
 
   acl_table = all_models.AccessControlList.__table__
@@ -89,3 +92,4 @@ def insert_select_acls(select_statement):
         logger.exception(error)
       else:
         inserted_successfully = True
+  return len(to_insert)
@@ -3,6 +3,7 @@
 
 """Automapper generator."""
 
+import collections
 from datetime import datetime
 import logging
 
@@ -10,6 +11,7 @@ import sqlalchemy as sa
 import flask
 
 from ggrc import db
+from ggrc import utils
 from ggrc.automapper import rules
 from ggrc import login
 from ggrc.models.audit import Audit
@@ -36,6 +38,7 @@ class AutomapperGenerator(object):
   """
 
   COUNT_LIMIT = 10000
+  PREFETCH_CHUNK_SIZE = 1000
 
   def __init__(self):
     self.processed = set()
@@ -43,6 +46,10 @@ class AutomapperGenerator(object):
     self.auto_mappings = set()
     self.automapping_ids = set()
     self.related_cache = RelationshipsCache()
+    # Automappings are inserted after all relationships are processed, so
+    # the edges generated so far are kept here for neighborhood fetches.
+    self.generated_edges = collections.defaultdict(set)
+    self._allowed_update = {}
 
   def related(self, obj):
     """Return obj's relationship stubs"""
@@ -53,17 +60,68 @@ class AutomapperGenerator(object):
     # results in a few steps. This drastically reduces number of queries.
     stubs = {s for rel in self.queue for s in rel}
     stubs.add(obj)
-    self.related_cache.populate_cache(stubs)
+    self._populate(stubs)
 
     return self.related_cache.cache[obj]
 
+  def _populate(self, stubs):
+    """Fetch neighborhood of stubs including not yet inserted automappings."""
+    self.related_cache.populate_cache(stubs)
+    for stub in stubs:
+      if stub in self.generated_edges:
+        self.related_cache.cache[stub].update(self.generated_edges[stub])
+
+  def prefetch(self, stubs):
+    """Fetch neighborhood of all stubs missing in the related cache."""
+    stubs = [stub for stub in stubs if stub not in self.related_cache.cache]
+    for stubs_chunk in utils.list_chunks(stubs,
+                                         chunk_size=self.PREFETCH_CHUNK_SIZE):
+      self._populate(set(stubs_chunk))
+      # Neighborhood of queried stubs is complete even if it is empty.
+      for stub in stubs_chunk:
+        self.related_cache.cache[stub]  # pylint: disable=pointless-statement
+
   @staticmethod
   def order(src, dst):
     return (src, dst) if src < dst else (dst, src)
 
+  def is_allowed_update(self, stub):
+    """Check update permission for stub once per generator."""
+    if stub not in self._allowed_update:
+      self._allowed_update[stub] = permissions.is_allowed_update(
+          stub.type, stub.id, None
+      )
+    return self._allowed_update[stub]
+
   def generate_automappings(self, relationship):
     """Generate Automappings for a given relationship"""
-    # pylint: disable=protected-access
+    self.generate_automappings_for([relationship])
+
+  def generate_automappings_for(self, relationships):
+    """Generate Automappings for all given relationships.
+
+    Neighborhood of all relationship ends is fetched at once and mappings
+    generated for all relationships are inserted together.
+    """
+    with benchmark("Automapping generate_automappings_for"):
+      self.prefetch({
+          stub for relationship in relationships
+          for stub in (Stub.from_source(relationship),
+                       Stub.from_destination(relationship))
+      })
+      generated = []
+      for relationship in relationships:
+        auto_mappings = self._generate(relationship)
+        if auto_mappings:
+          generated.append((relationship, auto_mappings))
+      self._flush(generated)
+
+  def _generate(self, relationship):
+    """Generate automappings for a single relationship.
+
+    Returns:
+      set of ordered (src, dst) pairs or None if COUNT_LIMIT was exceeded.
+    """
     self.auto_mappings = set()
     with benchmark("Automapping generate_automappings"):
       # initial relationship is special since it is already created and
@@ -84,8 +142,8 @@ class AutomapperGenerator(object):
           # Since Issue-Assessment-Audit is the only rule that
           # triggers Issue to Audit mapping, we should skip the
           # permission check for it
-          if not (permissions.is_allowed_update(src.type, src.id, None) and
-                  permissions.is_allowed_update(dst.type, dst.id, None)):
+          if not (self.is_allowed_update(src) and
+                  self.is_allowed_update(dst)):
             continue
 
         created = self._ensure_relationship(src, dst)
@@ -97,56 +155,88 @@ class AutomapperGenerator(object):
         self._step(src, dst)
         self._step(dst, src)
 
-      if len(self.auto_mappings) <= self.COUNT_LIMIT:
-        self._flush(relationship)
-      else:
+      if len(self.auto_mappings) > self.COUNT_LIMIT:
         logger.error("Automapping limit exceeded: limit=%s, count=%s",
                      self.COUNT_LIMIT, len(self.auto_mappings))
+        self._discard(self.auto_mappings)
+        return None
+      return self.auto_mappings
+
+  def _discard(self, auto_mappings):
+    """Forget edges of automappings that will not be inserted.
 
-  def _flush(self, parent_relationship):
-    """Manually INSERT generated automappings."""
-    if not self.auto_mappings:
+    Otherwise automappings generated for other relationships would treat
+    these edges as existing ones and skip them.
+    """
+    self.queue.clear()
+    for src, dst in auto_mappings:
+      self.processed.discard((src, dst))
+      for stub, related in ((src, dst), (dst, src)):
+        self.generated_edges[stub].discard(related)
+        if stub in self.related_cache.cache:
+          self.related_cache.cache[stub].discard(related)
+
+  @staticmethod
+  def _insert_automapping(parent_relationship):
+    """Insert Automapping entry for the parent relationship."""
+    automapping_result = db.session.execute(
+        Automapping.__table__.insert().values(
+            relationship_id=parent_relationship.id,
+            source_id=parent_relationship.source_id,
+            source_type=parent_relationship.source_type,
+            destination_id=parent_relationship.destination_id,
+            destination_type=parent_relationship.destination_type,
+        )
+    )
+    return automapping_result.inserted_primary_key[0]
+
+  def _flush(self, generated):
+    """Manually INSERT generated automappings.
+
+    Args:
+      generated: list of (parent relationship, automappings) tuples.
+    """
+    if not generated:
       return
     with benchmark("Automapping flush"):
       current_user_id = login.get_current_user_id()
-      automapping_result = db.session.execute(
-          Automapping.__table__.insert().values(
-              relationship_id=parent_relationship.id,
-              source_id=parent_relationship.source_id,
-              source_type=parent_relationship.source_type,
-              destination_id=parent_relationship.destination_id,
-              destination_type=parent_relationship.destination_type,
-          )
-      )
-      automapping_id = automapping_result.inserted_primary_key[0]
-      self.automapping_ids.add(automapping_id)
       now = datetime.utcnow()
+      automapping_ids = []
+      values = []
+      for parent_relationship, auto_mappings in generated:
+        automapping_id = self._insert_automapping(parent_relationship)
+        automapping_ids.append(automapping_id)
+        original = self.order(Stub.from_source(parent_relationship),
+                              Stub.from_destination(parent_relationship))
+        values.extend({
+            "id": None,
+            "modified_by_id": current_user_id,
+            "created_at": now,
+            "updated_at": now,
+            "source_id": src.id,
+            "source_type": src.type,
+            "destination_id": dst.id,
+            "destination_type": dst.type,
+            "context_id": None,
+            "status": None,
+            "parent_id": parent_relationship.id,
+            "automapping_id": automapping_id,
+            "is_external": False}
+            for src, dst in auto_mappings
+            if (src, dst) != original)  # (src, dst) is sorted
+      self.automapping_ids.update(automapping_ids)
+
       # We are doing an INSERT IGNORE INTO here to mitigate a race condition
       # that happens when multiple simultaneous requests create the same
       # automapping. If a relationship object fails our unique constraint
       # it means that the mapping was already created by another request
       # and we can safely ignore it.
       inserter = Relationship.__table__.insert().prefix_with("IGNORE")
-      original = self.order(Stub.from_source(parent_relationship),
-                            Stub.from_destination(parent_relationship))
-      db.session.execute(inserter.values([{
-          "id": None,
-          "modified_by_id": current_user_id,
-          "created_at": now,
-          "updated_at": now,
-          "source_id": src.id,
-          "source_type": src.type,
-          "destination_id": dst.id,
-          "destination_type": dst.type,
-          "context_id": None,
-          "status": None,
-          "parent_id": parent_relationship.id,
-          "automapping_id": automapping_id,
-          "is_external": False}
-          for src, dst in self.auto_mappings
-          if (src, dst) != original]))  # (src, dst) is sorted
-
-      self._set_audit_id_for_issues(automapping_id)
+      for values_chunk in utils.list_chunks(values,
+                                            chunk_size=self.COUNT_LIMIT):
+        db.session.execute(inserter.values(values_chunk))
+
+      self._set_audit_id_for_issues(automapping_ids)
 
       cache = Cache.get_cache(create=True)
       if cache:
@@ -154,9 +244,9 @@ class AutomapperGenerator(object):
         # so that they will be logged within event and appropriate revisions
         # will be created.
         cache.new.update(
-            (relationship, relationship.log_json())
-            for relationship in Relationship.query.filter_by(
-                automapping_id=automapping_id,
+            (relationship, None)
+            for relationship in Relationship.query.filter(
+                Relationship.automapping_id.in_(automapping_ids),
             )
         )
 
@@ -175,7 +265,7 @@ class AutomapperGenerator(object):
     acl.add_relationships(relationship_ids)
 
   @staticmethod
-  def _set_audit_id_for_issues(automapping_id):
+  def _set_audit_id_for_issues(automapping_ids):
     """Set audit_id and context_id in automapped Issues."""
     iss, rel, aud = Issue.__table__, Relationship.__table__, Audit.__table__
     db.session.execute(
@@ -186,7 +276,7 @@ class AutomapperGenerator(object):
         })
         .where(
             sa.and_(
-                rel.c.automapping_id == automapping_id,
+                rel.c.automapping_id.in_(automapping_ids),
                 rel.c.source_type == Audit.__name__,
                 rel.c.source_id == aud.c.id,
                 rel.c.destination_type == Issue.__name__,
@@ -223,6 +313,8 @@ class AutomapperGenerator(object):
     self._check_single_audit_restriction(src, dst)
 
     self.auto_mappings.add((src, dst))
+    self.generated_edges[src].add(dst)
+    self.generated_edges[dst].add(src)
 
     if src in self.related_cache.cache:
       self.related_cache.cache[src].add(dst)
@@ -262,8 +354,7 @@ def register_automapping_listeners():
         del flask.g.referenced_object_stubs
       if hasattr(flask.g, "_request_permissions"):
         del flask.g._request_permissions
-      for obj in relationships:
-        automapper.generate_automappings(obj)
+      automapper.generate_automappings_for(relationships)
       automapper.propagate_acl()
       if referenced_objects:
         flask.g.referenced_object_stubs = referenced_objects
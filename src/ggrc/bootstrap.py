@@ -52,6 +52,8 @@ def get_db():  # noqa
 
   database.session.commit_hooks_enable_flag = CommitHooksEnableFlag()
 
+  database.session.commit_enable_flag = CommitHooksEnableFlag()
+
   def pre_commit_hooks():
     """All pre commit hooks handler."""
     with benchmark("pre commit hooks"):
@@ -83,7 +85,13 @@ def get_db():  # noqa
 
     This function is meant for a single after commit hook that should only be
     used for ACL propagation.
+
+    If commits are disabled, changes are only flushed. The code that disabled
+    commits is responsible for committing them and running the hooks.
     """
+    if not database.session.commit_enable_flag:
+      database.session.flush()
+      return
     database.session.pre_commit_hooks()
     with benchmark("plain commit"):
       database.session.plain_commit(*args, **kwargs)
@@ -20,6 +20,7 @@ import ggrc.builder
 import ggrc.models
 import ggrc.services
 from ggrc import db
+from ggrc import settings
 from ggrc.login import get_current_user_id
 from ggrc.models.reflection import AttributeInfo
 from ggrc.models.types import JsonType
@@ -515,9 +516,104 @@ def publish_representation(resource):
   return reify_representation(resource, results, type_columns)
 
 
+# Attribute publishers compiled per model class and attribute name.
+_ATTR_PUBLISHERS = {}
+
+# Inclusions come from request arguments, so the number of compiled publish
+# plans kept per builder is bounded.
+MAX_PUBLISH_PLANS = 100
+
+
+def _get_custom_publish(cls, attr_name):
+  """Get custom publish function of the class or its direct bases."""
+  if attr_name in getattr(cls, '_custom_publish', {}):
+    return cls._custom_publish[attr_name]
+  for base in cls.__bases__:
+    if attr_name in getattr(base, '_custom_publish', {}):
+      return base._custom_publish[attr_name]
+  return None
+
+
+def _compile_attr_publisher(cls, attr_name):  # noqa
+  """Build a function publishing the attribute of objects of the class.
+
+  All decisions that depend only on the class attribute are made once here,
+  the returned function does the same as Builder.publish_attr for the
+  attribute but only reads the object values.
+
+  Returns:
+    function with (builder, obj, inclusions, include, inclusion_filter)
+    arguments.
+  """
+  # pylint: disable=unused-argument
+  custom_publish = _get_custom_publish(cls, attr_name)
+  if custom_publish is not None:
+    def publish_custom(builder, obj, inclusions, include, inclusion_filter):
+      return custom_publish(obj)
+    return publish_custom
+
+  class_attr = getattr(cls, attr_name)
+
+  if isinstance(class_attr, AssociationProxy):
+    if getattr(class_attr, 'publish_raw', False):
+      def publish_raw(builder, obj, inclusions, include, inclusion_filter):
+        published_attr = getattr(obj, attr_name)
+        if hasattr(published_attr, "copy"):
+          return published_attr.copy()
+        return published_attr
+      return publish_raw
+
+    def publish_proxy(builder, obj, inclusions, include, inclusion_filter):
+      return builder.publish_association_proxy(
+          obj, class_attr, inclusions, include, inclusion_filter)
+    return publish_proxy
+
+  if (isinstance(class_attr, InstrumentedAttribute) and
+          isinstance(class_attr.property, RelationshipProperty)):
+    def publish_relationship(builder, obj, inclusions, include,
+                             inclusion_filter):
+      return builder.publish_relationship(
+          obj, attr_name, class_attr, inclusions, include, inclusion_filter)
+    return publish_relationship
+
+  if class_attr.__class__.__name__ == 'property':
+    id_attr = '{0}_id'.format(attr_name)
+    type_attr = '{0}_type'.format(attr_name)
+
+    def publish_property(builder, obj, inclusions, include, inclusion_filter):
+      if not inclusions or include:
+        if getattr(obj, id_attr):
+          return LazyStubRepresentation(
+              getattr(obj, type_attr), getattr(obj, id_attr))
+        return None
+      return builder.publish_link(
+          obj, attr_name, inclusions, include, inclusion_filter)
+    return publish_property
+
+  def publish_value(builder, obj, inclusions, include, inclusion_filter):
+    return getattr(obj, attr_name)
+  return publish_value
+
+
+def get_attr_publisher(cls, attr_name):
+  """Get compiled publisher of the attribute of the class."""
+  key = (cls, attr_name)
+  publisher = _ATTR_PUBLISHERS.get(key)
+  if publisher is None:
+    publisher = _compile_attr_publisher(cls, attr_name)
+    _ATTR_PUBLISHERS[key] = publisher
+  return publisher
+
+
 class Builder(AttributeInfo):
   """JSON Dictionary builder for ggrc.models.* objects and their mixins."""
 
+  def __init__(self, tgt_class):
+    super(Builder, self).__init__(tgt_class)
+    # Compiled lists of attributes to publish per model class, inclusions
+    # and attribute whitelist.
+    self._publish_plans = {}
+
   def generate_link_object_for(
           self, obj, inclusions, include, inclusion_filter):
     """Generate a link object for this object. If there are property paths
@@ -535,8 +631,12 @@ class Builder(AttributeInfo):
         attr_name, remaining_path = path[0], path[1:]
       else:
         attr_name, remaining_path = path, ()
-      result[attr_name] = self.publish_attr(
-          obj, attr_name, remaining_path, include, inclusion_filter)
+      if settings.COMPILED_JSON_BUILDER:
+        result[attr_name] = get_attr_publisher(obj.__class__, attr_name)(
+            self, obj, remaining_path, include, inclusion_filter)
+      else:
+        result[attr_name] = self.publish_attr(
+            obj, attr_name, remaining_path, include, inclusion_filter)
     return result
 
   def publish_link_collection(
@@ -720,9 +820,51 @@ class Builder(AttributeInfo):
     """
     inclusions = tuple((attr,) for attr in self._include_links)
     inclusions = tuple(set(inclusions).union(set(extra_inclusions)))
-    return self._publish_attrs_for(
-        obj, self._publish_attrs, json_obj, inclusions, inclusion_filter,
-        attribute_whitelist)
+    if not settings.COMPILED_JSON_BUILDER:
+      return self._publish_attrs_for(
+          obj, self._publish_attrs, json_obj, inclusions, inclusion_filter,
+          attribute_whitelist)
+    plan = self._get_publish_plan(obj.__class__, inclusions,
+                                  attribute_whitelist)
+    for attr_name, publisher, local_inclusions, include in plan:
+      json_obj[attr_name] = publisher(
+          self, obj, local_inclusions, include, inclusion_filter)
+
+  def _get_publish_plan(self, cls, inclusions, attribute_whitelist):
+    """Get compiled list of attributes to publish for objects of the class.
+
+    Returns:
+      list of (attr_name, publisher, inclusions, include) tuples with the
+      same arguments _publish_attrs_for passes to publish_attr.
+    """
+    whitelist = frozenset(attribute_whitelist or ())
+    key = (cls, inclusions, whitelist)
+    plan = self._publish_plans.get(key)
+    if plan is not None:
+      return plan
+    plan = []
+    for attr in self._publish_attrs:
+      if hasattr(attr, '__call__'):
+        attr_name = attr.attr_name
+      else:
+        attr_name = attr
+      if whitelist and attr_name not in whitelist:
+        continue
+      local_inclusion = ()
+      for inclusion in inclusions:
+        if inclusion[0] == attr_name:
+          local_inclusion = inclusion
+          break
+      plan.append((
+          attr_name,
+          get_attr_publisher(cls, attr_name),
+          local_inclusion[1:],
+          len(local_inclusion) > 0,
+      ))
+    if len(self._publish_plans) >= MAX_PUBLISH_PLANS:
+      self._publish_plans.clear()
+    self._publish_plans[key] = plan
+    return plan
 
   @classmethod
   def do_update_attrs(cls, obj, json_obj, attrs):
@@ -0,0 +1,233 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Two tier cache of serialized objects returned by collection GET.
+
+Every cached object has two memcache entries: a version stored under the
+object cache key and the serialized object stored with that version under
+the data key. Versions of missing objects are added before the objects are
+loaded from the database and the objects are stored with these versions.
+Invalidation deletes only the version entry, so objects loaded before an
+invalidation are stored with an old version and skipped on read. Objects
+with DeleteOp status entries of writes in progress are not cached.
+
+Serialized objects embed related objects that are not always invalidated
+with them, all entries therefore expire after OBJECT_CACHE_TTL seconds.
+
+The second tier is a size bound LRU cache in the process memory, it keeps
+serialized objects with their versions. Objects are taken from it if the
+version in memcache has not changed, so only versions are transferred from
+memcache for objects that are read often.
+"""
+
+import collections
+import logging
+import random
+import threading
+import time
+
+from ggrc import settings
+
+
+logger = logging.getLogger(__name__)
+
+DATA_KEY_TMPL = u"{}:data"
+
+# Status entry added by update_memcache_before_commit for modified objects.
+DELETE_OP_KEY_TMPL = u"DeleteOp:{}"
+
+# Cache statistics per resource type, e.g. OBJECT_CACHE_STATS["controls"].
+# These are collected per process and shown by /admin/cache_stats.
+OBJECT_CACHE_STATS = collections.defaultdict(collections.Counter)
+
+
+class LocalLRUCache(object):
+  """Size bound least recently used cache shared by threads of a process."""
+
+  def __init__(self, size):
+    self.size = size
+    self._data = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key):
+    """Get value for key and mark it as recently used."""
+    with self._lock:
+      value = self._data.pop(key, None)
+      if value is not None:
+        self._data[key] = value
+      return value
+
+  def set(self, key, value):
+    """Store value for key evicting least recently used values."""
+    if self.size <= 0:
+      return
+    with self._lock:
+      self._data.pop(key, None)
+      self._data[key] = value
+      while len(self._data) > self.size:
+        self._data.popitem(last=False)
+
+  def clear(self):
+    with self._lock:
+      self._data.clear()
+
+
+LOCAL_CACHE = LocalLRUCache(settings.OBJECT_CACHE_LOCAL_SIZE)
+
+
+def _new_version():
+  """Get random version for a new cache entry."""
+  return random.getrandbits(62)
+
+
+def _get_resource_type(key):
+  """Get resource type from object cache key, e.g. collection:controls:1."""
+  parts = key.split(":")
+  return parts[1] if len(parts) > 2 else key
+
+
+def get_stats():
+  """Get hit ratio and read latency of object cache per resource type."""
+  stats = {}
+  for resource_type, counter in OBJECT_CACHE_STATS.iteritems():
+    hits = counter["local_hits"] + counter["memcache_hits"]
+    total = hits + counter["misses"]
+    gets = counter["gets"]
+    stats[resource_type] = {
+        "local_hits": counter["local_hits"],
+        "memcache_hits": counter["memcache_hits"],
+        "misses": counter["misses"],
+        "blocked": counter["blocked"],
+        "hit_ratio": float(hits) / total if total else 0,
+        "avg_get_time": counter["get_time"] / gets if gets else 0,
+    }
+  return stats
+
+
+class ObjectCache(object):
+  """Batched access to cached objects for a single request."""
+
+  def __init__(self, memcache_client):
+    self.memcache_client = memcache_client
+    # Versions of objects missing in cache that were read or added before
+    # the objects are loaded from the database.
+    self._versions = {}
+
+  def get_multi(self, keys):
+    """Get serialized objects for keys with batched memcache calls.
+
+    Versions of objects that are not found are reserved for add_multi.
+
+    Returns:
+      dict with keys of found objects and their serialized values.
+    """
+    if not keys:
+      return {}
+    started = time.time()
+    delete_op_keys = {DELETE_OP_KEY_TMPL.format(key): key for key in keys}
+    versions = self.memcache_client.get_multi(keys + delete_op_keys.keys())
+    blocked = {key for delete_op_key, key in delete_op_keys.iteritems()
+               if delete_op_key in versions}
+    result = {}
+    local_hits = set()
+    missing = []
+    new_versions = {}
+    replace_versions = {}
+    for key in keys:
+      version = versions.get(key)
+      if key in blocked:
+        continue
+      if version is None:
+        new_versions[key] = _new_version()
+        continue
+      if not isinstance(version, (int, long)):
+        # Value written by an older version of the application.
+        replace_versions[key] = _new_version()
+        continue
+      cached = LOCAL_CACHE.get(key)
+      if cached is not None and cached[0] == version:
+        result[key] = cached[1]
+        local_hits.add(key)
+      else:
+        missing.append(key)
+
+    if missing:
+      data = self.memcache_client.get_multi(
+          [DATA_KEY_TMPL.format(key) for key in missing]
+      )
+      for key in missing:
+        entry = data.get(DATA_KEY_TMPL.format(key))
+        if entry is not None and entry[0] == versions[key]:
+          result[key] = entry[1]
+          LOCAL_CACHE.set(key, entry)
+        else:
+          self._versions[key] = versions[key]
+
+    self._reserve_versions(new_versions, replace_versions)
+    self._update_stats(keys, result, local_hits, blocked,
+                       time.time() - started)
+    return result
+
+  def _reserve_versions(self, new_versions, replace_versions):
+    """Store versions for objects that are going to be loaded.
+
+    Versions added by other requests in the meantime are not reserved.
+    """
+    ttl = settings.OBJECT_CACHE_TTL
+    not_stored = set()
+    if new_versions:
+      not_stored.update(
+          self.memcache_client.add_multi(new_versions, time=ttl) or []
+      )
+    if replace_versions:
+      not_stored.update(
+          self.memcache_client.set_multi(replace_versions, time=ttl) or []
+      )
+    for versions in (new_versions, replace_versions):
+      self._versions.update(
+          (key, version) for key, version in versions.iteritems()
+          if key not in not_stored
+      )
+
+  def add_multi(self, values):
+    """Add serialized objects with reserved versions to both cache tiers.
+
+    Objects without a version reserved by get_multi are skipped.
+
+    Args:
+      values: dict with object cache keys and serialized objects.
+    """
+    entries = {
+        key: (self._versions[key], value)
+        for key, value in values.iteritems() if key in self._versions
+    }
+    if not entries:
+      return
+    self.memcache_client.set_multi({
+        DATA_KEY_TMPL.format(key): entry for key, entry in entries.iteritems()
+    }, time=settings.OBJECT_CACHE_TTL)
+    for key, entry in entries.iteritems():
+      LOCAL_CACHE.set(key, entry)
+
+  @staticmethod
+  def _update_stats(keys, result, local_hits, blocked, duration):
+    """Update hit and latency counters per resource type."""
+    resource_types = set()
+    for key in keys:
+      resource_type = _get_resource_type(key)
+      resource_types.add(resource_type)
+      counter = OBJECT_CACHE_STATS[resource_type]
+      if key in local_hits:
+        counter["local_hits"] += 1
+      elif key in result:
+        counter["memcache_hits"] += 1
+      else:
+        counter["misses"] += 1
+        if key in blocked:
+          counter["blocked"] += 1
+    for resource_type in resource_types:
+      OBJECT_CACHE_STATS[resource_type]["gets"] += 1
+      OBJECT_CACHE_STATS[resource_type]["get_time"] += duration
+    logger.debug("Object cache: %s of %s objects found, %s in local cache, "
+                 "%s blocked", len(result), len(keys), len(local_hits),
+                 len(blocked))
@@ -0,0 +1,114 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Approximate object counts per model.
+
+Total counts of objects are kept in memcache counters. Counters are created
+from a COUNT query, changed by the number of created and deleted objects
+after every commit and expire after OBJECT_COUNTS_MAX_AGE seconds, so writes
+that bypass the session are reflected with at most that delay.
+
+Counts for users without system wide read access are the sizes of resource
+id sets in their cached permissions, no queries are needed for them.
+"""
+
+import collections
+
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc import settings
+from ggrc.cache import utils as cache_utils
+from ggrc.rbac import permissions
+from ggrc.utils import helpers
+
+
+COUNT_KEY_TMPL = "object_count:{}"
+
+DELTAS_KEY = "object_count_deltas"
+
+
+def _get_client():
+  """Get memcache client or None if memcache is not used."""
+  if not getattr(settings, "MEMCACHE_MECHANISM", False):
+    return None
+  return cache_utils.get_cache_manager().cache_object.memcache_client
+
+
+def get_total_counts(models):
+  """Get total counts of objects for the given models.
+
+  Returns:
+    dict with model names and counts.
+  """
+  client = _get_client()
+  keys = {model.__name__: COUNT_KEY_TMPL.format(model.__name__)
+          for model in models}
+  cached = client.get_multi(keys.values()) if client else {}
+  counts = {}
+  missing = {}
+  for model in models:
+    count = cached.get(keys[model.__name__])
+    if count is None:
+      count = model.query.count()
+      missing[keys[model.__name__]] = count
+    counts[model.__name__] = count
+  if client and missing:
+    client.add_multi(missing, time=settings.OBJECT_COUNTS_MAX_AGE)
+  return counts
+
+
+def get_readable_counts(models):
+  """Get approximate counts of objects the current user can read.
+
+  Returns:
+    dict with model names and counts.
+  """
+  if permissions.has_system_wide_read():
+    return get_total_counts(models)
+  counts = {}
+  unrestricted = []
+  for model in models:
+    contexts, resources = permissions.get_context_resource(
+        model_name=model.__name__, permission_type="read",
+    )
+    if contexts is None:
+      unrestricted.append(model)
+    else:
+      counts[model.__name__] = len(set(resources or ()))
+  counts.update(get_total_counts(unrestricted))
+  return counts
+
+
+def _collect_deltas(session, _):
+  """Count created and deleted objects of the flush per model."""
+  deltas = session.info.setdefault(DELTAS_KEY, collections.Counter())
+  for obj in session.new:
+    deltas[COUNT_KEY_TMPL.format(obj.__class__.__name__)] += 1
+  for obj in session.deleted:
+    deltas[COUNT_KEY_TMPL.format(obj.__class__.__name__)] -= 1
+
+
+def _apply_deltas(session):
+  """Update stored counters by the committed deltas."""
+  if not helpers.is_outermost_transaction(session):
+    return
+  deltas = session.info.pop(DELTAS_KEY, None)
+  client = _get_client()
+  if not deltas or not client:
+    return
+  # Only existing counters are changed, missing ones are counted on read.
+  client.offset_multi({key: delta for key, delta in deltas.iteritems()
+                       if delta})
+
+
+def _discard_deltas(session):
+  if helpers.is_outermost_transaction(session):
+    session.info.pop(DELTAS_KEY, None)
+
+
+def init_hooks():
+  """Keep stored counters up to date with committed changes."""
+  sa.event.listen(Session, "after_flush", _collect_deltas)
+  sa.event.listen(Session, "after_commit", _apply_deltas)
+  sa.event.listen(Session, "after_rollback", _discard_deltas)
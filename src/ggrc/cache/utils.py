@@ -4,16 +4,34 @@
 """Common operations on cache managers."""
 
 import logging
+import threading
+import time
 
 import flask
+import sqlalchemy as sa
 
 from ggrc import cache
+from ggrc import db
 import ggrc.models
 from ggrc import settings
+from ggrc.utils import helpers
 
 
 logger = logging.getLogger(__name__)
 
+PERMISSIONS_GENERATION_KEY = "permissions:generation"
+
+# Bumped after every commit that changed any data.
+DATA_GENERATION_KEY = "data:generation"
+
+DML_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# Changes of these models can affect permissions of any user.
+GLOBAL_PERMISSION_MODELS = {"Role", "AccessControlRole"}
+
+# Changes of these models affect permissions of the person they belong to.
+PERSON_PERMISSION_MODELS = {"UserRole", "AccessControlPerson"}
+
 
 def get_cache_manager():
   """Returns an instance of CacheManager."""
@@ -128,6 +146,8 @@ def update_memcache_before_commit(context, modified_objects, expiry_time):
     if modified_objects.deleted:
       memcache_mark_for_deletion(context, modified_objects.deleted.items())
 
+  context.permission_changes = collect_permission_changes(modified_objects)
+
   status_entries = {}
   for key in context.cache_manager.marked_for_delete:
     build_cache_status(status_entries, 'DeleteOp:' + key,
@@ -189,7 +209,7 @@ def update_memcache_after_commit(context):
     if delete_result is not True:
       logger.error("CACHE: Failed to remove status entries from cache")
 
-  clear_permission_cache()
+  invalidate_permission_cache(getattr(context, "permission_changes", None))
   cache_manager.clear_cache()
 
 
@@ -208,16 +228,128 @@ def build_cache_status(data, key, expiry_timeout, status):
   data[key] = {'expiry': expiry_timeout, 'status': status}
 
 
+def _new_generation():
+  """Get initial value for a permissions generation counter.
+
+  Counters start from the current time so that a counter evicted from
+  memcache never gets back to a value used by an older cache entry.
+  """
+  return int(time.time() * 1000)
+
+
+def get_user_generation_key(user_id):
+  """Get key of the permissions generation counter for the given user."""
+  return "permissions:generation:{}".format(user_id)
+
+
+def get_permissions_key(client, user_id):
+  """Get memcache key of the current permissions entry for the given user.
+
+  The key contains the global and the user generation counters, so bumping
+  either of them makes previously stored permissions unreachable.
+  """
+  keys = [PERMISSIONS_GENERATION_KEY, get_user_generation_key(user_id)]
+  generations = client.get_multi(keys)
+  missing = {key: _new_generation() for key in keys if key not in generations}
+  if missing:
+    client.add_multi(missing)
+    missing.update(client.get_multi(missing.keys()))
+    generations.update(missing)
+  return "permissions:{}:{}:{}".format(
+      user_id, *[generations[key] for key in keys]
+  )
+
+
+class PermissionChanges(object):
+  """Users whose permissions are affected by a set of modified objects.
+
+  Attributes:
+    clear_all: flag showing that permissions of all users are affected.
+    user_ids: ids of users with affected permissions.
+    object_keys: (type, id) of objects that can change permissions of anyone
+      with an ACL entry on them. ACL entries on new relationships are only
+      propagated after commit, so these are checked again after commit.
+  """
+
+  def __init__(self):
+    self.clear_all = False
+    self.user_ids = set()
+    self.object_keys = set()
+
+  def add(self, obj, deleted=False):
+    """Add a modified object."""
+    type_ = obj.__class__.__name__
+    if type_ in GLOBAL_PERMISSION_MODELS:
+      self.clear_all = True
+    elif type_ in PERSON_PERMISSION_MODELS:
+      self.user_ids.add(obj.person_id)
+    elif type_ == "AccessControlList":
+      self.object_keys.add((obj.object_type, obj.object_id))
+    elif type_ == "Relationship" or deleted:
+      self.object_keys.add((type_, obj.id))
+
+  def load_user_ids(self):
+    """Add people with ACL entries on modified objects to affected users."""
+    if self.clear_all or not self.object_keys:
+      return
+    acl = ggrc.models.all_models.AccessControlList
+    acl_base = acl.__table__.alias("acl_base")
+    acp = ggrc.models.all_models.AccessControlPerson
+    query = db.session.query(acp.person_id).join(
+        acl_base,
+        acl_base.c.id == acp.ac_list_id,
+    ).join(
+        acl,
+        acl.base_id == acl_base.c.id,
+    ).filter(
+        sa.tuple_(acl.object_type, acl.object_id).in_(list(self.object_keys)),
+    ).distinct()
+    self.user_ids.update(person_id for person_id, in query)
+
+
+def collect_permission_changes(modified_objects):
+  """Collect changes that affect cached permissions.
+
+  Args:
+    modified_objects: Cache with new, dirty and deleted objects.
+  Returns:
+    PermissionChanges for the modified objects.
+  """
+  changes = PermissionChanges()
+  if modified_objects is None:
+    changes.clear_all = True
+    return changes
+  for objects in (modified_objects.new, modified_objects.dirty):
+    for obj in objects:
+      changes.add(obj)
+  for obj in modified_objects.deleted:
+    changes.add(obj, deleted=True)
+  # Deleted objects lose their ACL entries on commit, so people with access
+  # to them have to be found before that.
+  changes.load_user_ids()
+  return changes
+
+
+def invalidate_permission_cache(changes=None):
+  """Drop cached permissions of users affected by the given changes.
+
+  Args:
+    changes: PermissionChanges collected before commit. If not given,
+      permissions of all users are dropped.
+  """
+  if changes is None or changes.clear_all:
+    clear_permission_cache()
+    return
+  changes.load_user_ids()
+  clear_users_permission_cache(changes.user_ids)
+
+
 def clear_permission_cache():
   """Drop cached permissions for all users."""
   if not getattr(settings, 'MEMCACHE_MECHANISM', False):
     return
   client = get_cache_manager().cache_object.memcache_client
-  cached_keys_set = client.get('permissions:list') or set()
-  cached_keys_set.add('permissions:list')
-  # We delete all the cached user permissions as well as
-  # the permissions:list value itself
-  client.delete_multi(cached_keys_set)
+  client.incr(PERMISSIONS_GENERATION_KEY, initial_value=_new_generation())
 
 
 def clear_users_permission_cache(user_ids):
@@ -225,9 +357,66 @@ def clear_users_permission_cache(user_ids):
   if not getattr(settings, 'MEMCACHE_MECHANISM', False) or not user_ids:
     return
   client = get_cache_manager().cache_object.memcache_client
-  cached_keys_set = client.get('permissions:list') or set()
-  for user_id in user_ids:
-    key = 'permissions:{}'.format(user_id)
-    if key in cached_keys_set:
-      cached_keys_set.remove(key)
-  client.set('permissions:list', cached_keys_set)
+  client.offset_multi(
+      {get_user_generation_key(user_id): 1 for user_id in user_ids},
+      initial_value=_new_generation(),
+  )
+
+
+_data_changes = threading.local()
+
+
+def get_data_generation(client):
+  """Get current value of the data generation counter."""
+  generation = client.get(DATA_GENERATION_KEY)
+  if generation is None:
+    client.add(DATA_GENERATION_KEY, _new_generation())
+    generation = client.get(DATA_GENERATION_KEY)
+  return generation
+
+
+def bump_data_generation():
+  """Make cache entries that depend on the stored data unreachable.
+
+  Only query results are cached with the data generation, so nothing is
+  done if the query cache is disabled.
+  """
+  if not (settings.QUERY_CACHE_ENABLED and
+          getattr(settings, 'MEMCACHE_MECHANISM', False)):
+    return
+  client = get_cache_manager().cache_object.memcache_client
+  client.incr(DATA_GENERATION_KEY, initial_value=_new_generation())
+
+
+def init_data_generation_hooks():
+  """Bump data generation after commits of transactions with writes.
+
+  Writes are detected on the cursor level, so both ORM flushes and bulk
+  statements executed with the session are covered. Hooks are not
+  registered if the query cache is disabled.
+  """
+  if not settings.QUERY_CACHE_ENABLED:
+    return
+  from sqlalchemy.engine import Engine
+  from sqlalchemy.orm.session import Session
+
+  def detect_write(conn, cursor, statement, *_):
+    """Mark the current transaction as the one with data changes."""
+    # pylint: disable=unused-argument
+    if statement.lstrip()[:7].upper().startswith(DML_STATEMENTS):
+      _data_changes.changed = True
+
+  def after_commit(session):
+    if not helpers.is_outermost_transaction(session):
+      return
+    if getattr(_data_changes, "changed", False):
+      _data_changes.changed = False
+      bump_data_generation()
+
+  def after_rollback(session):
+    if helpers.is_outermost_transaction(session):
+      _data_changes.changed = False
+
+  sa.event.listen(Engine, 'after_cursor_execute', detect_write)
+  sa.event.listen(Session, 'after_commit', after_commit)
+  sa.event.listen(Session, 'after_rollback', after_rollback)
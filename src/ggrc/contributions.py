@@ -9,12 +9,14 @@ from ggrc.notifications import common
 from ggrc.notifications import fast_digest
 from ggrc.notifications import notification_handlers
 from ggrc.notifications import data_handlers
+from ggrc.query import person_counters
 
 
 NIGHTLY_CRON_JOBS = [
     common.generate_cycle_tasks_notifs,
     common.send_daily_digest_notifications,
     import_export.clear_overtimed_tasks,
+    person_counters.fix_inconsistent_counters,
 ]
 
 HOURLY_CRON_JOBS = [
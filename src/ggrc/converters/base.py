@@ -137,6 +137,8 @@ class ExportConverter(BaseConverter):
   blocks and columns are handled in the correct order.
   """
 
+  CSV_CHUNK_SIZE = 1024 * 1024
+
   def __init__(self, ids_by_type, exportable_queries=None):
     super(ExportConverter, self).__init__()
     self.dry_run = True  # TODO: fix ColumnHandler to not use it for exports
@@ -189,8 +191,34 @@ class ExportConverter(BaseConverter):
       except ValueError:
         return ""
 
+  def export_csv_chunks(self, chunk_size=None):
+    """Export csv data as a sequence of csv string chunks.
+
+    Unlike export_csv_data, the whole csv file is never held in memory, so the
+    memory used by export does not depend on the number of exported objects.
+    """
+    with benchmark("Initialize block converters."):
+      self.initialize_block_converters()
+    if not self.block_converters:
+      return
+    with benchmark("Stream csv data."):
+      for chunk in self.iter_csv_chunks(chunk_size):
+        yield chunk
+
   def build_csv_from_row_data(self):
     """Export each block separated by empty lines."""
+    return "".join(self.iter_csv_chunks())
+
+  def iter_csv_chunks(self, chunk_size=None):
+    """Generate csv data for each block separated by empty lines.
+
+    Lines are written into a buffer which is emptied and yielded every time
+    it grows over chunk_size bytes. Chunks always end on a line boundary.
+
+    Args:
+      chunk_size (int): minimal size of a yielded chunk in bytes.
+    """
+    chunk_size = chunk_size or self.CSV_CHUNK_SIZE
     table_width = max([converter.block_width
                        for converter in self.block_converters])
     table_width += 1  # One line for 'Object line' column
@@ -207,11 +235,13 @@ class ExportConverter(BaseConverter):
       for line in block_converter.generate_row_data():
         line.insert(0, "")
         csv_string_builder.append_line(line)
+        if csv_string_builder.size >= chunk_size:
+          yield csv_string_builder.pop_csv_string()
 
       csv_string_builder.append_line([])
       csv_string_builder.append_line([])
 
-    return csv_string_builder.get_csv_string()
+    yield csv_string_builder.pop_csv_string()
 
   def _get_exportable_queries(self):
     """Get a list of filtered object queries regarding exportable items.
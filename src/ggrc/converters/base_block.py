@@ -16,11 +16,15 @@ from cached_property import cached_property
 import sqlalchemy as sa
 from sqlalchemy import or_
 from sqlalchemy import and_
+from sqlalchemy import exc
 from flask import _app_ctx_stack
 
 from ggrc import db
 from ggrc import models
+from ggrc import settings
+from ggrc.cache import utils as cache_utils
 from ggrc.models import reflection
+from ggrc.models.cache import Cache
 from ggrc.rbac import permissions
 from ggrc.utils import benchmark
 from ggrc.utils import structures
@@ -28,11 +32,13 @@ from ggrc.utils import list_chunks
 from ggrc.converters import errors
 from ggrc.converters import get_shared_unique_rules
 from ggrc.converters import base_row
+from ggrc.converters.lookup_index import LookupIndex
 from ggrc.converters.import_helper import get_column_order
 from ggrc.converters.import_helper import get_object_column_definitions
 from ggrc.models.mixins import issue_tracker as issue_tracker_mixins
 from ggrc.models.exceptions import ReservedNameError
 from ggrc.services import signals
+from ggrc.services.common import update_snapshot_index
 from ggrc_workflows.models.cycle_task_group_object_task import \
     CycleTaskGroupObjectTask
 
@@ -237,6 +243,11 @@ class BlockConverter(object):
       self._ticket_tracker_cache = self._create_ticket_tracker_cache()
     return self._ticket_tracker_cache
 
+  @cached_property
+  def lookup_index(self):
+    """Index of objects referenced by block cells, fetched in bulk."""
+    return LookupIndex(self)
+
   @cached_property
   def mapped_snapshots(self):
     """Cached property of mapped to audit snapshots"""
@@ -423,20 +434,25 @@ class ImportBlockConverter(BlockConverter):
         k for k in self.headers if k not in self.converter.priority_columns
     ]
 
+  @property
+  def is_batched(self):
+    """Flag showing if rows are committed in batches."""
+    return not self.converter.dry_run and settings.IMPORT_BATCH_SIZE > 1
+
   def import_csv_data(self):
     """Perform import sequence for the block."""
     try:
+      batch = []
       for row in self.row_converters_from_csv():
-        try:
-          row.process_row()
-        except ReservedNameError:
-          row.add_error(errors.DUPLICATE_CAD_NAME)
-          logger.exception(errors.DUPLICATE_CAD_NAME)
-        except Exception:  # pylint: disable=broad-except
-          row.add_error(errors.UNKNOWN_ERROR)
-          logger.exception("Unexpected error on import")
+        self._import_row(row)
         self._update_info(row)
         _app_ctx_stack.top.sqlalchemy_queries = []
+        if row.import_event is not None and not row.ignore:
+          batch.append(row)
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+          self._commit_batch(batch)
+          batch = []
+      self._commit_batch(batch)
     except Exception:  # pylint: disable=broad-except
       logger.exception("Unexpected error on import")
     finally:
@@ -445,6 +461,74 @@ class ImportBlockConverter(BlockConverter):
       if is_final_commit_required:
         db.session.commit()
 
+  def _import_row(self, row):
+    """Process a single row.
+
+    For batched imports the row is processed in a savepoint that is rolled
+    back if the row gets ignored. Commits done while processing the row, such
+    as snapshot reindex of an imported audit, only flush the changes, so they
+    do not release the savepoint and their hooks run with the batch commit.
+    Modified objects of the row are stored on the row, so the session cache
+    is cleared for the next row.
+    """
+    savepoint = None
+    if self.is_batched:
+      savepoint = db.session.begin_nested()
+      db.session.commit_enable_flag.disable()
+    try:
+      row.process_row()
+    except ReservedNameError:
+      row.add_error(errors.DUPLICATE_CAD_NAME)
+      logger.exception(errors.DUPLICATE_CAD_NAME)
+    except Exception:  # pylint: disable=broad-except
+      row.add_error(errors.UNKNOWN_ERROR)
+      logger.exception("Unexpected error on import")
+    finally:
+      db.session.commit_enable_flag.enable()
+    if savepoint is None:
+      return
+    # Savepoint could be already closed by a rollback done while processing
+    # the row.
+    if db.session.transaction is savepoint:
+      if row.ignore or not savepoint.is_active:
+        db.session.rollback()
+      else:
+        savepoint.commit()
+    cache = Cache.get_cache()
+    if cache:
+      cache.clear()
+
+  def _commit_batch(self, rows):
+    """Commit rows prepared for commit and send post commit signals."""
+    if not rows:
+      return
+    with benchmark("Commit import batch of {} rows".format(len(rows))):
+      modified_objects = Cache()
+      for row in rows:
+        if row.modified_objects is not None:
+          modified_objects.update(row.modified_objects)
+      try:
+        cache_utils.update_memcache_before_commit(
+            self, modified_objects, self.CACHE_EXPIRY_IMPORT)
+        db.session.commit_hooks_enable_flag.disable()
+        db.session.commit()
+      except exc.SQLAlchemyError as err:
+        db.session.rollback()
+        logger.exception("Import failed with: %s", err.message)
+        # None of the rows is imported, they are reported as rows that
+        # failed on their own.
+        for row in rows:
+          self._update_info(row, undo=True)
+          row.add_error(errors.UNKNOWN_ERROR)
+          self._update_info(row)
+        return
+      for row in rows:
+        self.store_revision_ids(row.import_event)
+      cache_utils.update_memcache_after_commit(self)
+      update_snapshot_index(modified_objects)
+      for row in rows:
+        row.send_post_commit_signals(event=row.import_event)
+
   def get_unique_values_dict(self, object_class):
     """Get the varible to storing row numbers for unique values.
 
@@ -505,20 +589,26 @@ class ImportBlockConverter(BlockConverter):
         "row_errors": [],
     }
 
-  def _update_info(self, row):
-    """Update counts for info response from row metadata."""
-    self._import_info["rows"] += 1
+  def _update_info(self, row, undo=False):
+    """Update counts for info response from row metadata.
+
+    Args:
+      row: processed row converter.
+      undo: subtract counts of a row that was added before.
+    """
+    step = -1 if undo else 1
+    self._import_info["rows"] += step
     if row.ignore:
-      self._import_info["ignored"] += 1
+      self._import_info["ignored"] += step
     elif row.is_delete:
-      self._import_info["deleted"] += 1
+      self._import_info["deleted"] += step
     elif row.is_new:
-      self._import_info["created"] += 1
+      self._import_info["created"] += step
     else:
-      self._import_info["updated"] += 1
+      self._import_info["updated"] += step
 
     if row.is_deprecated:
-      self._import_info["deprecated"] += 1
+      self._import_info["deprecated"] += step
 
 
 class ExportBlockConverter(BlockConverter):
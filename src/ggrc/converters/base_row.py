@@ -62,6 +62,8 @@ class ImportRowConverter(RowConverter):
     self.line = line
     self.initial_state = None
     self.is_new_object_set = False
+    self.import_event = None
+    self.modified_objects = None
 
   def handle_raw_cell(self, attr_name, idx, header_dict):
     """Process raw value from self.row[idx] for attr_name.
@@ -168,7 +170,9 @@ class ImportRowConverter(RowConverter):
                      column_names=", ".join(missing))
 
   def find_by_key(self, key, value):
-    return self.object_class.query.filter_by(**{key: value}).first()
+    return self.block_converter.lookup_index.get_object(
+        self.object_class, value, key=key
+    )
 
   def get_value(self, key):
     """Get the value for the row object key."""
@@ -308,9 +312,14 @@ class ImportRowConverter(RowConverter):
     """Commit the row.
 
     This method also calls pre-and post-commit signals and handles failures.
+    For batched imports the row is only prepared for commit, the commit itself
+    is done by the block converter for the whole batch.
     """
     if self.block_converter.converter.dry_run or self.ignore:
       return
+    if self.block_converter.is_batched:
+      self.prepare_commit()
+      return
     try:
       modified_objects = get_modified_objects(db.session)
       import_event = log_event(db.session, None)
@@ -339,6 +348,22 @@ class ImportRowConverter(RowConverter):
     else:
       self.send_post_commit_signals(event=import_event)
 
+  def prepare_commit(self):
+    """Log revisions and send before commit signals for the row.
+
+    Modified objects and import event are stored on the row, so that the block
+    converter could send the rest of signals after the batch is committed.
+    """
+    self.modified_objects = get_modified_objects(db.session)
+    self.import_event = log_event(db.session, None)
+    try:
+      self.send_before_commit_signals(self.import_event)
+    except StatusValidationError as exp:
+      status_alias = self.headers.get("status", {}).get("display_name")
+      self.add_error(errors.VALIDATION_ERROR,
+                     column_name=status_alias,
+                     message=exp.message)
+
   def _setup_object(self):
     """ Set the object values or relate object values
 
@@ -42,6 +42,17 @@ class CustomAttributeColumnHandler(handlers.TextColumnHandler):
       _types.MAP: lambda self: self.get_person_value(),
   }
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    """Get emails that could be values of Map:Person attributes.
+
+    Column definitions do not contain attribute types, so every value that
+    looks like an email is looked up.
+    """
+    if "@" not in raw_value:
+      return []
+    return [(models.Person, "email", raw_value)]
+
   def set_obj_attr(self):
     """Set object attribute method should do nothing for custom attributes.
 
@@ -200,7 +211,8 @@ class CustomAttributeColumnHandler(handlers.TextColumnHandler):
     if self.mandatory and not self.raw_value:
       self.add_error(errors.MISSING_VALUE_ERROR, column_name=self.display_name)
       return None
-    value = models.Person.query.filter_by(email=self.raw_value).first()
+    value = self.lookup_index.get_object(models.Person, self.raw_value,
+                                         key="email")
     if self.mandatory and not value:
       self.add_error(errors.WRONG_VALUE, column_name=self.display_name)
     return value
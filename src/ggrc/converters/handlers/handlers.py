@@ -9,7 +9,6 @@ from datetime import datetime
 from dateutil.parser import parse
 
 from sqlalchemy import and_
-from sqlalchemy import or_
 
 from ggrc import db
 from ggrc.converters import errors
@@ -58,6 +57,27 @@ class ColumnHandler(object):
     if options.get("parse"):
       self.set_value()
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    """Get values from a raw cell that can be fetched in bulk for a block.
+
+    Args:
+      object_class: Model of the imported block.
+      key: Attribute name of the column.
+      raw_value: Stripped raw cell value.
+      options: Column definition dict.
+
+    Returns:
+      iterable of (model, attribute name, value) tuples.
+    """
+    if options.get("unique") and raw_value:
+      return [(object_class, key, raw_value)]
+    return []
+
+  @property
+  def lookup_index(self):
+    return self.row_converter.block_converter.lookup_index
+
   def value_explicitly_empty(self, value):
     return value in self.EXPLICIT_EMPTY_VALUE
 
@@ -72,11 +92,13 @@ class ColumnHandler(object):
     if self.is_duplicate:
       # a hack to avoid two different errors for the same non-unique cell
       return
-    nr_duplicates = self.row_converter.object_class.query.filter(and_(
-        getattr(self.row_converter.object_class, self.key) == self.value,
-        self.row_converter.object_class.id != self.row_converter.obj.id
-    )).count()
-    if nr_duplicates > 0:
+    duplicates = [
+        obj for obj in self.lookup_index.get_objects(
+            self.row_converter.object_class, self.key, self.value
+        )
+        if obj.id != self.row_converter.obj.id
+    ]
+    if duplicates:
       self.add_error(
           errors.DUPLICATE_VALUE, column_name=self.key, value=self.value
       )
@@ -230,6 +252,11 @@ class UserColumnHandler(ColumnHandler):
   Used for primary and secondary contacts.
   """
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    return [(all_models.Person, "email", line.strip().lower())
+            for line in raw_value.splitlines() if line.strip()]
+
   def get_users_list(self):
     users = set()
     email_lines = self.raw_value.splitlines()
@@ -244,11 +271,12 @@ class UserColumnHandler(ColumnHandler):
     return list(users)
 
   def get_person(self, email):
-    from ggrc.utils import user_generator
     new_objects = self.row_converter.block_converter.converter.new_objects
     if email not in new_objects[all_models.Person]:
       try:
-        new_objects[all_models.Person][email] = user_generator.find_user(email)
+        new_objects[all_models.Person][email] = self.lookup_index.find_user(
+            email
+        )
       except ValueError as ex:
         self.add_error(
             errors.VALIDATION_ERROR,
@@ -452,6 +480,14 @@ class MappingColumnHandler(ColumnHandler):
     self.unmap = self.key.startswith(AttributeInfo.UNMAPPING_PREFIX)
     super(MappingColumnHandler, self).__init__(row_converter, key, **options)
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    mapping_object = get_exportables().get(options.get("attr_name", ""))
+    if mapping_object is None:
+      return []
+    return [(mapping_object, "slug", slug.strip())
+            for slug in raw_value.splitlines() if slug.strip()]
+
   def parse_item(self):
     """Parse a list of slugs to be mapped.
 
@@ -469,7 +505,7 @@ class MappingColumnHandler(ColumnHandler):
     objects = []
 
     for slug in slugs:
-      obj = class_.query.filter_by(slug=slug).first()
+      obj = self.lookup_index.get_object(class_, slug)
 
       if obj:
         is_allowed_by_type = self._is_allowed_mapping_by_type(
@@ -616,14 +652,8 @@ class OptionColumnHandler(ColumnHandler):
     prefixed_key = "{}_{}".format(
         self.row_converter.object_class._inflector.table_singular, self.key
     )
-    item = all_models.Option.query.filter(
-        and_(
-            all_models.Option.title == self.raw_value,
-            or_(all_models.Option.role == self.key,
-                all_models.Option.role == prefixed_key)
-        )
-    ).first()
-    return item
+    return self.lookup_index.get_option((self.key, prefixed_key),
+                                        self.raw_value)
 
   def get_value(self):
     option = getattr(self.row_converter.obj, self.key, None)
@@ -639,6 +669,12 @@ class ParentColumnHandler(ColumnHandler):
 
   parent = None
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    if cls.parent is None or not raw_value:
+      return []
+    return [(cls.parent, "slug", raw_value)]
+
   def parse_item(self):
     """ get parent object """
     # pylint: disable=protected-access
@@ -648,7 +684,7 @@ class ParentColumnHandler(ColumnHandler):
     slug = self.raw_value
     obj = self.new_objects.get(self.parent, {}).get(slug)
     if obj is None:
-      obj = self.parent.query.filter(self.parent.slug == slug).first()
+      obj = self.lookup_index.get_object(self.parent, slug)
     if obj is None:
       self.add_error(
           errors.UNKNOWN_OBJECT,
@@ -700,19 +736,27 @@ class ProgramColumnHandler(ParentColumnHandler):
 
 class RequirementDirectiveColumnHandler(MappingColumnHandler):
 
+  ALLOWED_DIRECTIVES = (all_models.Policy, all_models.Regulation,
+                        all_models.Standard, all_models.Contract)
+
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    if not raw_value:
+      return []
+    return [(directive_class, "slug", raw_value)
+            for directive_class in cls.ALLOWED_DIRECTIVES]
+
   def get_directive_from_slug(self, directive_class, slug):
     if slug in self.new_objects[directive_class]:
       return self.new_objects[directive_class][slug]
-    return directive_class.query.filter_by(slug=slug).first()
+    return self.lookup_index.get_object(directive_class, slug)
 
   def parse_item(self):
     """ get a directive from slug """
-    allowed_directives = [all_models.Policy, all_models.Regulation,
-                          all_models.Standard, all_models.Contract]
     if self.raw_value == "":
       return None
     slug = self.raw_value
-    for directive_class in allowed_directives:
+    for directive_class in self.ALLOWED_DIRECTIVES:
       directive = self.get_directive_from_slug(directive_class, slug)
       if directive is not None:
         self.mapping_object = type(directive)
@@ -966,6 +1010,11 @@ class DocumentsColumnHandler(ColumnHandler):
 class LabelsHandler(ColumnHandler):
   """ Handler for labels """
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    return [(all_models.Label, "name", name.strip())
+            for name in raw_value.split(',') if name.strip()]
+
   def parse_item(self):
     if self.raw_value is None:
       return
@@ -973,7 +1022,24 @@ class LabelsHandler(ColumnHandler):
     return [{'id': None, 'name': name} for name in names]
 
   def set_obj_attr(self):
-    self.row_converter.obj.labels = self.value
+    """Set labels using labels fetched by the block lookup index."""
+    if self.value is None:
+      return
+    obj = self.row_converter.obj
+    object_type = obj.__class__.__name__
+    cached_labels = [
+        label
+        for value in self.value
+        for label in self.lookup_index.get_objects(
+            all_models.Label, "name", value['name']
+        )
+        if label.object_type == object_type
+    ]
+    obj.set_labels(self.value, cached_labels)
+    self.lookup_index.add_objects(
+        all_models.Label, "name",
+        [label for label in obj.labels if label.id is None],
+    )
 
   def get_value(self):
     return ','.join(label.name for label in self.row_converter.obj.labels)
@@ -17,6 +17,19 @@ class ObjectsColumnHandler(handlers.ColumnHandler):
     self.new_slugs = row_converter.block_converter.converter.new_objects
     super(ObjectsColumnHandler, self).__init__(row_converter, key, **options)
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    mappable = get_importables()
+    values = []
+    for line in raw_value.splitlines():
+      line = line.split(":", 1)
+      if len(line) != 2:
+        continue
+      class_ = mappable.get(line[0].strip().lower())
+      if class_ is not None and class_.__name__ in cls.MAPABLE_OBJECTS:
+        values.append((class_, "slug", line[1].strip()))
+    return values
+
   def parse_item(self):
     lines = [line.split(":", 1) for line in self.raw_value.splitlines()]
     objects = []
@@ -35,7 +48,7 @@ class ObjectsColumnHandler(handlers.ColumnHandler):
                          object_class=class_.__name__)
         continue
       new_object_slugs = self.new_slugs[class_]
-      obj = class_.query.filter(class_.slug == slug).first()
+      obj = self.lookup_index.get_object(class_, slug)
       if obj:
         objects.append(obj)
       elif not (slug in new_object_slugs and self.dry_run):
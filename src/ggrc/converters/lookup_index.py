@@ -0,0 +1,165 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Lookup index for objects referenced by cells of an import block.
+
+Column handlers resolve people by email, objects by slug, labels by name and
+options by title.
+Doing that one cell at a time costs a query per row for every such column. The
+lookup index collects all referenced values from the block rows and fetches
+them with a few bulk queries the first time the index is used.
+"""
+
+from collections import defaultdict
+
+import sqlalchemy as sa
+from sqlalchemy.orm import exc
+
+from ggrc import settings
+from ggrc.models import all_models
+from ggrc.utils import benchmark
+from ggrc.utils import list_chunks
+from ggrc.utils import user_generator
+
+
+def _normalize(value):
+  """Get value used as index key.
+
+  MySQL compares strings case insensitive, so the index does the same.
+  """
+  if isinstance(value, basestring):
+    return value.strip().lower()
+  return value
+
+
+class LookupIndex(object):
+  """Index of objects referenced by cells of an import block.
+
+  Values are fetched in bulk per (model, key) pair. A lookup for a value that
+  was not found in the block rows falls back to a single query, so the index
+  always returns the same result as a direct query would.
+  """
+
+  def __init__(self, block_converter):
+    self.block_converter = block_converter
+    self._requested = None
+    self._objects = {}
+    self._options = {}
+
+  def _collect_values(self):
+    """Collect values from all cells that could be fetched in bulk.
+
+    Returns:
+      dict with (model, key) tuples as keys and sets of values as values.
+    """
+    requested = defaultdict(set)
+    headers = getattr(self.block_converter, "headers", None) or {}
+    rows = self.block_converter.rows or []
+    object_class = self.block_converter.object_class
+    for idx, (attr_name, header) in enumerate(headers.iteritems()):
+      handler = header["handler"]
+      for row in rows:
+        if idx >= len(row):
+          continue
+        lookup_values = handler.get_lookup_values(
+            object_class, attr_name, row[idx].strip(), header
+        )
+        for model, key, value in lookup_values:
+          if value:
+            requested[(model, key)].add(_normalize(value))
+    return requested
+
+  def _load(self):
+    """Fetch all objects referenced by the block rows."""
+    self._requested = self._collect_values()
+    for (model, key), values in self._requested.iteritems():
+      with benchmark("Lookup index for {}.{}".format(model.__name__, key)):
+        index = defaultdict(list)
+        column = getattr(model, key)
+        for values_chunk in list_chunks(list(values)):
+          query = model.query.filter(column.in_(values_chunk)).order_by(
+              model.id
+          )
+          for obj in query:
+            index[_normalize(getattr(obj, key))].append(obj)
+        self._objects[(model, key)] = index
+
+  def _is_indexed(self, model, key, value):
+    """Check if value was fetched with bulk queries."""
+    if self._requested is None:
+      self._load()
+    return value in self._requested.get((model, key), ())
+
+  def get_objects(self, model, key, value):
+    """Get all objects of model with key attribute equal to value.
+
+    Objects deleted or changed after the index was built are skipped. Expired
+    attributes of matching objects are reloaded before they are compared.
+    """
+    value = _normalize(value)
+    if not self._is_indexed(model, key, value):
+      return model.query.filter(getattr(model, key) == value).order_by(
+          model.id
+      ).all()
+    objects = []
+    for obj in self._objects[(model, key)].get(value, []):
+      state = sa.inspect(obj)
+      if not state.persistent:
+        continue
+      if key in state.dict:
+        current = state.dict[key]
+      else:
+        try:
+          current = getattr(obj, key)
+        except exc.ObjectDeletedError:
+          continue
+      if _normalize(current) != value:
+        continue
+      objects.append(obj)
+    return objects
+
+  def add_objects(self, model, key, objects):
+    """Add objects created by the import to the index.
+
+    Objects become available for lookups once they are flushed, so rows that
+    follow can reference them without querying the database again.
+    """
+    if self._requested is None:
+      self._load()
+    index = self._objects.get((model, key))
+    if index is None:
+      return
+    for obj in objects:
+      indexed = index[_normalize(getattr(obj, key))]
+      if obj not in indexed:
+        indexed.append(obj)
+
+  def get_object(self, model, value, key="slug"):
+    """Get the first object of model with key attribute equal to value."""
+    objects = self.get_objects(model, key, value)
+    return objects[0] if objects else None
+
+  def find_user(self, email):
+    """Get person by email the same way as user_generator.find_user does.
+
+    Only people stored in the database are taken from the index. Users that
+    should be verified or created by the integration service are looked up
+    one by one.
+    """
+    if (settings.INTEGRATION_SERVICE_URL or
+            user_generator.is_external_app_user_email(email)):
+      return user_generator.find_user(email)
+    return self.get_object(all_models.Person, email, key="email")
+
+  def get_option(self, roles, title):
+    """Get first option with given title and any of given roles."""
+    roles = tuple(sorted(roles))
+    if roles not in self._options:
+      options = {}
+      query = all_models.Option.query.filter(
+          all_models.Option.role.in_(roles)
+      ).order_by(all_models.Option.id)
+      for option in query:
+        options.setdefault(_normalize(option.title), option)
+      self._options[roles] = options
+    return self._options[roles].get(_normalize(title))
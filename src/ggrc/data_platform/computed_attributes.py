@@ -14,20 +14,40 @@ Relationships are tuples with:
 Glossary:
 aggregate object = object from which the computed value is read
 computed object = object which will get the new computed value
+
+
+Values are computed in two phases. Objects affected by all given revisions
+are collected first, so an object changed by several revisions is computed
+once. Affected objects are then computed and stored in chunks, optionally by
+COMPUTED_ATTRIBUTES_WORKERS threads. Full recompute of all objects stores its
+progress in computed_attributes_progress after each chunk and can be resumed.
 """
 
 import datetime
 import collections
+import itertools
 import logging
+import time
+import uuid
+from multiprocessing import pool as mp_pool
 
+import flask
 import sqlalchemy as sa
+from sqlalchemy import orm
 
 from ggrc import db
 from ggrc import login
+from ggrc import settings
 from ggrc import utils
-from ggrc.utils import revisions as revision_utils, helpers
+from ggrc.utils import helpers
 from ggrc.utils import benchmark
 from ggrc.models import all_models as models
+from ggrc.models import types
+
+SnapshotRevision = collections.namedtuple(
+    "SnapshotRevision",
+    ["action", "resource_type", "resource_id", "content"],
+)
 
 # Statement for inserting attribute values without explicit call of delete.
 ATTRIBUTE_REPLACE_STATEMENT = """
@@ -88,6 +108,30 @@ CA_CHUNK_SIZE = 500
 logger = logging.getLogger(__name__)
 
 
+class ComputedAttributesProgress(db.Model):
+  """Progress of full recompute of a single computed attribute."""
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = 'computed_attributes_progress'
+
+  PENDING = "Pending"
+  DONE = "Done"
+
+  id = db.Column(db.Integer, primary_key=True)  # noqa
+  run_id = db.Column(db.String(64), nullable=False)
+  attribute_template_id = db.Column(db.Integer, nullable=False)
+  last_id = db.Column(db.Integer, nullable=True)
+  status = db.Column(db.String(16), nullable=False, default=PENDING)
+  objects_count = db.Column(db.Integer, nullable=False, default=0)
+  duration = db.Column(db.Float, nullable=False, default=0)
+  updated_at = db.Column(
+      db.DateTime,
+      nullable=False,
+      default=sa.func.now(),
+      onupdate=sa.func.now(),
+  )
+
+
 def get_computed_attributes():
   """Get all data platform attribute templates with computed flag."""
   return db.session.query(
@@ -98,9 +142,29 @@ def get_computed_attributes():
       models.AttributeTypes
   ).filter(
       models.AttributeTypes.computed == 1
+  ).options(
+      orm.joinedload("object_template"),
+      orm.joinedload("attribute_definition").joinedload("attribute_type"),
   ).all()
 
 
+def load_computed_attributes():
+  """Get computed attributes detached from the session.
+
+  Detached attributes keep their values after commits and can be shared
+  between worker threads, so they are loaded once per computation.
+  """
+  attributes = get_computed_attributes()
+  for attr in attributes:
+    for obj in (attr,
+                attr.object_template,
+                attr.attribute_definition,
+                attr.attribute_definition.attribute_type):
+      if obj in db.session:
+        db.session.expunge(obj)
+  return attributes
+
+
 def get_aggregate_type(attribute):
   afn = attribute.attribute_definition.attribute_type.aggregate_function
   return afn.split()[0]
@@ -165,10 +229,7 @@ def _get_group_key(revision, aggregate_type, computed_object):
   elif revision.resource_type == computed_object:
     key = "computed_objects"
   elif (revision.resource_type == "Snapshot" and
-        # The following protected access is used to prevent calculation of all
-        # fields in revision content, because they are not needed.
-        # pylint: disable=protected-access
-        revision._content["child_type"] == computed_object):
+        revision.content["child_type"] == computed_object):
     key = "destination_snapshots"
   elif (revision.resource_type == "Relationship" and
         revision.source_type in related_types and
@@ -507,10 +568,11 @@ def get_snapshot_data(affected_objects):
   return snapshot_map, snapshot_tag_map
 
 
-def get_attributes_data(computed_values):
+def get_attributes_data(computed_values, user_id=None):
   """Store computed values in the database."""
   data = []
-  user_id = login.get_current_user_id()
+  if user_id is None:
+    user_id = login.get_current_user_id()
   for attr, objects in computed_values.iteritems():
     aggregate_type = get_aggregate_type(attr)
     aggregate_field = get_aggregate_field(attr)
@@ -565,18 +627,6 @@ def store_data(attributes_data, index_data):
   db.session.commit()
 
 
-def get_all_latest_revisions_ids():
-  """Get latest revisions for aggregate objects."""
-  with benchmark("Get all latest revision ids"):
-    attributes = get_computed_attributes()
-    revision_ids = []
-    for attribute in attributes:
-      aggregate_type = get_aggregate_type(attribute)
-      revisions = revision_utils.get_revisions_by_type(aggregate_type)
-      revision_ids.extend(revisions.values())
-    return revision_ids
-
-
 def delete_all_computed_values():
   """Remove all attribute values for computed attributes."""
   with benchmark("Delete all computed attribute values"):
@@ -615,57 +665,65 @@ def get_revisions(revision_ids):
       models.Revision.resource_type != "Snapshot",
       models.Revision.id.in_(revision_ids)
   ).all()
-  snapshot_revisions = db.session.query(
+  snapshot_query = db.session.query(
       models.Revision.action,
       models.Revision.resource_type,
       models.Revision.resource_id,
       # The following protected access is used to prevent calculation of all
       # fields in revision content, because they are not needed.
-      models.Revision._content,  # pylint: disable=protected-access
+      models.Revision._raw_content,  # pylint: disable=protected-access
   ).filter(
       models.Revision.resource_type == "Snapshot",
       models.Revision.id.in_(revision_ids)
-  ).all()
+  )
+  snapshot_revisions = [
+      SnapshotRevision(action, resource_type, resource_id,
+                       types.decode_json(raw_content))
+      for action, resource_type, resource_id, raw_content in snapshot_query
+  ]
   return non_snapshot_revisions + snapshot_revisions
 
 
-@helpers.without_sqlalchemy_cache
-def compute_attributes(revision_ids):
-  """Compute new values based an changed objects.
-
-  Args:
-    objects: array of object stubs of modified objects.
-  """
-
-  with benchmark("Compute attributes"):
-
-    if revision_ids == "all_latest":
-      with benchmark("Get all latest revisions ids"):
-        revision_ids = get_all_latest_revisions_ids()
+def collect_affected_objects(attributes, revision_ids):
+  """Get objects affected by revisions merged over all revision chunks."""
+  affected_objects = collections.defaultdict(set)
+  ids_count = len(revision_ids)
+  handled_ids = 0
+  for ids_chunk in utils.list_chunks(revision_ids, chunk_size=CA_CHUNK_SIZE):
+    handled_ids += len(ids_chunk)
+    logger.info("Revision: %s/%s", handled_ids, ids_count)
+    with benchmark("Get revisions."):
+      revisions = get_revisions(ids_chunk)
+    with benchmark("Group revisions by computed attributes"):
+      attribute_groups = group_revisions(attributes, revisions)
+    with benchmark("get all objects affected by computed attributes"):
+      chunk_objects = get_affected_objects(attribute_groups)
+    for attr, objects in chunk_objects.iteritems():
+      affected_objects[attr].update(objects)
+  return affected_objects
 
-    if not revision_ids:
-      return
 
-    ids_count = len(revision_ids)
-    handled_ids = 0
-    for ids_chunk in utils.list_chunks(revision_ids, chunk_size=CA_CHUNK_SIZE):
-      handled_ids += len(ids_chunk)
-      logger.info("Revision: %s/%s", handled_ids, ids_count)
-      recompute_attrs_for_revisions(ids_chunk)
+def _chunk_affected_objects(affected_objects):
+  """Split affected objects of all attributes into chunks."""
+  chunks = []
+  for attr, objects in affected_objects.iteritems():
+    for objects_chunk in utils.list_chunks(sorted(objects),
+                                           chunk_size=CA_CHUNK_SIZE):
+      chunks.append({attr: set(objects_chunk)})
+  return chunks
 
 
-def recompute_attrs_for_revisions(ids_chunk):
-  """Reindex chunk of CAs."""
-  with benchmark("Get revisions."):
-    revisions = get_revisions(ids_chunk)
+@helpers.without_sqlalchemy_cache
+def recompute_objects(affected_objects, user_id):
+  """Compute and store values of affected objects.
 
-  with benchmark("Get all computed attributes"):
-    attributes = get_computed_attributes()
+  Args:
+    affected_objects: dict with attributes and sets of computed objects.
+    user_id: id of the user stored as author of the values.
 
-  with benchmark("Group revisions by computed attributes"):
-    attribute_groups = group_revisions(attributes, revisions)
-  with benchmark("get all objects affected by computed attributes"):
-    affected_objects = get_affected_objects(attribute_groups)
+  Returns:
+    number of computed objects.
+  """
   with benchmark("Get all relationships for these computed objects"):
     relationships = get_relationships(affected_objects)
   with benchmark("Get snapshot data"):
@@ -676,8 +734,148 @@ def recompute_attrs_for_revisions(ids_chunk):
                                      snapshot_map)
 
   with benchmark("Get computed attributes data"):
-    attributes_data = get_attributes_data(computed_values)
+    attributes_data = get_attributes_data(computed_values, user_id)
   with benchmark("Get computed attribute full-text index data"):
     index_data = get_index_data(computed_values, snapshot_tag_map)
   with benchmark("Store attribute data and full-text index data"):
     store_data(attributes_data, index_data)
+  return sum(len(objects) for objects in affected_objects.itervalues())
+
+
+def recompute_chunks(chunks, user_id):
+  """Recompute chunks of affected objects.
+
+  Chunks are handled by COMPUTED_ATTRIBUTES_WORKERS threads, each one with
+  its own application context and database session.
+
+  Yields:
+    numbers of computed objects in the order of the given chunks.
+  """
+  workers = settings.COMPUTED_ATTRIBUTES_WORKERS
+  if workers <= 1:
+    for chunk in chunks:
+      yield recompute_objects(chunk, user_id)
+    return
+
+  # pylint: disable=protected-access
+  app = flask.current_app._get_current_object()
+
+  def recompute_in_context(chunk):
+    with app.app_context():
+      return recompute_objects(chunk, user_id)
+
+  pool = mp_pool.ThreadPool(workers)
+  try:
+    for objects_count in pool.imap(recompute_in_context, chunks):
+      yield objects_count
+  finally:
+    pool.terminate()
+    pool.join()
+
+
+@helpers.without_sqlalchemy_cache
+def compute_attributes(revision_ids):
+  """Compute new values based an changed objects.
+
+  Args:
+    revision_ids: list of ids of revisions of changed objects or
+        "all_latest" to recompute values of all objects.
+  """
+
+  with benchmark("Compute attributes"):
+
+    if revision_ids == "all_latest":
+      compute_all_attributes()
+      return
+
+    if not revision_ids:
+      return
+
+    attributes = load_computed_attributes()
+    affected_objects = collect_affected_objects(attributes, revision_ids)
+    user_id = login.get_current_user_id()
+    chunks = _chunk_affected_objects(affected_objects)
+    for _ in recompute_chunks(chunks, user_id):
+      pass
+
+
+def create_progress(attributes):
+  """Create progress records of a new full recompute run."""
+  run_id = uuid.uuid4().hex
+  progress = [
+      ComputedAttributesProgress(
+          run_id=run_id,
+          attribute_template_id=attr.attribute_template_id,
+      )
+      for attr in attributes
+  ]
+  db.session.add_all(progress)
+  db.session.plain_commit()
+  return progress
+
+
+def resume_progress():
+  """Get not finished progress records of the latest full recompute run."""
+  last = ComputedAttributesProgress.query.order_by(
+      ComputedAttributesProgress.id.desc()
+  ).first()
+  if not last:
+    return []
+  return ComputedAttributesProgress.query.filter(
+      ComputedAttributesProgress.run_id == last.run_id,
+      ComputedAttributesProgress.status != ComputedAttributesProgress.DONE,
+  ).order_by(ComputedAttributesProgress.id).all()
+
+
+def _recompute_all_objects(attr, progress, user_id):
+  """Recompute values of all computed objects of the attribute.
+
+  The last computed id is stored after every chunk, so the computation
+  continues from there when it is resumed.
+  """
+  computed_type = attr.object_template.name
+  computed_model = getattr(models, computed_type)
+  query = db.session.query(computed_model.id).order_by(computed_model.id)
+  if progress.last_id is not None:
+    query = query.filter(computed_model.id > progress.last_id)
+  ids_chunks = list(utils.list_chunks([id_ for id_, in query],
+                                      chunk_size=CA_CHUNK_SIZE))
+  chunks = [{attr: {(computed_type, id_) for id_ in ids_chunk}}
+            for ids_chunk in ids_chunks]
+  started = time.time()
+  results = recompute_chunks(chunks, user_id)
+  for ids_chunk, objects_count in itertools.izip(ids_chunks, results):
+    progress.last_id = ids_chunk[-1]
+    progress.objects_count += objects_count
+    progress.duration += time.time() - started
+    started = time.time()
+    db.session.plain_commit()
+    logger.info("Computed %s %s: %s objects", computed_type,
+                attr.attribute_definition.name, progress.objects_count)
+  progress.status = ComputedAttributesProgress.DONE
+  db.session.plain_commit()
+
+
+@helpers.without_sqlalchemy_cache
+def compute_all_attributes(resume=False):
+  """Recompute values of all computed attributes for all objects.
+
+  Args:
+    resume: continue the latest not finished run instead of starting a new
+        one.
+  """
+  with benchmark("Compute all attributes"):
+    attributes = {attr.attribute_template_id: attr
+                  for attr in load_computed_attributes()}
+    if resume:
+      progress_records = resume_progress()
+    else:
+      progress_records = create_progress(attributes.values())
+    user_id = login.get_current_user_id()
+    for progress in progress_records:
+      attr = attributes.get(progress.attribute_template_id)
+      if attr is None:
+        progress.status = ComputedAttributesProgress.DONE
+        db.session.plain_commit()
+        continue
+      _recompute_all_objects(attr, progress, user_id)
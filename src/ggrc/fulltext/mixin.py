@@ -4,9 +4,11 @@
 import itertools
 from collections import namedtuple
 
+import sqlalchemy as sa
 from sqlalchemy import orm
 
 from ggrc import db
+from ggrc import settings
 
 from ggrc import fulltext
 from ggrc import utils
@@ -43,6 +45,11 @@ class Indexed(object):
     instances = cls.indexed_query().filter(cls.id.in_(ids))
     indexer = fulltext.get_indexer()
     rows = itertools.chain(*[indexer.records_generator(i) for i in instances])
+    cls._insert_rows(rows)
+
+  @staticmethod
+  def _insert_rows(rows):
+    """Insert record rows into fulltext_record_properties table."""
     for vals_chunk in utils.iter_chunks(rows, chunk_size=10000):
       query = """
           INSERT INTO fulltext_record_properties (
@@ -76,12 +83,96 @@ class Indexed(object):
     """
     db.session.execute(query, {"obj_type": cls.__name__, "obj_ids": ids})
 
+  @classmethod
+  def get_existing_records(cls, ids):
+    """Get stored records of objects with given ids.
+
+    Returns:
+      dict with (key, type, property, subproperty) tuples as keys and
+      (tags, content) tuples as values.
+    """
+    record = fulltext.get_indexer().record_type
+    query = db.session.query(
+        record.key,
+        record.type,
+        record.property,
+        record.subproperty,
+        record.tags,
+        record.content,
+    ).filter(
+        record.type == cls.__name__,
+        record.key.in_(ids),
+    )
+    return {row[:4]: row[4:] for row in query}
+
+  @classmethod
+  def diff_records(cls, ids):
+    """Update records of objects with given ids with minimal changes.
+
+    New records are calculated in the same way as for insert_records and
+    compared to the stored ones, only added, changed and removed records are
+    written to fulltext_record_properties table.
+
+    Returns:
+      tuple with counts of inserted, updated and deleted records.
+    """
+    indexer = fulltext.get_indexer()
+    instances = cls.indexed_query().filter(cls.id.in_(ids))
+    new_records = {}
+    for instance in instances:
+      for row in indexer.records_generator(instance):
+        pk = (row["key"], row["type"], row["property"], row["subproperty"])
+        new_records[pk] = row
+    existing = cls.get_existing_records(ids)
+
+    to_delete = [key for key in existing if key not in new_records]
+    to_update = [
+        row for key, row in new_records.iteritems()
+        if key in existing and existing[key] != (row["tags"], row["content"])
+    ]
+    to_insert = [
+        row for key, row in new_records.iteritems() if key not in existing
+    ]
+
+    table = indexer.record_type.__table__
+    for pks_chunk in utils.list_chunks(to_delete, chunk_size=1000):
+      db.session.execute(table.delete().where(
+          sa.tuple_(
+              table.c.key, table.c.type, table.c.property, table.c.subproperty,
+          ).in_(pks_chunk)
+      ))
+    if to_update:
+      db.session.execute(
+          table.update().where(sa.and_(
+              table.c.key == sa.bindparam("_key"),
+              table.c.type == sa.bindparam("_type"),
+              table.c.property == sa.bindparam("_property"),
+              table.c.subproperty == sa.bindparam("_subproperty"),
+          )).values(
+              tags=sa.bindparam("tags"),
+              content=sa.bindparam("content"),
+          ),
+          [{
+              "_key": row["key"],
+              "_type": row["type"],
+              "_property": row["property"],
+              "_subproperty": row["subproperty"],
+              "tags": row["tags"],
+              "content": row["content"],
+          } for row in to_update],
+      )
+    cls._insert_rows(to_insert)
+    return len(to_insert), len(to_update), len(to_delete)
+
   @classmethod
   def bulk_record_update_for(cls, ids):
     """Bulky update index records for current class"""
     if not ids:
       return
 
+    if settings.FULLTEXT_DIFF_REINDEX:
+      cls.diff_records(ids)
+      return
     cls.delete_records(ids)
     cls.insert_records(ids)
 
@@ -2,6 +2,8 @@
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 """Full text index engine for Mysql DB backend"""
 
+import re
+
 import sqlalchemy as sa
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import aliased
@@ -9,6 +11,7 @@ from sqlalchemy.sql.expression import select
 from sqlalchemy import event
 
 from ggrc import db
+from ggrc import settings
 from ggrc.fulltext.sql import SqlIndexer
 from ggrc.models import all_models
 from ggrc.query import my_objects
@@ -36,6 +39,112 @@ class MysqlRecordProperty(db.Model):
     )
 
 
+FULLTEXT_INDEX_NAME = "ft_fulltext_record_properties_content"
+
+
+def has_fulltext_index():
+  """Check if the fulltext index on record content exists."""
+  return bool(db.session.execute(
+      """
+      SELECT 1 FROM information_schema.statistics
+      WHERE table_schema = DATABASE() AND
+          table_name = :table_name AND
+          index_name = :index_name
+      LIMIT 1
+      """,
+      {
+          "table_name": MysqlRecordProperty.__tablename__,
+          "index_name": FULLTEXT_INDEX_NAME,
+      },
+  ).fetchone())
+
+
+def create_fulltext_index():
+  """Create the fulltext index used with FULLTEXT_INVERTED_INDEX.
+
+  The index is not created by migrations. Building it rewrites the whole
+  records table and every later write of records also updates the index, so
+  it is created only for instances that enable FULLTEXT_INVERTED_INDEX.
+  """
+  if has_fulltext_index():
+    return
+  db.session.execute(
+      "ALTER TABLE {table_name} ADD FULLTEXT INDEX {index_name} (content)"
+      .format(table_name=MysqlRecordProperty.__tablename__,
+              index_name=FULLTEXT_INDEX_NAME)
+  )
+
+
+# Default InnoDB fulltext stopwords. These words are not stored in the index,
+# so they can not be required in a boolean mode search.
+INNODB_STOPWORDS = frozenset([
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en",
+    "for", "from", "how", "i", "in", "is", "it", "la", "of", "on", "or",
+    "that", "the", "this", "to", "was", "what", "when", "where", "who",
+    "will", "with", "und", "www",
+])
+
+
+def get_search_tokens(terms):
+  """Get words of search terms that could be looked up in fulltext index.
+
+  Words shorter than FULLTEXT_MIN_TOKEN_SIZE and stopwords are not stored in
+  the index, they are skipped. Boolean mode operators are never returned as
+  they are not word characters.
+  """
+  tokens = []
+  for token in re.split(r"\W+", terms.lower(), flags=re.UNICODE):
+    if len(token) < settings.FULLTEXT_MIN_TOKEN_SIZE:
+      continue
+    if token in INNODB_STOPWORDS or token in tokens:
+      continue
+    tokens.append(token)
+  return tokens
+
+
+def get_match_query(terms):
+  """Get boolean mode MATCH expression for search terms.
+
+  Every token is required and matched as a word prefix, so the last word of
+  the terms may still be incomplete while the user types it.
+
+  Returns:
+    MATCH ... AGAINST expression or None if terms have no indexed words or
+    the fulltext index is disabled.
+  """
+  if not settings.FULLTEXT_INVERTED_INDEX or not terms:
+    return None
+  tokens = get_search_tokens(terms)
+  if not tokens:
+    return None
+  return MysqlRecordProperty.content.match(
+      u" ".join(u"+{}*".format(token) for token in tokens)
+  )
+
+
+def get_content_filter(terms):
+  """Get filter for records with content containing search terms.
+
+  With FULLTEXT_INVERTED_INDEX the fulltext index narrows down the records
+  and LIKE is checked only for them. LIKE keeps the same phrase semantic as
+  without the index except that words of the terms must start a word in the
+  content.
+  """
+  like = MysqlRecordProperty.content.contains(terms)
+  match = get_match_query(terms)
+  if match is None:
+    return like
+  return sa.and_(match, like)
+
+
+def get_relevance_column(terms):
+  """Get column with relevance of a record for search terms."""
+  match = get_match_query(terms)
+  if match is None:
+    return sa.literal(0).label('relevance')
+  return match.label('relevance')
+
+
 class MysqlIndexer(SqlIndexer):
   """MysqlIndexer class"""
   record_type = MysqlRecordProperty
@@ -48,7 +157,7 @@ class MysqlIndexer(SqlIndexer):
 
     if not terms:
       return whitelist
-    return sa.and_(whitelist, MysqlRecordProperty.content.contains(terms))
+    return sa.and_(whitelist, get_content_filter(terms))
 
   @staticmethod
   def get_permissions_query(model_names, permission_type='read'):
@@ -151,7 +260,8 @@ class MysqlIndexer(SqlIndexer):
         self.record_type.content.label('content'),
         sa.case(
             [(self.record_type.property == 'title', sa.literal(0))],
-            else_=sa.literal(1)).label('sort_key'))
+            else_=sa.literal(1)).label('sort_key'),
+        get_relevance_column(terms))
 
     query = db.session.query(*columns)
     query = query.filter(self.get_permissions_query(
@@ -175,7 +285,9 @@ class MysqlIndexer(SqlIndexer):
       unions.append(extra_q)
     all_queries = sa.union(*unions)
     all_queries = aliased(all_queries.order_by(
-        all_queries.c.sort_key, all_queries.c.content))
+        all_queries.c.sort_key,
+        all_queries.c.relevance.desc(),
+        all_queries.c.content))
     return db.session.execute(
         select([all_queries.c.key, all_queries.c.type]).distinct())
 
@@ -0,0 +1,188 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Sharded full reindex of fulltext records.
+
+Full reindex is split into shards, one shard per model and range of ids. Every
+shard is handled by its own background task and stores the last reindexed id
+after each committed chunk, so a restarted task continues from that id
+instead of starting over. The last step of a reindex run is the snapshot
+reindex, it is started by the shard task that finishes last.
+"""
+
+import logging
+import time
+import uuid
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import fulltext
+from ggrc import settings
+from ggrc import utils
+from ggrc.fulltext import mixin
+from ggrc.models import all_models
+from ggrc.models.maintenance import ReindexShard
+from ggrc.utils import benchmark
+from ggrc.utils import helpers
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_STEP = "Snapshot"
+
+
+def get_indexed_models():
+  """Get models that should be reindexed on full reindex."""
+  return {
+      model.__name__: model for model in all_models.all_models
+      if issubclass(model, mixin.Indexed) and model.REQUIRED_GLOBAL_REINDEX
+  }
+
+
+def warmup_indexer_cache():
+  """Cache people and roles used by record builders of all objects."""
+  indexer = fulltext.get_indexer()
+  people_query = db.session.query(
+      all_models.Person.id,
+      all_models.Person.name,
+      all_models.Person.email
+  )
+  indexer.cache["people_map"] = {p.id: (p.name, p.email) for p in people_query}
+  indexer.cache["ac_role_map"] = dict(db.session.query(
+      all_models.AccessControlRole.id,
+      all_models.AccessControlRole.name,
+  ))
+
+
+def create_shards(shard_size=None):
+  """Split full reindex into shards.
+
+  Returns:
+    list of created ReindexShard objects including the final snapshot step.
+  """
+  shard_size = shard_size or settings.REINDEX_SHARD_SIZE
+  run_id = uuid.uuid4().hex
+  shards = []
+  indexed_models = get_indexed_models()
+  for model_name in sorted(indexed_models):
+    model = indexed_models[model_name]
+    ids = [id_ for id_, in db.session.query(model.id).order_by(model.id)]
+    for ids_chunk in utils.list_chunks(ids, chunk_size=shard_size):
+      shards.append(ReindexShard(
+          run_id=run_id,
+          model_name=model_name,
+          min_id=ids_chunk[0],
+          max_id=ids_chunk[-1],
+      ))
+  shards.append(ReindexShard(
+      run_id=run_id,
+      model_name=SNAPSHOT_STEP,
+      min_id=0,
+      max_id=0,
+  ))
+  db.session.add_all(shards)
+  db.session.plain_commit()
+  return shards
+
+
+def resume_shards():
+  """Get not finished shards of the latest reindex run.
+
+  Shards that were running when their tasks died are marked as pending
+  again, they continue from their last checkpoint.
+  """
+  last_shard = ReindexShard.query.order_by(ReindexShard.id.desc()).first()
+  if not last_shard:
+    return []
+  shards = ReindexShard.query.filter(
+      ReindexShard.run_id == last_shard.run_id,
+      ReindexShard.status != ReindexShard.DONE,
+  ).order_by(ReindexShard.id).all()
+  for shard in shards:
+    shard.status = ReindexShard.PENDING
+  db.session.plain_commit()
+  return shards
+
+
+@helpers.without_sqlalchemy_cache
+def reindex_shard(shard_id, chunk_size, on_finish=None):
+  """Reindex objects of the shard starting from the last checkpoint.
+
+  Args:
+    shard_id: id of ReindexShard to handle.
+    chunk_size: number of objects reindexed in a single transaction.
+    on_finish: callable run once after the whole reindex run is done.
+  """
+  shard = ReindexShard.query.get(shard_id)
+  if not shard or shard.status == ReindexShard.DONE:
+    return
+  if shard.model_name == SNAPSHOT_STEP:
+    _finish_run(shard.run_id, on_finish)
+    return
+
+  model = get_indexed_models()[shard.model_name]
+  shard.status = ReindexShard.RUNNING
+  db.session.plain_commit()
+
+  warmup_indexer_cache()
+  start_id = shard.min_id if shard.last_id is None else shard.last_id + 1
+  ids = [id_ for id_, in db.session.query(model.id).filter(
+      model.id >= start_id,
+      model.id <= shard.max_id,
+  ).order_by(model.id)]
+  with benchmark("Reindex shard %s of %s" % (shard.id, shard.model_name)):
+    for ids_chunk in utils.list_chunks(ids, chunk_size=chunk_size):
+      started = time.time()
+      model.bulk_record_update_for(ids_chunk)
+      shard.last_id = ids_chunk[-1]
+      shard.objects_count += len(ids_chunk)
+      shard.duration += time.time() - started
+      db.session.plain_commit()
+  shard.status = ReindexShard.DONE
+  db.session.plain_commit()
+  logger.info(
+      "Reindexed shard %s of %s (ids %s-%s): %s objects, %.1f objects/sec",
+      shard.id, shard.model_name, shard.min_id, shard.max_id,
+      shard.objects_count, shard.throughput,
+  )
+  _finish_run(shard.run_id, on_finish)
+
+
+def _finish_run(run_id, on_finish=None):
+  """Reindex snapshots if all model shards of the run are done.
+
+  Only one task wins the update of the snapshot step status, so snapshots are
+  reindexed once even if several shards finish at the same time.
+  """
+  remaining = ReindexShard.query.filter(
+      ReindexShard.run_id == run_id,
+      ReindexShard.model_name != SNAPSHOT_STEP,
+      ReindexShard.status != ReindexShard.DONE,
+  ).count()
+  if remaining:
+    return
+  step_filter = sa.and_(
+      ReindexShard.run_id == run_id,
+      ReindexShard.model_name == SNAPSHOT_STEP,
+  )
+  started = ReindexShard.query.filter(
+      step_filter,
+      ReindexShard.status == ReindexShard.PENDING,
+  ).update({"status": ReindexShard.RUNNING}, synchronize_session=False)
+  db.session.plain_commit()
+  if not started:
+    return
+
+  fulltext.get_indexer().invalidate_cache()
+  from ggrc.snapshotter import indexer as snapshot_indexer
+  started_at = time.time()
+  with benchmark("Create records for %s" % SNAPSHOT_STEP):
+    snapshot_indexer.reindex()
+  ReindexShard.query.filter(step_filter).update({
+      "status": ReindexShard.DONE,
+      "duration": time.time() - started_at,
+  }, synchronize_session=False)
+  db.session.plain_commit()
+  if on_finish:
+    on_finish()
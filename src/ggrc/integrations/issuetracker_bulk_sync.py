@@ -6,6 +6,8 @@
 import collections
 import datetime
 import logging
+import threading
+from multiprocessing import pool as mp_pool
 
 from werkzeug import exceptions
 
@@ -14,7 +16,7 @@ from sqlalchemy.sql import expression as expr
 
 from ggrc import models, db, login, settings
 from ggrc.app import app
-from ggrc.integrations import integrations_errors, issues
+from ggrc.integrations import integrations_errors, issues, rate_limiter
 from ggrc.integrations.synchronization_jobs import sync_utils
 from ggrc.models import all_models, inflector
 from ggrc.models import exceptions as ggrc_exceptions
@@ -33,6 +35,9 @@ WRONG_HOTLIST_ERR = "No Hotlist with id: {}"
 # Email title
 ISSUETRACKER_SYNC_TITLE = "Tickets generation status"
 
+# Result of issue synchronization skipped after a fatal error
+SKIPPED = object()
+
 
 class IssueTrackerBulkCreator(object):
   """Class with methods for bulk tickets creation in issuetracker."""
@@ -67,6 +72,7 @@ class IssueTrackerBulkCreator(object):
   def __init__(self):
     self.break_on_errs = False
     self.client = issues.Client()
+    self.limiter = None
 
   def sync_issuetracker(self, request_data):
     """Generate IssueTracker issues in bulk.
@@ -147,6 +153,10 @@ class IssueTrackerBulkCreator(object):
   def handle_issuetracker_sync(self, tracked_objs):
     """Create IssueTracker issues for tracked objects in bulk.
 
+    Issue json of all objects is prepared first, then issues are
+    synchronized concurrently and the results are handled in the order of
+    tracked objects.
+
     Args:
         tracked_objs: [(object_type, object_id)][object] - tracked object info.
 
@@ -156,8 +166,43 @@ class IssueTrackerBulkCreator(object):
     errors = []
     created = {}
 
-    # IssueTracker server api doesn't support collection post, thus we
-    # create issues in loop.
+    prepared = self._prepare_issues(tracked_objs)
+    sync_jobs = [(issue_json, issue_id)
+                 for _, issue_json, issue_id, error in prepared if not error]
+    with benchmark("Synchronize {} issues".format(len(sync_jobs))):
+      results = iter(self.sync_issues(sync_jobs))
+
+    stopped = False
+    for obj_info, issue_json, _, error in prepared:
+      if error:
+        if not stopped:
+          self._add_error(errors, obj_info.obj, error)
+        continue
+      res, error = next(results)
+      if res is SKIPPED:
+        continue
+      try:
+        if error:
+          raise error
+        self._process_result(res, issue_json)
+        created[(obj_info.obj.type, obj_info.obj.id)] = issue_json
+      except (integrations_errors.Error, TypeError, ValueError,
+              ggrc_exceptions.ValidationError,
+              exceptions.Forbidden) as error:
+        self._add_error(errors, obj_info.obj, error)
+        stopped = stopped or self._is_fatal_error(error, issue_json)
+
+    with benchmark("Update issuetracker issues in db"):
+      self.update_db_issues(created, errors)
+    return created, errors
+
+  def _prepare_issues(self, tracked_objs):
+    """Prepare issue json for tracked objects.
+
+    Returns:
+        List of (obj_info, issue_json, issue_id, error) tuples.
+    """
+    prepared = []
     for obj_info in tracked_objs:
       try:
         if not self.bulk_sync_allowed(obj_info.obj):
@@ -167,27 +212,63 @@ class IssueTrackerBulkCreator(object):
         self._populate_issue_json(obj_info, issue_json)
 
         issue_id = getattr(obj_info.obj.issuetracker_issue, "issue_id", None)
-        with benchmark("Synchronize issue for {} with id {}".format(
-            obj_info.obj.type, obj_info.obj.id
-        )):
-          res = self.sync_issue(issue_json, issue_id)
+        prepared.append((obj_info, issue_json, issue_id, None))
+      except (integrations_errors.Error, TypeError, ValueError,
+              ggrc_exceptions.ValidationError,
+              exceptions.Forbidden) as error:
+        prepared.append((obj_info, None, None, error))
+    return prepared
+
+  def _is_fatal_error(self, error, issue_json):
+    """Check if error stops synchronization of the following issues."""
+    return self.break_on_errs and getattr(error, "data", None) in (
+        WRONG_HOTLIST_ERR.format(issue_json["hotlist_ids"][0]),
+        WRONG_COMPONENT_ERR.format(issue_json["component_id"]),
+    )
 
-        self._process_result(res, issue_json)
-        created[(obj_info.obj.type, obj_info.obj.id)] = issue_json
+  def sync_issues(self, sync_jobs):
+    """Synchronize issues with ISSUE_TRACKER_BULK_SYNC_WORKERS threads.
+
+    Requests of all threads share a rate limiter. After a fatal error the
+    issues that are not started yet are skipped, results of already started
+    ones are still returned.
+
+    Args:
+        sync_jobs: [(issue_json, issue_id)] - issues to synchronize.
+
+    Returns:
+        List of (result, error) tuples in the order of sync_jobs, result is
+        SKIPPED for skipped issues.
+    """
+    self.limiter = rate_limiter.RateLimiter(
+        settings.ISSUE_TRACKER_RATE_LIMIT
+    )
+    stopped = threading.Event()
+
+    def sync(job):
+      """Synchronize single issue and catch expected errors."""
+      issue_json, issue_id = job
+      if stopped.is_set():
+        return SKIPPED, None
+      try:
+        return self.sync_issue(issue_json, issue_id), None
       except integrations_errors.Error as error:
-        self._add_error(errors, obj_info.obj, error)
-        if self.break_on_errs and getattr(error, "data", None) in (
-            WRONG_HOTLIST_ERR.format(issue_json["hotlist_ids"][0]),
-            WRONG_COMPONENT_ERR.format(issue_json["component_id"]),
-        ):
-          break
+        if self._is_fatal_error(error, issue_json):
+          stopped.set()
+        return None, error
       except (TypeError, ValueError, ggrc_exceptions.ValidationError,
               exceptions.Forbidden) as error:
-        self._add_error(errors, obj_info.obj, error)
+        return None, error
 
-    with benchmark("Update issuetracker issues in db"):
-      self.update_db_issues(created, errors)
-    return created, errors
+    workers = min(settings.ISSUE_TRACKER_BULK_SYNC_WORKERS, len(sync_jobs))
+    if workers <= 1:
+      return [sync(job) for job in sync_jobs]
+    pool = mp_pool.ThreadPool(workers)
+    try:
+      return pool.map(sync, sync_jobs)
+    finally:
+      pool.terminate()
+      pool.join()
 
   def _get_issue_json(self, object_):
     """Get json data for issuetracker issue related to provided object."""
@@ -243,7 +324,8 @@ class IssueTrackerBulkCreator(object):
         self.client,
         issue_json,
         max_attempts=10,
-        interval=10
+        interval=2,
+        rate_limiter=self.limiter,
     )
 
   @staticmethod
@@ -516,7 +598,8 @@ class IssueTrackerBulkUpdater(IssueTrackerBulkCreator):
         issue_id,
         issue_json,
         max_attempts=10,
-        interval=10
+        interval=2,
+        rate_limiter=self.limiter,
     )
 
   def update_db_issues(self, issues_info, errors):
@@ -0,0 +1,76 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Token bucket rate limiter for requests to Issue Tracker.
+
+A single limiter is shared by all threads sending requests of a bulk
+operation. Rate limited responses halve the allowed rate, every successful
+request adds a part of the configured rate back, so the request rate adapts
+to the rate the server accepts.
+"""
+
+import threading
+import time
+
+
+class RateLimiter(object):
+  """Thread safe token bucket with adaptive rate."""
+
+  # Lowest rate in requests per second the limiter slows down to.
+  MIN_RATE = 0.1
+  # Part of the configured rate restored after a successful request.
+  RECOVERY_STEP = 0.05
+  # Longest wait in seconds before a rate limited request is retried.
+  MAX_BACKOFF = 32
+
+  def __init__(self, rate, capacity=None):
+    """Create limiter.
+
+    Args:
+      rate: allowed number of requests per second.
+      capacity: max number of requests sent at once after idle time,
+          defaults to the rate.
+    """
+    self.max_rate = float(rate)
+    self.rate = self.max_rate
+    self.capacity = float(capacity or max(rate, 1))
+    self.tokens = self.capacity
+    self.updated_at = time.time()
+    self._lock = threading.Lock()
+
+  def acquire(self):
+    """Wait until a request can be sent.
+
+    Tokens are reserved in advance, so concurrent callers are spread over
+    time instead of waking up at once.
+    """
+    with self._lock:
+      now = time.time()
+      self.tokens = min(
+          self.capacity,
+          self.tokens + (now - self.updated_at) * self.rate,
+      )
+      self.updated_at = now
+      self.tokens -= 1
+      wait = -self.tokens / self.rate if self.tokens < 0 else 0
+    if wait:
+      time.sleep(wait)
+
+  def succeeded(self):
+    """Restore a part of the configured rate after a successful request."""
+    with self._lock:
+      self.rate = min(self.max_rate,
+                      self.rate + self.max_rate * self.RECOVERY_STEP)
+
+  def rate_limited(self, attempt, interval):
+    """Slow down after rate limited response and wait before retry.
+
+    Args:
+      attempt: number of the failed attempt starting from 0.
+      interval: wait in seconds before the first retry, doubled with every
+          following attempt.
+    """
+    with self._lock:
+      self.rate = max(self.MIN_RATE, self.rate / 2)
+      self.tokens = min(self.tokens, 0)
+    time.sleep(min(interval * 2 ** attempt, self.MAX_BACKOFF))
@@ -3,9 +3,11 @@
 
 """Assessment integration functionality via cron job."""
 
+import collections
 import logging
 import datetime
 
+from ggrc import db
 from ggrc.integrations import issues, integrations_errors, constants
 from ggrc.integrations.synchronization_jobs import sync_utils
 
@@ -243,7 +245,7 @@ def _update_issue(cli, issue_id, object_id, issue_payload):
     - issue_payload: Dictionary with information for Issue payload.
 
   Returns:
-    -
+    True if the issue was updated, False otherwise.
   """
   try:
     sync_utils.update_issue(cli, issue_id, issue_payload)
@@ -252,6 +254,8 @@ def _update_issue(cli, issue_id, object_id, issue_payload):
         "Unable to update status of Issue Tracker issue ID=%s for "
         "assessment ID=%d: %r",
         issue_id, object_id, error)
+    return False
+  return True
 
 
 def _check_missing_ids(assessment_issues, processed_ids):
@@ -278,17 +282,27 @@ def sync_assessment_attributes():  # noqa
   Checks for Assessments which are in sync with Issue Tracker issues and
   updates their statuses in accordance to the corresponding Assessments
   if differ.
+
+  Tickets are not compared if neither the assessment state nor the ticket
+  state changed since the last run, fingerprints of both are stored after
+  each run.
+
+  Returns:
+    dict with numbers of fetched, skipped, compared and updated tickets.
   """
+  stats = collections.Counter(fetched=0, skipped=0, compared=0, updated=0)
   assessment_issues = sync_utils.collect_issue_tracker_info(
       "Assessment",
-      include_ccs=True
+      include_ccs=True,
+      include_fingerprints=True,
   )
   if not assessment_issues:
-    return
+    return stats
   logger.debug("Syncing state of %d issues.", len(assessment_issues))
 
   cli = issues.Client()
   processed_ids = set()
+  fingerprints = []
   for batch in sync_utils.iter_issue_batches(assessment_issues.keys()):
     for issue_id, issuetracker_state in batch.iteritems():
       issue_id, issue_info = _get_issue_info_by_issue_id(
@@ -303,6 +317,15 @@ def sync_assessment_attributes():  # noqa
 
       object_id = issue_info["object_id"]
       processed_ids.add(issue_id)
+      stats["fetched"] += 1
+      local_fingerprint = sync_utils.get_local_fingerprint(issue_info)
+      remote_fingerprint = sync_utils.get_fingerprint(issuetracker_state)
+      fingerprints_pair = (local_fingerprint, remote_fingerprint)
+      if fingerprints_pair == issue_info.get("fingerprints"):
+        stats["skipped"] += 1
+        continue
+
+      stats["compared"] += 1
       issue_payload = _prepare_issue_payload(issue_info)
 
       if not _is_need_synchronize_issue(
@@ -310,9 +333,22 @@ def sync_assessment_attributes():  # noqa
           issue_payload,
           issuetracker_state
       ):
+        fingerprints.append((issue_info.get("issuetracker_issue_id"),
+                             local_fingerprint, remote_fingerprint))
         continue
 
-      _update_issue(cli, issue_id, object_id, issue_payload)
-
-  logger.debug("Sync is done, %d issue(s) were processed.", len(processed_ids))
+      if _update_issue(cli, issue_id, object_id, issue_payload):
+        stats["updated"] += 1
+        # Ticket state after the update is not known, it is compared again
+        # on the next run.
+        fingerprints.append((issue_info.get("issuetracker_issue_id"),
+                             local_fingerprint, None))
+
+  sync_utils.store_fingerprints(fingerprints)
+  db.session.commit()
+  logger.info(
+      "Assessment tickets sync is done: %(fetched)d fetched, %(skipped)d "
+      "skipped, %(compared)d compared, %(updated)d updated.", stats,
+  )
   _check_missing_ids(assessment_issues, processed_ids)
+  return stats
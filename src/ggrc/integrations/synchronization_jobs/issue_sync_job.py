@@ -5,6 +5,7 @@
 
 # pylint: disable=invalid-name
 
+import collections
 import logging
 from datetime import datetime
 
@@ -105,18 +106,38 @@ def sync_due_date(custom_fields, sync_object):
     )
 
 
+def get_local_fingerprint(sync_object):
+  """Get fingerprint of Issue attributes synchronized from Issue Tracker."""
+  return sync_utils.get_fingerprint({
+      "status": sync_object.status,
+      "due_date": sync_object.due_date,
+      "assignees": sorted(person.email for person in
+                          sync_object.get_persons_for_rolename(
+                              "Primary Contacts")),
+      "admins": sorted(person.email for person in
+                       sync_object.get_persons_for_rolename("Admin")),
+  })
+
+
 def sync_issue_attributes():
   """Synchronizes issue tracker ticket attrs with the Issue object attrs.
 
   Synchronize issue status and email list (Primary contacts and Admins).
+  Tickets are not applied to the Issue if neither the Issue nor the ticket
+  changed since the last run, fingerprints of both are stored after each run.
+
+  Returns:
+    dict with numbers of fetched, skipped and updated tickets.
   """
+  stats = collections.Counter(fetched=0, skipped=0, updated=0)
   issuetracker_issues = sync_utils.collect_issue_tracker_info(
       "Issue",
-      include_object=True
+      include_object=True,
+      include_fingerprints=True,
   )
 
   if not issuetracker_issues:
-    return
+    return stats
 
   assignees_role = all_models.AccessControlRole.query.filter_by(
       object_type=all_models.Issue.__name__, name="Primary Contacts"
@@ -127,6 +148,7 @@ def sync_issue_attributes():
   ).first()
 
   processed_ids = set()
+  fingerprints = []
   for batch in sync_utils.iter_issue_batches(issuetracker_issues.keys(),
                                              include_emails=True):
     for issue_id, issuetracker_state in batch.iteritems():
@@ -138,9 +160,17 @@ def sync_issue_attributes():
         continue
 
       processed_ids.add(issue_id)
+      stats["fetched"] += 1
       sync_object = issue_info["object"]
+      remote_fingerprint = sync_utils.get_fingerprint(issuetracker_state)
+      stored_fingerprints = issue_info.get("fingerprints") or (None, None)
+      if (remote_fingerprint == stored_fingerprints[1] and
+              get_local_fingerprint(sync_object) == stored_fingerprints[0]):
+        stats["skipped"] += 1
+        continue
 
       # Sync attributes.
+      stats["updated"] += 1
       sync_statuses(issuetracker_state, sync_object)
       sync_assignee_email(issuetracker_state, sync_object, assignees_role)
       sync_verifier_email(issuetracker_state, sync_object, admin_role)
@@ -151,9 +181,16 @@ def sync_issue_attributes():
           )
       }
       sync_due_date(custom_fields, sync_object)
+      fingerprints.append((issue_info.get("issuetracker_issue_id"),
+                           get_local_fingerprint(sync_object),
+                           remote_fingerprint))
 
+  sync_utils.store_fingerprints(fingerprints)
   db.session.commit()
-  logger.debug("Sync is done, %d issue(s) were processed.", len(processed_ids))
+  logger.info(
+      "Issue tickets sync is done: %(fetched)d fetched, %(skipped)d skipped, "
+      "%(updated)d updated.", stats,
+  )
 
   missing_ids = set(issuetracker_issues) - processed_ids
   if missing_ids:
@@ -162,3 +199,4 @@ def sync_issue_attributes():
         "but were not found in Issue Tracker: %s",
         ", ".join(str(i) for i in missing_ids)
     )
+  return stats
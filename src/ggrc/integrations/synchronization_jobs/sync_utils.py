@@ -3,11 +3,14 @@
 
 """Module provides various utils for Issue tracker integration service."""
 
+import hashlib
+import json
 import logging
 import time
 
 from sqlalchemy.sql import expression
 
+from ggrc import db
 from ggrc import models
 from ggrc.integrations import integrations_errors, constants
 from ggrc.integrations import issues
@@ -37,8 +40,12 @@ def _add_assessment_ccs(issue_object, assessment):
 
 
 def collect_issue_tracker_info(model_name, include_object=False,
-                               include_ccs=False):
-  """Returns issue tracker info associated with GGRC object."""
+                               include_ccs=False, include_fingerprints=False):
+  """Returns issue tracker info associated with GGRC object.
+
+  If include_fingerprints is set, info also contains id of IssuetrackerIssue
+  and the fingerprints stored by the last synchronization.
+  """
   issue_params = {}
   issue_objects = get_active_issue_info(model_name=model_name)
   for iti in issue_objects:
@@ -75,6 +82,12 @@ def collect_issue_tracker_info(model_name, include_object=False,
       grouped_ccs = _add_assessment_ccs(iti, sync_object)
       issue_params[iti.issue_id]["state"]["ccs"] = grouped_ccs
 
+    if include_fingerprints:
+      issue_params[iti.issue_id].update({
+          "issuetracker_issue_id": iti.id,
+          "fingerprints": (iti.local_fingerprint, iti.remote_fingerprint),
+      })
+
   return issue_params
 
 
@@ -88,6 +101,53 @@ def get_active_issue_info(model_name):
   ).order_by(issuetracker_cls.object_id).all()
 
 
+def get_fingerprint(data):
+  """Get compact fingerprint of json serializable data.
+
+  Dates and other values that are not serializable are converted to strings.
+  """
+  return hashlib.sha1(
+      json.dumps(data, sort_keys=True, default=str)
+  ).hexdigest()
+
+
+def get_local_fingerprint(issue_info):
+  """Get fingerprint of object state collected for synchronization."""
+  return get_fingerprint({
+      "component_id": issue_info.get("component_id"),
+      "state": issue_info["state"],
+  })
+
+
+def store_fingerprints(fingerprints):
+  """Store fingerprints of synchronized issues.
+
+  Fingerprints are written without ORM, so they don't create revisions of
+  the issues and don't change their modification dates.
+
+  Args:
+    fingerprints: list of (issuetracker_issue_id, local_fingerprint,
+        remote_fingerprint) tuples.
+  """
+  if not fingerprints:
+    return
+  issuetracker = models.IssuetrackerIssue.__table__
+  stmt = issuetracker.update().where(
+      issuetracker.c.id == expression.bindparam("id_"),
+  ).values(
+      local_fingerprint=expression.bindparam("local_fingerprint"),
+      remote_fingerprint=expression.bindparam("remote_fingerprint"),
+  )
+  db.session.execute(stmt, [
+      {
+          "id_": id_,
+          "local_fingerprint": local_fingerprint,
+          "remote_fingerprint": remote_fingerprint,
+      }
+      for id_, local_fingerprint, remote_fingerprint in fingerprints
+  ])
+
+
 def iter_issue_batches(ids, include_emails=False):
   """Generates a sequence of batches of issues from Issue Tracker by IDs."""
   cli = issues.Client()
@@ -131,19 +191,37 @@ def iter_issue_batches(ids, include_emails=False):
       yield issue_infos
 
 
-def update_issue(cli, issue_id, params, max_attempts=5, interval=1):
-  """Performs issue update request."""
+def _wait_for_retry(attempt, interval, rate_limiter):
+  """Wait before retry of rate limited request."""
+  if rate_limiter:
+    rate_limiter.rate_limited(attempt, interval)
+  else:
+    time.sleep(interval)
+
+
+def update_issue(cli, issue_id, params, max_attempts=5, interval=1,
+                 rate_limiter=None):
+  """Performs issue update request.
+
+  If rate_limiter is given, requests are sent at the rate it allows and
+  waits before retries of rate limited requests grow exponentially.
+  """
   last_error = integrations_errors.Error
-  for _ in range(max_attempts):
+  for attempt in range(max_attempts):
     try:
-      return cli.update_issue(issue_id, params)
+      if rate_limiter:
+        rate_limiter.acquire()
+      result = cli.update_issue(issue_id, params)
+      if rate_limiter:
+        rate_limiter.succeeded()
+      return result
     except integrations_errors.HttpError as error:
       last_error = error
       if error.status == 429:
         logger.warning(
             'The request updating ticket ID=%s was '
             'rate limited and will be re-tried: %s', issue_id, error)
-        time.sleep(interval)
+        _wait_for_retry(attempt, interval, rate_limiter)
         continue
     break
   else:
@@ -151,19 +229,28 @@ def update_issue(cli, issue_id, params, max_attempts=5, interval=1):
     raise last_error
 
 
-def create_issue(cli, params, max_attempts=5, interval=1):
-  """Performs issue create request."""
+def create_issue(cli, params, max_attempts=5, interval=1,
+                 rate_limiter=None):
+  """Performs issue create request.
+
+  Retries and rate_limiter are handled the same way as in update_issue.
+  """
   last_error = integrations_errors.Error
-  for _ in range(max_attempts):
+  for attempt in range(max_attempts):
     try:
-      return cli.create_issue(params)
+      if rate_limiter:
+        rate_limiter.acquire()
+      result = cli.create_issue(params)
+      if rate_limiter:
+        rate_limiter.succeeded()
+      return result
     except integrations_errors.HttpError as error:
       last_error = error
       if error.status == 429:
         logger.warning(
             'The request creating ticket was rate limited and '
             'will be re-tried: %s', error)
-        time.sleep(interval)
+        _wait_for_retry(attempt, interval, rate_limiter)
         continue
     break
   else:
@@ -0,0 +1,33 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext index on fulltext_record_properties content
+
+Create Date: 2018-12-03 12:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4f9a1c3b7d26'
+down_revision = 'e47d0b056385'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.execute("""
+      ALTER TABLE fulltext_record_properties
+      ADD FULLTEXT INDEX ft_fulltext_record_properties_content (content)
+  """)
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_index(
+      'ft_fulltext_record_properties_content',
+      table_name='fulltext_record_properties',
+  )
@@ -0,0 +1,45 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add reindex_shards table
+
+Create Date: 2018-12-05 09:30:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3e6f2a1c54'
+down_revision = '4f9a1c3b7d26'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'reindex_shards',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('run_id', sa.String(length=64), nullable=False),
+      sa.Column('model_name', sa.String(length=250), nullable=False),
+      sa.Column('min_id', sa.Integer(), nullable=False),
+      sa.Column('max_id', sa.Integer(), nullable=False),
+      sa.Column('last_id', sa.Integer(), nullable=True),
+      sa.Column('status', sa.String(length=16), nullable=False),
+      sa.Column('objects_count', sa.Integer(), nullable=False),
+      sa.Column('duration', sa.Float(), nullable=False),
+      sa.Column('updated_at', sa.DateTime(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+  )
+  op.create_index(
+      'ix_reindex_shards_run_id', 'reindex_shards', ['run_id', 'status'],
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('reindex_shards')
@@ -0,0 +1,41 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add person_object_counters table
+
+Create Date: 2018-12-10 11:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2c7d5e9a4b13'
+down_revision = '8b3e6f2a1c54'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'person_object_counters',
+      sa.Column('person_id', sa.Integer(), nullable=False),
+      sa.Column('object_type', sa.String(length=250), nullable=False),
+      sa.Column('count', sa.Integer(), nullable=False),
+      sa.Column('open_count', sa.Integer(), nullable=False),
+      sa.Column('next_due_date', sa.Date(), nullable=True),
+      sa.Column('updated_at', sa.DateTime(), nullable=False),
+      sa.ForeignKeyConstraint(
+          ['person_id'], ['people.id'], ondelete='CASCADE',
+      ),
+      sa.PrimaryKeyConstraint('person_id', 'object_type'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('person_object_counters')
@@ -0,0 +1,40 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add computed_attributes_progress table
+
+Create Date: 2018-12-12 10:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8b2d4f7a61'
+down_revision = '2c7d5e9a4b13'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'computed_attributes_progress',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('run_id', sa.String(length=64), nullable=False),
+      sa.Column('attribute_template_id', sa.Integer(), nullable=False),
+      sa.Column('last_id', sa.Integer(), nullable=True),
+      sa.Column('status', sa.String(length=16), nullable=False),
+      sa.Column('objects_count', sa.Integer(), nullable=False),
+      sa.Column('duration', sa.Float(), nullable=False),
+      sa.Column('updated_at', sa.DateTime(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('computed_attributes_progress')
@@ -0,0 +1,37 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fingerprints to issuetracker_issues
+
+Create Date: 2018-12-13 10:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3c9e1f5b24'
+down_revision = '5e8b2d4f7a61'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.add_column(
+      'issuetracker_issues',
+      sa.Column('local_fingerprint', sa.String(length=40), nullable=True),
+  )
+  op.add_column(
+      'issuetracker_issues',
+      sa.Column('remote_fingerprint', sa.String(length=40), nullable=True),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_column('issuetracker_issues', 'remote_fingerprint')
+  op.drop_column('issuetracker_issues', 'local_fingerprint')
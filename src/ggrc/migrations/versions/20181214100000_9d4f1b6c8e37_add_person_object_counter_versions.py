@@ -0,0 +1,52 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add person object counter versions
+
+Create Date: 2018-12-14 10:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f1b6c8e37'
+down_revision = '7a3c9e1f5b24'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  # Stored counters have no object ids, they are rebuilt on the next read.
+  op.execute("DELETE FROM person_object_counters")
+  op.add_column(
+      'person_object_counters',
+      sa.Column('object_ids', mysql.LONGTEXT(), nullable=False),
+  )
+  op.add_column(
+      'person_object_counters',
+      sa.Column('version', sa.Integer(), nullable=False,
+                server_default='0'),
+  )
+  op.create_table(
+      'person_object_counter_versions',
+      sa.Column('person_id', sa.Integer(), nullable=False),
+      sa.Column('version', sa.Integer(), nullable=False,
+                server_default='0'),
+      sa.ForeignKeyConstraint(
+          ['person_id'], ['people.id'], ondelete='CASCADE',
+      ),
+      sa.PrimaryKeyConstraint('person_id'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('person_object_counter_versions')
+  op.drop_column('person_object_counters', 'version')
+  op.drop_column('person_object_counters', 'object_ids')
@@ -0,0 +1,59 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add person object counter ids
+
+Create Date: 2018-12-17 10:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2b8e6d4a9c51'
+down_revision = '9d4f1b6c8e37'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  # Stored counters have no ids rows, they are rebuilt on the next read.
+  op.execute("DELETE FROM person_object_counters")
+  op.drop_column('person_object_counters', 'object_ids')
+  op.drop_column('person_object_counters', 'count')
+  op.create_table(
+      'person_object_counter_ids',
+      sa.Column('person_id', sa.Integer(), nullable=False),
+      sa.Column('object_type', sa.String(length=250), nullable=False),
+      sa.Column('object_id', sa.Integer(), nullable=False),
+      sa.Column('version', sa.Integer(), nullable=False,
+                server_default='0'),
+      sa.ForeignKeyConstraint(
+          ['person_id'], ['people.id'], ondelete='CASCADE',
+      ),
+      sa.PrimaryKeyConstraint('person_id', 'object_type', 'object_id'),
+  )
+  op.create_index(
+      'ix_person_object_counter_ids_object',
+      'person_object_counter_ids',
+      ['object_type', 'object_id'],
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('person_object_counter_ids')
+  op.execute("DELETE FROM person_object_counters")
+  op.add_column(
+      'person_object_counters',
+      sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+  )
+  op.add_column(
+      'person_object_counters',
+      sa.Column('object_ids', mysql.LONGTEXT(), nullable=False),
+  )
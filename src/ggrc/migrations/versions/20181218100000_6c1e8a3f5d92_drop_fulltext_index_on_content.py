@@ -0,0 +1,50 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Drop fulltext index on fulltext_record_properties content
+
+The index is created by the create_fulltext_index admin task only for
+instances that enable FULLTEXT_INVERTED_INDEX, it is kept on such instances.
+
+Create Date: 2018-12-18 10:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+from alembic import op
+
+from ggrc import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1e8a3f5d92'
+down_revision = '2b8e6d4a9c51'
+
+INDEX_NAME = 'ft_fulltext_record_properties_content'
+
+
+def has_index():
+  """Check if the fulltext index exists."""
+  return bool(op.get_bind().execute("""
+      SELECT 1 FROM information_schema.statistics
+      WHERE table_schema = DATABASE() AND
+          table_name = 'fulltext_record_properties' AND
+          index_name = '{}'
+      LIMIT 1
+  """.format(INDEX_NAME)).fetchone())
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  if has_index() and not settings.FULLTEXT_INVERTED_INDEX:
+    op.drop_index(INDEX_NAME, table_name='fulltext_record_properties')
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  if not has_index():
+    op.execute("""
+        ALTER TABLE fulltext_record_properties
+        ADD FULLTEXT INDEX {} (content)
+    """.format(INDEX_NAME))
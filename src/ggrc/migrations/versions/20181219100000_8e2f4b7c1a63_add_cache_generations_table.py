@@ -0,0 +1,36 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add cache generations table
+
+Create Date: 2018-12-19 10:00:00.000000
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f4b7c1a63'
+down_revision = '6c1e8a3f5d92'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'cache_generations',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('name', sa.String(length=250), nullable=False),
+      sa.Column('generation', sa.BigInteger(), nullable=False),
+      sa.PrimaryKeyConstraint('id'),
+      sa.UniqueConstraint('name', name='uq_cache_generations_name'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('cache_generations')
@@ -10,6 +10,7 @@ from ggrc.models import all_models
 from ggrc.models.all_models import *  # noqa
 from ggrc.utils import html_cleaner
 from ggrc.utils import benchmark
+from ggrc.utils import helpers
 
 """All GGRC model objects and associated utilities."""
 
@@ -80,6 +81,10 @@ def init_session_monitor_cache():
         cache.update_after_flush(session, flush_context)
 
   def clear_cache(session):
+    # Objects of savepoints are committed or rolled back with the outermost
+    # transaction.
+    if not helpers.is_outermost_transaction(session):
+      return
     cache = Cache.get_cache()
     if cache:
       cache.clear()
@@ -100,9 +105,13 @@ def init_sanitization_hooks():
 
 
 def init_app(app):
+  from ggrc.cache import object_counts
+  from ggrc.cache import utils as cache_utils
   init_all_models(app)
   init_lazy_mixins()
   init_session_monitor_cache()
+  cache_utils.init_data_generation_hooks()
+  object_counts.init_hooks()
   init_sanitization_hooks()
 
 from ggrc.models.inflector import get_model  # noqa
@@ -24,6 +24,7 @@ from ggrc.models.automapping import Automapping
 from ggrc.models.background_operation_type import BackgroundOperationType
 from ggrc.models.background_task import BackgroundTask
 from ggrc.models.background_operation import BackgroundOperation
+from ggrc.models.cache_generation import CacheGeneration
 from ggrc.models.categorization import Categorization
 from ggrc.models.category import CategoryBase
 from ggrc.models.comment import Comment
@@ -48,6 +49,7 @@ from ggrc.models.issue import Issue
 from ggrc.models.issuetracker_issue import IssuetrackerIssue
 from ggrc.models.label import Label
 from ggrc.models.maintenance import Maintenance
+from ggrc.models.maintenance import ReindexShard
 from ggrc.models.market import Market
 from ggrc.models.metric import Metric
 from ggrc.models.notification import Notification
@@ -103,6 +105,7 @@ all_models = [  # pylint: disable=invalid-name
     BackgroundTask,
     BackgroundOperation,
     BackgroundOperationType,
+    CacheGeneration,
     Categorization,
     CategoryBase,
     Comment,
@@ -144,6 +147,7 @@ all_models = [  # pylint: disable=invalid-name
     Project,
     Proposal,
     Regulation,
+    ReindexShard,
     Relationship,
     Requirement,
     Review,
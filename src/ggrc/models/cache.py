@@ -1,18 +1,73 @@
 # Copyright (C) 2018 Google Inc.
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
+import collections
 import logging
+
+import sqlalchemy as sa
+from sqlalchemy import orm
 from flask import g, has_app_context
 
+from ggrc import utils
+from ggrc.models import reflection
 from ggrc.utils import benchmark
 
 logger = logging.getLogger(__name__)
 
+PRELOAD_CHUNK_SIZE = 500
+
+
+def _needs_preload(obj, preload_attrs):
+  """Check if any of the attributes preloaded for log_json is not loaded."""
+  state = sa.inspect(obj)
+  if not state.persistent:
+    return False
+  unloaded = state.unloaded
+  return any(path.split(".")[0] in unloaded for path in preload_attrs)
+
+
+def _is_orphan(obj):
+  """Check if the flush deletes the object due to delete-orphan cascade."""
+  state = sa.inspect(obj, raiseerr=False)
+  if state is None or not state.has_identity:
+    return False
+  # pylint: disable=protected-access
+  return state.mapper._is_orphan(state)
+
+
+def preload_log_json(objects):
+  """Load related objects needed by log_json of the objects in bulk.
+
+  Attributes listed in `_log_json_preload` of model classes are loaded for
+  all given objects of the class with a single query and subquery loads,
+  instead of lazy loads for every object. Attributes with dots are loaded
+  with all objects on the path.
+  """
+  objects_by_class = collections.defaultdict(list)
+  for obj in objects:
+    objects_by_class[obj.__class__].append(obj)
+  for model, model_objects in objects_by_class.iteritems():
+    preload_attrs = reflection.AttributeInfo.gather_attrs(
+        model, "_log_json_preload",
+    )
+    if not preload_attrs:
+      continue
+    ids = [obj.id for obj in model_objects
+           if _needs_preload(obj, preload_attrs)]
+    if not ids:
+      continue
+    options = [orm.subqueryload_all(path) for path in sorted(preload_attrs)]
+    for ids_chunk in utils.list_chunks(ids, chunk_size=PRELOAD_CHUNK_SIZE):
+      model.query.options(*options).filter(model.id.in_(ids_chunk)).all()
+
 
 class Cache:
   """
   Tracks modified objects in the session distinguished by
   type of modification: new, dirty and deleted.
+
+  Log JSON of tracked objects is built at most once for their final state,
+  see get_log_jsons.
   """
   def __init__(self):
     self.clear()
@@ -20,19 +75,32 @@ class Cache:
   def update_before_flush(self, session, flush_context):
     """
     Before the flush happens, we can still access to-be-deleted objects, so
-    record JSON for log here
+    record JSON for log here. Log JSON of new and dirty objects is built
+    later, after their last flush, except for orphans that the flush deletes
+    with their related objects.
     """
     with benchmark("log json before flush"):
+      if session.new or session.dirty or session.deleted:
+        # Objects may change with this flush, previously built JSON of new
+        # and dirty objects is outdated.
+        self.log_jsons.clear()
       for o in session.new:
         if hasattr(o, 'log_json'):
-          self.new[o] = o.log_json()
-      for o in session.deleted:
-        if hasattr(o, 'log_json'):
-          self.deleted[o] = o.log_json()
+          self.new[o] = None
+      deleted = [o for o in session.deleted
+                 if hasattr(o, 'log_json') and self.deleted.get(o) is None]
+      preload_log_json(deleted)
+      for o in deleted:
+        self.deleted[o] = o.log_json()
       dirty = set(o for o in session.dirty if session.is_modified(o))
       for o in dirty - set(self.new) - set(self.deleted):
         if hasattr(o, 'log_json'):
-          self.dirty[o] = o.log_json()
+          self.dirty[o] = None
+      orphans = [o for o in self.dirty
+                 if self.dirty[o] is None and _is_orphan(o)]
+      preload_log_json(orphans)
+      for o in orphans:
+        self.dirty[o] = o.log_json()
 
   def update_after_flush(self, session, flush_context):
     """
@@ -43,21 +111,51 @@ class Cache:
     for o in self.dirty.keys():
       # SQLAlchemy magic to determine whether object was actually deleted due
       #   to `cascade="all,delete-orphan"`
-      # If an object was actually deleted, move it into `deleted`
+      # If an object was actually deleted, move it into `deleted` with JSON
+      #   recorded before the flush
       if flush_context.is_deleted(o._sa_instance_state):
         self.deleted[o] = self.dirty[o]
         del self.dirty[o]
 
+  def get_log_jsons(self, objects):
+    """Get log JSON of the objects built once per object state.
+
+    JSON of deleted objects is the one recorded before their deletion. JSON
+    of other objects is built with related objects loaded in bulk and reused
+    until the next flush with changes.
+
+    Returns:
+      list of log JSON dicts in the order of the given objects.
+    """
+    objects = list(objects)
+    missing = [o for o in objects
+               if self.deleted.get(o) is None and o not in self.log_jsons]
+    if missing:
+      with benchmark("log json of modified objects"):
+        preload_log_json(missing)
+        for o in missing:
+          self.log_jsons[o] = o.log_json()
+    return [self.deleted.get(o) or self.log_jsons[o] for o in objects]
+
   def clear(self):
     self.new = {}
     self.dirty = {}
     self.deleted = {}
+    self.log_jsons = {}
+
+  def update(self, other):
+    """Add objects tracked by other cache to this cache."""
+    self.new.update(other.new)
+    self.dirty.update(other.dirty)
+    self.deleted.update(other.deleted)
+    self.log_jsons.update(other.log_jsons)
 
   def copy(self):
     copied_cache = Cache()
     copied_cache.new = dict(self.new)
     copied_cache.dirty = dict(self.dirty)
     copied_cache.deleted = dict(self.deleted)
+    copied_cache.log_jsons = dict(self.log_jsons)
     return copied_cache
 
   @staticmethod
@@ -0,0 +1,102 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Generation counters of process local caches.
+
+Values built from rarely changed tables are cached in every process. Each
+cache has a generation counter stored in the database. The counter is bumped
+in the same transaction that changes objects of the models the cache depends
+on. The counter and the cached value are read in the same transaction, so a
+cached value is never used with a generation newer than the data it was
+built from.
+"""
+
+import time
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc.models.mixins.base import Identifiable
+
+
+# Names of model classes whose changes bump each generation counter.
+GENERATION_MODELS = {
+    "propagation_graph": ("AccessControlRole",),
+    "snapshot_metadata": ("CustomAttributeDefinition", "Option"),
+}
+
+
+class CacheGeneration(Identifiable, db.Model):
+  """Generation counter of a process local cache."""
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = "cache_generations"
+
+  name = db.Column(db.String(250), nullable=False, unique=True)
+  generation = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+def get_generation(name):
+  """Get current value of a generation counter.
+
+  Counters without a row have generation 0.
+  """
+  generation = db.session.query(CacheGeneration.generation).filter(
+      CacheGeneration.name == name,
+  ).scalar()
+  return generation or 0
+
+
+def bump_generations(names):
+  """Increment generation counters with the given names.
+
+  Missing counters start from the current time, so that a deleted counter
+  never gets back to a value used by an already cached value.
+  """
+  initial = int(time.time() * 1000)
+  # Sorted names keep the lock order.
+  for name in sorted(names):
+    db.session.execute(
+        sa.text("""
+            INSERT INTO cache_generations (name, generation)
+            VALUES (:name, :initial)
+            ON DUPLICATE KEY UPDATE generation = generation + 1
+        """),
+        {"name": name, "initial": initial},
+    )
+
+
+def get_changed_generations(objects):
+  """Get names of generation counters affected by changed objects."""
+  names = set()
+  for obj in objects:
+    type_ = obj.__class__.__name__
+    names.update(name for name, model_names in GENERATION_MODELS.iteritems()
+                 if type_ in model_names)
+  return names
+
+
+class GenerationCache(object):
+  """Process local value that is built again when its generation changes.
+
+  Attributes:
+    name: name of the generation counter in GENERATION_MODELS.
+    build: function that builds the value from the database.
+  """
+
+  def __init__(self, name, build):
+    if name not in GENERATION_MODELS:
+      raise ValueError("Unknown cache generation: {}".format(name))
+    self.name = name
+    self.build = build
+    # Generation and value are replaced together with a single assignment.
+    self._cached = (None, None)
+
+  def get(self):
+    """Get the value built for the current generation."""
+    generation = get_generation(self.name)
+    cached_generation, value = self._cached
+    if cached_generation != generation:
+      value = self.build()
+      self._cached = (generation, value)
+    return value
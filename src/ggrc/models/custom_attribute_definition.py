@@ -3,6 +3,8 @@
 
 """Custom attribute definition module"""
 
+import collections
+
 import flask
 from sqlalchemy import func
 from sqlalchemy.ext.declarative import declared_attr
@@ -382,6 +384,39 @@ def get_custom_attributes_for(model_name, instance_id=None):
   return cads
 
 
+def get_custom_attributes_for_many(model_name, instance_ids):
+  """Returns custom attributes jsons for sent model_name and instance_ids.
+
+  Global CADs are shared by all instances and local CADs of all instances are
+  loaded with a single query.
+
+  Returns:
+    dict with instance ids as keys and lists of CAD jsons as values.
+  """
+  from ggrc import models
+  instance_ids = set(instance_ids)
+  model = models.get_model(model_name)
+  if not model or not issubclass(model, models.mixins.CustomAttributable):
+    return {instance_id: [] for instance_id in instance_ids}
+
+  definition_type = get_model_name_inflector_dict()[model_name]
+  if not definition_type:
+    return {instance_id: [] for instance_id in instance_ids}
+  global_cads = get_global_cads(definition_type)
+  local_cads = collections.defaultdict(list)
+  if instance_ids and get_cads_counts().get((definition_type, False)):
+    query = CustomAttributeDefinition.query.filter(
+        CustomAttributeDefinition.definition_type == definition_type,
+        CustomAttributeDefinition.definition_id.in_(instance_ids),
+    )
+    for cad in query:
+      local_cads[cad.definition_id].append(cad.log_json())
+  return {
+      instance_id: list(global_cads) + local_cads[instance_id]
+      for instance_id in instance_ids
+  }
+
+
 class CustomAttributeMapable(object):
   # pylint: disable=too-few-public-methods
   # because this is a mixin
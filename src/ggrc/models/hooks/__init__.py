@@ -6,6 +6,7 @@
 from ggrc.models.hooks import common
 from ggrc.models.hooks import assessment
 from ggrc.models.hooks import audit
+from ggrc.models.hooks import cache_generation
 from ggrc.models.hooks import comment
 from ggrc.models.hooks import custom_attribute_definition
 from ggrc.models.hooks import issue
@@ -14,18 +15,21 @@ from ggrc.models.hooks import relationship
 from ggrc.models.hooks import acl
 from ggrc.models.hooks import proposal
 from ggrc.models.hooks import access_control_role
+from ggrc.models.hooks import person_counters
 
 
 ALL_HOOKS = [
     access_control_role,
     assessment,
     audit,
+    cache_generation,
     comment,
     issue,
     relationship,
     custom_attribute_definition,
     acl,
     common,
+    person_counters,
 
     # Keep IssueTracker at the end of list to make sure that all other hooks
     # are already executed and all data is final.
@@ -8,7 +8,10 @@ This package should have the single hook that should handle all acl propagation
 and deletion.
 """
 
+import collections
+import itertools
 import logging
+import time
 
 import flask
 import sqlalchemy as sa
@@ -19,6 +22,7 @@ from ggrc import utils
 from ggrc.utils import helpers
 from ggrc.access_control import utils as acl_utils
 from ggrc.models import all_models
+from ggrc.models import cache_generation
 from ggrc.models.hooks import access_control_role
 
 logger = logging.getLogger(__name__)
@@ -28,6 +32,96 @@ logger = logging.getLogger(__name__)
 # contain cycles.
 PROPAGATION_DEPTH_LIMIT = 50
 
+# Minimal number of base ACL entries propagated at once by propagate_all. ACL
+# entries of a single object are never split between chunks.
+PROPAGATE_ALL_CHUNK_SIZE = 50
+
+
+class PropagationGraph(object):
+  """Role propagation rules defined by access control role parents.
+
+  Attributes:
+    propagating_role_ids: ids of roles that have child roles. Only ACL entries
+      with these roles can propagate further.
+    relationship_types: pairs of object types (parent type, mapped type) for
+      which a relationship between objects of these types gets propagated ACL
+      entries.
+  """
+
+  def __init__(self, roles):
+    roles_by_id = {role.id: role for role in roles}
+    children = collections.defaultdict(list)
+    for role in roles:
+      if role.parent_id is not None:
+        children[role.parent_id].append(role)
+
+    self.propagating_role_ids = frozenset(children)
+
+    relationship_types = set()
+    for parent_id, child_roles in children.iteritems():
+      if parent_id not in roles_by_id:
+        continue
+      parent_type = roles_by_id[parent_id].object_type
+      for child in child_roles:
+        if child.object_type != all_models.Relationship.__name__:
+          continue
+        for grandchild in children.get(child.id, []):
+          relationship_types.add((parent_type, grandchild.object_type))
+    self.relationship_types = frozenset(relationship_types)
+
+  def is_propagated_relationship(self, source_type, destination_type):
+    """Check if relationship between given types can get ACL entries."""
+    return ((source_type, destination_type) in self.relationship_types or
+            (destination_type, source_type) in self.relationship_types)
+
+
+def _build_propagation_graph():
+  """Build role propagation graph from access control roles."""
+  acr_table = all_models.AccessControlRole.__table__
+  roles = db.session.execute(
+      sa.select([
+          acr_table.c.id,
+          acr_table.c.object_type,
+          acr_table.c.parent_id,
+      ])
+  ).fetchall()
+  return PropagationGraph(roles)
+
+
+_GRAPH_CACHE = cache_generation.GenerationCache(
+    "propagation_graph", _build_propagation_graph,
+)
+
+
+def get_propagation_graph():
+  """Get role propagation graph.
+
+  The graph is cached and only rebuilt when access control roles change.
+  """
+  return _GRAPH_CACHE.get()
+
+
+class PropagationStep(object):
+  """Timing and row count metrics for a single propagation step."""
+
+  def __init__(self, depth, parent_count):
+    self.depth = depth
+    self.parent_count = parent_count
+    self.inserted_count = 0
+    self.duration = 0
+    self._start = None
+
+  def __enter__(self):
+    self._start = time.time()
+    return self
+
+  def __exit__(self, exc_type, exc_value, exc_trace):
+    self.duration = time.time() - self._start
+    logger.debug(
+        "ACL propagation step %s: %s parent entries, %s new entries, %.4fs",
+        self.depth, self.parent_count, self.inserted_count, self.duration,
+    )
+
 
 def _rel_parent(parent_acl_ids=None, relationship_ids=None, source=True,
                 user_id=None):
@@ -204,7 +298,7 @@ def _handle_propagation_parents(parent_acl_ids, user_id):
   src_select = _rel_parent(parent_acl_ids, source=True, user_id=user_id)
   dst_select = _rel_parent(parent_acl_ids, source=False, user_id=user_id)
   select_statement = sa.union(src_select, dst_select)
-  acl_utils.insert_select_acls(select_statement)
+  return acl_utils.insert_select_acls(select_statement)
 
 
 def _handle_propagation_children(new_parent_ids, user_id):
@@ -212,7 +306,7 @@ def _handle_propagation_children(new_parent_ids, user_id):
   src_select = _rel_child(new_parent_ids, source=True, user_id=user_id)
   dst_select = _rel_child(new_parent_ids, source=False, user_id=user_id)
   select_statement = sa.union(src_select, dst_select)
-  acl_utils.insert_select_acls(select_statement)
+  return acl_utils.insert_select_acls(select_statement)
 
 
 def _handle_propagation_rel(relationship_ids, new_acl_ids, user_id):
@@ -230,10 +324,10 @@ def _handle_propagation_rel(relationship_ids, new_acl_ids, user_id):
       user_id=user_id,
   )
   select_statement = sa.union(src_select, dst_select)
-  acl_utils.insert_select_acls(select_statement)
+  return acl_utils.insert_select_acls(select_statement)
 
 
-def _handle_acl_step(parent_acl_ids, user_id):
+def _handle_acl_step(parent_acl_ids, user_id, step=None):
   """Handle role propagation through relationships.
 
   For handling relationships of type:
@@ -241,42 +335,117 @@ def _handle_acl_step(parent_acl_ids, user_id):
   The parent part of this function refers to propagation from Audit to
   Relationship. The child part refers to propagation from Relationship to
   Object (either Assessment, Issue, Document, Comment)
+
+  Args:
+    parent_acl_ids: list of parent acl entries or query with parent ids.
+    user_id: id of the user that caused the propagation.
+    step: PropagationStep for collecting the number of inserted entries.
+  Returns:
+    query with ids of newly propagated ACL entries on child objects.
   """
 
-  _handle_propagation_parents(parent_acl_ids, user_id)
+  inserted_count = _handle_propagation_parents(parent_acl_ids, user_id)
   new_parent_ids = _get_child_ids(parent_acl_ids)
-  _handle_propagation_children(new_parent_ids, user_id)
+  inserted_count += _handle_propagation_children(new_parent_ids, user_id)
+  if step:
+    step.inserted_count += inserted_count
 
   return _get_child_ids(new_parent_ids)
 
 
-def _handle_relationship_step(relationship_ids, new_acl_ids, user_id):
+def _handle_relationship_step(relationship_ids, new_acl_ids, user_id,
+                              step=None):
   """Propagate first level or ACLs caused by new relationships."""
 
-  _handle_propagation_rel(relationship_ids, new_acl_ids, user_id)
+  inserted_count = _handle_propagation_rel(
+      relationship_ids, new_acl_ids, user_id
+  )
   new_parent_ids = _get_relationship_acl_ids(relationship_ids)
-  _handle_propagation_children(new_parent_ids, user_id)
+  inserted_count += _handle_propagation_children(new_parent_ids, user_id)
+  if step:
+    step.inserted_count += inserted_count
 
   return _get_child_ids(new_parent_ids)
 
 
-def _propagate(parent_acl_ids, user_id):
-  """Propagate ACL entries through the entire propagation tree."""
+def _get_propagating_acl_ids(acl_ids, graph):
+  """Get ids of the given ACL entries that can propagate further.
 
-  # The following for statement is a replacement for `while True` statement
-  # with a safety cutoff limit.
-  for _ in range(PROPAGATION_DEPTH_LIMIT):
+  Args:
+    acl_ids: list of acl ids or query with acl ids.
+    graph: PropagationGraph with current role propagation rules.
+  Returns:
+    list of ids of ACL entries with roles that have child roles.
+  """
+  if not graph.propagating_role_ids:
+    return []
+  if isinstance(acl_ids, sa.sql.Selectable):
+    chunks = [acl_ids]
+  else:
+    chunks = utils.list_chunks(list(acl_ids), chunk_size=10000)
 
-    child_ids = _handle_acl_step(parent_acl_ids, user_id)
+  acl_table = all_models.AccessControlList.__table__
+  propagating_ids = []
+  for chunk in chunks:
+    query = sa.select([acl_table.c.id]).where(
+        sa.and_(
+            acl_table.c.id.in_(chunk),
+            acl_table.c.ac_role_id.in_(graph.propagating_role_ids),
+        )
+    )
+    propagating_ids.extend(row.id for row in db.session.execute(query))
+  return propagating_ids
+
+
+def _get_propagated_relationship_ids(relationship_ids, graph):
+  """Get ids of the given relationships that can get ACL entries."""
+  rel_table = all_models.Relationship.__table__
+  propagated_ids = []
+  for chunk in utils.list_chunks(list(relationship_ids), chunk_size=10000):
+    query = sa.select([
+        rel_table.c.id,
+        rel_table.c.source_type,
+        rel_table.c.destination_type,
+    ]).where(
+        rel_table.c.id.in_(chunk)
+    )
+    propagated_ids.extend(
+        rel.id for rel in db.session.execute(query)
+        if graph.is_propagated_relationship(rel.source_type,
+                                            rel.destination_type)
+    )
+  return propagated_ids
+
+
+def _propagate(parent_acl_ids, user_id, graph=None):
+  """Propagate ACL entries through the entire propagation tree.
+
+  Each step only handles the entries created by the previous step. Entries
+  whose roles can not propagate any further are dropped from the next step
+  and ids are fetched after each step so that queries do not get nested with
+  the propagation depth.
 
-    count_query = child_ids.alias("counts").count()
-    child_id_count = db.session.execute(count_query).scalar()
+  Returns:
+    list of PropagationStep metrics for all executed steps.
+  """
+  graph = graph or get_propagation_graph()
+  parent_acl_ids = _get_propagating_acl_ids(parent_acl_ids, graph)
+  steps = []
 
-    if child_id_count:
-      parent_acl_ids = child_ids
-    else:
+  # The following for statement is a replacement for `while True` statement
+  # with a safety cutoff limit.
+  for depth in range(PROPAGATION_DEPTH_LIMIT):
+    if not parent_acl_ids:
       # Exit the loop when there are no more ACL entries to propagate
-      return
+      return steps
+
+    with PropagationStep(depth, len(parent_acl_ids)) as step:
+      child_ids = _handle_acl_step(parent_acl_ids, user_id, step)
+      parent_acl_ids = _get_propagating_acl_ids(child_ids, graph)
+    steps.append(step)
+
+  if not parent_acl_ids:
+    return steps
 
   # We should only be able to get here if the propagation failed to finish in
   # PROPAGATION_DEPTH_LIMIT iterations.
@@ -284,16 +453,27 @@ def _propagate(parent_acl_ids, user_id):
                   "tree for cycles, invalid entries or too deep entries.")
 
 
-def _propagate_relationships(relationship_ids, new_acl_ids, user_id):
+def _propagate_relationships(relationship_ids, new_acl_ids, user_id,
+                             graph=None):
   """Start ACL propagation for newly created relationships.
 
   Note this function will only propagate old ACL entries. All newly created
   ones will be propagated after relationship propagation finishes.
+
+  Returns:
+    list of PropagationStep metrics for all executed steps.
   """
   if not relationship_ids:
-    return
-  child_ids = _handle_relationship_step(relationship_ids, new_acl_ids, user_id)
-  _propagate(child_ids, user_id)
+    return []
+  graph = graph or get_propagation_graph()
+  relationship_ids = _get_propagated_relationship_ids(relationship_ids, graph)
+  if not relationship_ids:
+    return []
+  with PropagationStep(0, len(relationship_ids)) as step:
+    child_ids = _handle_relationship_step(
+        relationship_ids, new_acl_ids, user_id, step
+    )
+  return [step] + _propagate(child_ids, user_id, graph)
 
 
 def _delete_orphan_acl_entries(deleted_objects):
@@ -353,11 +533,14 @@ def propagate():
   Args:
     new_acl_ids: list of newly created ACL ids,
     new_relationship_ids: list of newly created relationship ids,
+
+  Returns:
+    list of PropagationStep metrics for all executed propagation steps.
   """
   if not (hasattr(flask.g, "new_acl_ids") and
           hasattr(flask.g, "new_relationship_ids") and
           hasattr(flask.g, "deleted_objects")):
-    return
+    return []
 
   if flask.g.deleted_objects:
     with utils.benchmark("Delete internal ACL entries for deleted objects"):
@@ -366,23 +549,29 @@ def propagate():
   _set_empty_base_ids()
 
   current_user_id = login.get_current_user_id()
+  steps = []
+  graph = None
+  if flask.g.new_relationship_ids or flask.g.new_acl_ids:
+    graph = get_propagation_graph()
 
   # The order of propagation of relationships and other ACLs is important
   # because relationship code excludes other ACLs from propagating.
   if flask.g.new_relationship_ids:
     with utils.benchmark("Propagate ACLs for new relationships"):
-      _propagate_relationships(
+      steps.extend(_propagate_relationships(
           flask.g.new_relationship_ids,
           flask.g.new_acl_ids,
           current_user_id,
-      )
+          graph,
+      ))
   if flask.g.new_acl_ids:
     with utils.benchmark("Propagate new ACL entries"):
-      _propagate(flask.g.new_acl_ids, current_user_id)
+      steps.extend(_propagate(flask.g.new_acl_ids, current_user_id, graph))
 
   del flask.g.new_acl_ids
   del flask.g.new_relationship_ids
   del flask.g.deleted_objects
+  return steps
 
 
 def _add_missing_acl_entries():
@@ -401,24 +590,96 @@ def _add_missing_acl_entries():
     access_control_role.handle_role_acls(role)
 
 
+def _get_checkpoint(task):
+  """Get the last object propagated by a previous run of the task."""
+  if task is None or not isinstance(task.payload, dict):
+    return None
+  return task.payload.get("propagate_all_checkpoint")
+
+
+def _set_checkpoint(task, checkpoint):
+  """Store the last propagated object in the task payload."""
+  if task is None:
+    return
+  payload = dict(task.payload or {})
+  payload["propagate_all_checkpoint"] = checkpoint
+  task.payload = payload
+  db.session.add(task)
+  db.session.plain_commit()
+
+
+def _get_base_acl_rows(checkpoint=None):
+  """Get non propagated ACL entries ordered by the objects they belong to.
+
+  Args:
+    checkpoint: (object_type, object_id) of the last already propagated
+      object. Only entries of objects after it are returned.
+  """
+  acl_table = all_models.AccessControlList.__table__
+  query = sa.select([
+      acl_table.c.id,
+      acl_table.c.object_type,
+      acl_table.c.object_id,
+  ]).where(
+      acl_table.c.parent_id.is_(None),
+  ).order_by(
+      acl_table.c.object_type,
+      acl_table.c.object_id,
+      acl_table.c.id,
+  )
+  if checkpoint:
+    object_type, object_id = checkpoint
+    query = query.where(sa.or_(
+        acl_table.c.object_type > object_type,
+        sa.and_(
+            acl_table.c.object_type == object_type,
+            acl_table.c.object_id > object_id,
+        ),
+    ))
+  return db.session.execute(query).fetchall()
+
+
+def _chunk_by_object(acl_rows, chunk_size=PROPAGATE_ALL_CHUNK_SIZE):
+  """Split ACL rows into chunks without splitting entries of one object."""
+  chunk = []
+  grouped_rows = itertools.groupby(
+      acl_rows, key=lambda row: (row.object_type, row.object_id)
+  )
+  for _, object_rows in grouped_rows:
+    chunk.extend(object_rows)
+    if len(chunk) >= chunk_size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
 @helpers.without_sqlalchemy_cache
-def propagate_all():
-  """Re-evaluate propagation for all objects."""
+def propagate_all(task=None):
+  """Re-evaluate propagation for all objects.
+
+  ACL entries are propagated in chunks of whole objects. If a background task
+  is given, the last propagated object is stored in the task payload after
+  each chunk so that a retried task continues where the failed run stopped.
+
+  Args:
+    task: optional BackgroundTask that runs the propagation.
+  """
   with utils.benchmark("Run propagate_all"):
-    with utils.benchmark("Add missing acl entries"):
-      _add_missing_acl_entries()
+    checkpoint = _get_checkpoint(task)
+    if checkpoint is None:
+      with utils.benchmark("Add missing acl entries"):
+        _add_missing_acl_entries()
+    else:
+      logger.info("Resuming ACL propagation after %s %s", *checkpoint)
     with utils.benchmark("Get non propagated acl ids"):
-      query = db.session.query(
-          all_models.AccessControlList.id,
-      ).filter(
-          all_models.AccessControlList.parent_id.is_(None),
-      )
-      all_acl_ids = [acl.id for acl in query]
+      acl_rows = _get_base_acl_rows(checkpoint)
 
     with utils.benchmark("Propagate normal acl entries"):
-      count = len(all_acl_ids)
+      count = len(acl_rows)
       propagated_count = 0
-      for acl_ids in utils.list_chunks(all_acl_ids, chunk_size=50):
+      for chunk in _chunk_by_object(acl_rows):
+        acl_ids = [row.id for row in chunk]
         propagated_count += len(acl_ids)
         logger.info("Propagating ACL entries: %s/%s", propagated_count, count)
         _delete_propagated_acls(acl_ids)
@@ -427,3 +688,4 @@ def propagate_all():
         flask.g.new_relationship_ids = set()
         flask.g.deleted_objects = set()
         propagate()
+        _set_checkpoint(task, (chunk[-1].object_type, chunk[-1].object_id))
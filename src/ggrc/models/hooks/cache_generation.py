@@ -0,0 +1,24 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Hooks that bump generation counters of process local caches."""
+
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc.models import cache_generation
+
+
+def after_flush(session, _):
+  """Bump generations of caches affected by the flushed changes."""
+  changed = session.new | session.deleted | {
+      obj for obj in session.dirty if session.is_modified(obj)
+  }
+  names = cache_generation.get_changed_generations(changed)
+  if names:
+    cache_generation.bump_generations(names)
+
+
+def init_hook():
+  """Initialize cache generation hooks."""
+  sa.event.listen(Session, "after_flush", after_flush)
@@ -0,0 +1,108 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Hooks that keep materialized object counters of people up to date.
+
+Counters versions of people affected by flushed changes are incremented in the
+same transaction, their stored counters are rebuilt on the next read. Ids of
+deleted objects are removed from stored counters of all people.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc.models import all_models
+from ggrc.query import person_counters
+from ggrc.utils import benchmark
+
+
+TASK_ATTRS = ("status", "end_date", "cycle_id")
+CYCLE_ATTRS = ("is_current", "is_verification_needed")
+ROLE_ATTRS = ("name", "read", "my_work", "internal", "object_type")
+
+
+def _is_changed(obj, attrs):
+  """Check if any of the given attributes of a dirty object changed."""
+  state = sa.inspect(obj)
+  return any(state.attrs[attr].history.has_changes()
+             for attr in attrs if attr in state.attrs)
+
+
+def _get_values(obj, attr):
+  """Get current and previous values of an attribute."""
+  return set(sa.inspect(obj).attrs[attr].history.sum())
+
+
+def _get_task_assignees(session, task_ids, cycle_ids):
+  """Get ids of people with roles on the given tasks or tasks of cycles."""
+  if not task_ids and not cycle_ids:
+    return set()
+  acl = all_models.AccessControlList.__table__
+  acp = all_models.AccessControlPerson.__table__
+  task = all_models.CycleTaskGroupObjectTask.__table__
+  task_filter = []
+  if task_ids:
+    task_filter.append(acl.c.object_id.in_(list(task_ids)))
+  if cycle_ids:
+    task_filter.append(acl.c.object_id.in_(
+        sa.select([task.c.id]).where(task.c.cycle_id.in_(list(cycle_ids)))
+    ))
+  query = sa.select([acp.c.person_id]).select_from(
+      acp.join(acl, acl.c.id == acp.c.ac_list_id)
+  ).where(sa.and_(
+      acl.c.object_type == person_counters.TASK_TYPE,
+      sa.or_(*task_filter),
+  )).distinct()
+  return {person_id for person_id, in session.execute(query)}
+
+
+def collect_affected_people(session):
+  """Get ids of people whose counters are affected by pending changes.
+
+  Returns:
+    set of person ids or None if counters of all people are affected.
+  """
+  person_ids = set()
+  task_ids = set()
+  cycle_ids = set()
+  changed = session.new | session.dirty | session.deleted
+  for obj in changed:
+    if isinstance(obj, all_models.AccessControlPerson):
+      person_ids.update(_get_values(obj, "person_id"))
+    elif isinstance(obj, all_models.CustomAttributeValue):
+      if "Person" in _get_values(obj, "attribute_value"):
+        person_ids.update(_get_values(obj, "attribute_object_id"))
+    elif isinstance(obj, all_models.AccessControlRole):
+      if obj in session.deleted or _is_changed(obj, ROLE_ATTRS):
+        return None
+    elif obj in session.dirty:
+      type_ = obj.__class__.__name__
+      if type_ == person_counters.TASK_TYPE and _is_changed(obj, TASK_ATTRS):
+        task_ids.add(obj.id)
+      elif type_ == "Cycle" and _is_changed(obj, CYCLE_ATTRS):
+        cycle_ids.add(obj.id)
+  person_ids.update(_get_task_assignees(session, task_ids, cycle_ids))
+  person_ids.discard(None)
+  return person_ids
+
+
+def collect_deleted_objects(session):
+  """Get ids of deleted objects by object type."""
+  objects = {}
+  for obj in session.deleted:
+    type_ = obj.__class__.__name__
+    if type_ in person_counters.MY_WORK_TYPES:
+      objects.setdefault(type_, set()).add(obj.id)
+  return objects
+
+
+def after_flush(session, _):
+  """Invalidate stored counters of people affected by the flushed changes."""
+  with benchmark("Invalidate person object counters"):
+    person_counters.invalidate(collect_affected_people(session))
+    person_counters.remove_objects(collect_deleted_objects(session))
+
+
+def init_hook():
+  """Initialize person counters hooks."""
+  sa.event.listen(Session, "after_flush", after_flush)
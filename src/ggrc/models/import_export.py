@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from logging import getLogger
 
 from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.declarative import declared_attr
 
 from ggrc import db
 from ggrc.models.mixins.base import Identifiable
@@ -61,6 +62,57 @@ class ImportExport(Identifiable, db.Model):
   title = db.Column(db.Text)
   content = db.Column(mysql.LONGTEXT)
   gdrive_metadata = db.Column('gdrive_metadata', db.Text)
+  parts = db.relationship(
+      'ImportExportPart',
+      order_by='ImportExportPart.position',
+      lazy='dynamic',
+      passive_deletes=True,
+  )
+
+  def store_content_parts(self, chunks):
+    """Store job content as a sequence of parts.
+
+    Each chunk is inserted with a separate statement and is not tracked by the
+    session, so only one chunk of content is kept in memory at a time.
+
+    Args:
+      chunks: iterable with utf-8 encoded strings.
+
+    Returns:
+      Number of stored parts.
+    """
+    inserter = ImportExportPart.__table__.insert()
+    count = 0
+    for position, chunk in enumerate(chunks):
+      db.session.execute(inserter.values(
+          import_export_id=self.id,
+          position=position,
+          content=chunk.decode("utf-8"),
+      ))
+      count += 1
+    return count
+
+  def iter_content(self):
+    """Yield utf-8 encoded job content.
+
+    Content of jobs stored in parts is loaded from the database one part at
+    a time.
+    """
+    if self.content is not None:
+      yield self.content.encode("utf-8")
+      return
+    part_ids = [part_id for part_id, in db.session.query(
+        ImportExportPart.id
+    ).filter(
+        ImportExportPart.import_export_id == self.id
+    ).order_by(
+        ImportExportPart.position
+    )]
+    for part_id in part_ids:
+      content = db.session.query(ImportExportPart.content).filter(
+          ImportExportPart.id == part_id
+      ).scalar()
+      yield content.encode("utf-8")
 
   def log_json(self, is_default=False):
     """JSON representation"""
@@ -83,6 +135,29 @@ class ImportExport(Identifiable, db.Model):
     return res
 
 
+class ImportExportPart(db.Model):
+  """Part of ImportExport content stored separately from the job."""
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = 'import_export_parts'
+
+  id = db.Column(db.Integer, primary_key=True)  # noqa
+  import_export_id = db.Column(
+      db.Integer,
+      db.ForeignKey('import_exports.id', ondelete='CASCADE'),
+      nullable=False,
+  )
+  position = db.Column(db.Integer, nullable=False)
+  content = db.Column(mysql.LONGTEXT, nullable=False)
+
+  @declared_attr
+  def __table_args__(cls):  # pylint: disable=no-self-argument
+    return (
+        db.UniqueConstraint('import_export_id', 'position',
+                            name='uq_import_export_parts'),
+    )
+
+
 def create_import_export_entry(**kwargs):
   """Create ImportExport entry"""
   meta = json.dumps(kwargs['gdrive_metadata']) if 'gdrive_metadata' in kwargs \
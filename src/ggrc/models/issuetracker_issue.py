@@ -38,6 +38,11 @@ class IssuetrackerIssue(base.ContextRBAC, Base, db.Model):
   issue_id = db.Column(db.String(50), nullable=True)
   issue_url = db.Column(db.String(250), nullable=True)
 
+  # Fingerprints of the object state and of the ticket state seen by the
+  # last run of synchronization cron job, see sync_utils.get_fingerprint.
+  local_fingerprint = db.Column(db.String(40), nullable=True)
+  remote_fingerprint = db.Column(db.String(40), nullable=True)
+
   issue_tracked_obj = utils.PolymorphicRelationship("object_id", "object_type",
                                                     "{}_issue_tracked")
 
@@ -3,6 +3,8 @@
 
 """Models for maintenance."""
 
+import sqlalchemy as sa
+
 from ggrc import db
 from ggrc.models.mixins.base import Identifiable
 
@@ -43,3 +45,40 @@ class ReindexLog(Identifiable, db.Model):
 
   is_reindex_complete = db.Column(db.Boolean, nullable=False, default=True)
   log = db.Column(db.String)
+
+
+class ReindexShard(Identifiable, db.Model):
+  """Progress of reindex for a range of ids of a single model."""
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = 'reindex_shards'
+
+  PENDING = "Pending"
+  RUNNING = "Running"
+  DONE = "Done"
+
+  run_id = db.Column(db.String(64), nullable=False)
+  model_name = db.Column(db.String(250), nullable=False)
+  min_id = db.Column(db.Integer, nullable=False)
+  max_id = db.Column(db.Integer, nullable=False)
+  last_id = db.Column(db.Integer, nullable=True)
+  status = db.Column(db.String(16), nullable=False, default=PENDING)
+  objects_count = db.Column(db.Integer, nullable=False, default=0)
+  duration = db.Column(db.Float, nullable=False, default=0)
+  updated_at = db.Column(
+      db.DateTime,
+      nullable=False,
+      default=sa.func.now(),
+      onupdate=sa.func.now(),
+  )
+
+  _extra_table_args = (
+      db.Index('ix_reindex_shards_run_id', 'run_id', 'status'),
+  )
+
+  @property
+  def throughput(self):
+    """Number of objects reindexed per second."""
+    if not self.duration:
+      return 0
+    return self.objects_count / self.duration
@@ -42,6 +42,7 @@ class CustomAttributable(object):
   )
   _include_links = ['custom_attribute_values', 'custom_attribute_definitions']
   _update_raw = ['custom_attribute_values']
+  _log_json_preload = ['_custom_attribute_values']
 
   _requirement_cache = None
 
@@ -21,6 +21,7 @@ class Labeled(object):
   """Mixin to add label in required model."""
 
   _update_raw = _include_links = ['labels', ]
+  _log_json_preload = ['_object_labels.label']
   _api_attrs = reflection.ApiAttributes(*_include_links)
   _aliases = {
       'labels': 'Labels'
@@ -66,6 +67,16 @@ class Labeled(object):
       for old label: {"id": <label_id>, "name": <label name>}
       for being mapped label: {"id": <label id>}
     """
+    self.set_labels(values)
+
+  def set_labels(self, values, cached_labels=None):
+    """Set labels with optionally prefetched labels of the object type.
+
+    Args:
+      values: List of labels in json, same as for the labels setter.
+      cached_labels: Labels of this object type that contain all labels
+        referenced in values. Labels are queried by ids and names if None.
+    """
     if values is None:
       return
 
@@ -76,6 +87,10 @@ class Labeled(object):
     if values:
       new_ids = {value['id'] for value in values if value['id']}
       new_names = {value['name'] for value in values if 'name' in value}
+    else:
+      new_ids = set()
+      new_names = set()
+    if cached_labels is None and values:
       # precache labels
       filter_group = []
       if new_ids:
@@ -85,9 +100,7 @@ class Labeled(object):
       cached_labels = Label.query.filter(
           and_(or_(*filter_group),
                Label.object_type == self.__class__.__name__)).all()
-    else:
-      new_ids = set()
-      new_names = set()
+    elif cached_labels is None:
       cached_labels = []
 
     old_ids = {label.id for label in self.labels}
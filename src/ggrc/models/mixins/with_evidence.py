@@ -16,6 +16,7 @@ class WithEvidence(object):
   """WithEvidence mixin."""
 
   _include_links = []
+  _log_json_preload = ['evidences']
 
   _fulltext_attrs = [
       MultipleSubpropertyFullTextAttr('evidences_file', 'evidences_file',
@@ -16,6 +16,7 @@ class Documentable(object):
   """Documentable mixin."""
 
   _include_links = []
+  _log_json_preload = ['documents']
 
   _fulltext_attrs = [
       MultipleSubpropertyFullTextAttr('documents_file', 'documents_file',
@@ -3,6 +3,10 @@
 
 """Defines a Revision model for storing snapshots."""
 
+import collections
+
+from sqlalchemy.ext.hybrid import hybrid_property
+
 from ggrc import builder
 from ggrc import db
 from ggrc.models.mixins import base
@@ -10,7 +14,7 @@ from ggrc.models.mixins import Base
 from ggrc.models.mixins.filterable import Filterable
 from ggrc.models import reflection
 from ggrc.access_control import role
-from ggrc.models.types import LongJsonType
+from ggrc.models import types
 from ggrc.utils.revisions_diff import builder as revisions_diff
 from ggrc.utils import referenced_objects
 from ggrc.utils.revisions_diff import meta_info
@@ -26,7 +30,7 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
   event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
   action = db.Column(db.Enum(u'created', u'modified', u'deleted'),
                      nullable=False)
-  _content = db.Column('content', LongJsonType, nullable=False)
+  _raw_content = db.Column('content', types.LazyJsonType, nullable=False)
 
   resource_slug = db.Column(db.String, nullable=True)
   source_type = db.Column(db.String, nullable=True)
@@ -104,6 +108,31 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
                  "destination_id"]:
       setattr(self, attr, getattr(obj, attr, None))
 
+  @hybrid_property
+  def _content(self):
+    """Saved content dict, decoded on first access.
+
+    Content is loaded from the database as stored text, so revisions that
+    are loaded only for other columns don't pay for Json decoding. On class
+    level this is the content column, values selected with it have to be
+    decoded with types.decode_json. Content can be compressed, so it can't
+    be searched with LIKE.
+    """
+    raw_content = self._raw_content
+    decoded = getattr(self, "_decoded_content", None)
+    if decoded is None or decoded[0] is not raw_content:
+      decoded = (raw_content, types.decode_json(raw_content))
+      self._decoded_content = decoded
+    return decoded[1]
+
+  @_content.setter
+  def _content(self, value):
+    self._raw_content = value
+
+  @_content.expression
+  def _content(cls):  # pylint: disable=no-self-argument
+    return cls._raw_content
+
   @builder.callable_property
   def diff_with_current(self):
     """Callable lazy property for revision."""
@@ -419,13 +448,18 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
       return self._content["custom_attributes"]
     return []
 
-  def populate_cavs(self):
+  def populate_cavs(self, cads=None):
     """Setup cads in cav list if they are not presented in content
 
-    but now they are associated to instance."""
+    but now they are associated to instance.
+
+    Args:
+      cads: list of CAD jsons of the instance, loaded if not given.
+    """
     from ggrc.models import custom_attribute_definition
-    cads = custom_attribute_definition.get_custom_attributes_for(
-        self.resource_type, self.resource_id)
+    if cads is None:
+      cads = custom_attribute_definition.get_custom_attributes_for(
+          self.resource_type, self.resource_id)
     cavs = {int(i["custom_attribute_id"]): i for i in self._get_cavs()}
     for cad in cads:
       custom_attribute_id = int(cad["id"])
@@ -539,11 +573,8 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
             cav["attributable_type"] = "Requirement"
         populated_content["custom_attribute_values"] = cavs
 
-  @builder.simple_property
-  def content(self):
-    """Property. Contains the revision content dict.
-
-    Updated by required values, generated from saved content dict."""
+  def _populate_content(self, cads=None):
+    """Build the revision content dict from the saved content dict."""
     # pylint: disable=too-many-locals
     populated_content = self._content.copy()
     populated_content.update(self.populate_acl())
@@ -556,7 +587,7 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
     populated_content.update(self.populate_categoies("categories"))
     populated_content.update(self.populate_categoies("assertions"))
     populated_content.update(self.populate_cad_default_values())
-    populated_content.update(self.populate_cavs())
+    populated_content.update(self.populate_cavs(cads))
 
     self.populate_requirements(populated_content)
     # remove custom_attributes,
@@ -565,6 +596,61 @@ class Revision(Filterable, base.ContextRBAC, Base, db.Model):
 
     return populated_content
 
+  def _get_populated_content(self):
+    """Get memoized populated content if saved content was not replaced.
+
+    The memo is bound to the saved content dict, so it is dropped when the
+    content is set or reloaded from the database.
+    """
+    memo = getattr(self, "_populated_content", None)
+    if memo and memo[0] is self._content:
+      return memo[1]
+    return None
+
+  def _set_populated_content(self, populated_content):
+    self._populated_content = (self._content, populated_content)
+
+  @classmethod
+  def populate_many(cls, revisions):
+    """Populate content of all revisions with batched queries.
+
+    CADs are loaded once per resource type for the whole list instead of
+    once per revision. Content of the revisions is memoized, so further
+    access to the content property doesn't query the database.
+    """
+    # pylint: disable=protected-access
+    from ggrc.models import custom_attribute_definition
+    ids_by_type = collections.defaultdict(set)
+    for revision in revisions:
+      if revision._get_populated_content() is None:
+        ids_by_type[revision.resource_type].add(revision.resource_id)
+    cads = {}
+    for resource_type, resource_ids in ids_by_type.iteritems():
+      type_cads = custom_attribute_definition.get_custom_attributes_for_many(
+          resource_type, resource_ids)
+      for resource_id, instance_cads in type_cads.iteritems():
+        cads[(resource_type, resource_id)] = instance_cads
+    for revision in revisions:
+      key = (revision.resource_type, revision.resource_id)
+      if key not in cads or revision._get_populated_content() is not None:
+        continue
+      # every revision gets its own list as the content can be changed
+      revision._set_populated_content(
+          revision._populate_content(list(cads[key]))
+      )
+
+  @builder.simple_property
+  def content(self):
+    """Property. Contains the revision content dict.
+
+    Updated by required values, generated from saved content dict. The
+    result is memoized until the saved content changes."""
+    populated_content = self._get_populated_content()
+    if populated_content is None:
+      populated_content = self._populate_content()
+      self._set_populated_content(populated_content)
+    return populated_content
+
   @content.setter
   def content(self, value):
     """ Setter for content property."""
@@ -6,9 +6,13 @@
 Add Json and Compressed type declaration for use in ORM models.
 """
 
+import base64
 import json
 import pickle
+import zlib
+
 import sqlalchemy.types as types
+from ggrc import settings
 from ggrc import utils
 from ggrc.models import exceptions
 
@@ -39,6 +43,52 @@ class LongJsonType(types.TypeDecorator):
     return value
 
 
+COMPRESSED_JSON_PREFIX = u"zlib:"
+
+
+def compress_json(value):
+  """Compress serialized Json text with a format marker."""
+  return COMPRESSED_JSON_PREFIX + base64.b64encode(
+      zlib.compress(value.encode('utf-8'))
+  ).decode('ascii')
+
+
+def decode_json(value):
+  """Decode plain or compressed Json text, other values are returned as is."""
+  if not isinstance(value, basestring):
+    return value
+  if value.startswith(COMPRESSED_JSON_PREFIX):
+    value = zlib.decompress(
+        base64.b64decode(value[len(COMPRESSED_JSON_PREFIX):])
+    ).decode('utf-8')
+  return json.loads(value)
+
+
+class LazyJsonType(LongJsonType):
+  # pylint: disable=W0223
+  """Custom Long Json data type with optional compression.
+
+  Values are loaded as stored text and should be decoded with decode_json
+  when they are needed, so rows loaded for a few columns don't pay for Json
+  decoding. Legacy plain Json text and compressed text can be stored in the
+  same column, new values are compressed if REVISION_CONTENT_COMPRESSION
+  setting is on.
+  """
+
+  def process_result_value(self, value, dialect):
+    return value
+
+  def process_bind_param(self, value, dialect):
+    if value is None or isinstance(value, basestring):
+      return value
+    value = utils.as_json(value)
+    if settings.REVISION_CONTENT_COMPRESSION:
+      value = compress_json(value)
+    if len(value.encode('utf-8')) > self.MAX_TEXT_LENGTH:
+      raise exceptions.ValidationError("Log record content too long")
+    return value
+
+
 class JsonType(types.TypeDecorator):
   # pylint: disable=W0223
   """ Custom Json data type
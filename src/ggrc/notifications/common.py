@@ -12,6 +12,7 @@ from collections import defaultdict
 from datetime import date
 from datetime import datetime
 from logging import getLogger
+from multiprocessing import pool as mp_pool
 from operator import itemgetter
 from dateutil import relativedelta
 
@@ -27,7 +28,7 @@ from ggrc import settings
 from ggrc.models import Person
 from ggrc.models import Notification, NotificationHistory
 from ggrc.rbac import permissions
-from ggrc.utils import DATE_FORMAT_US, merge_dict, benchmark
+from ggrc.utils import DATE_FORMAT_US, merge_dict, benchmark, list_chunks
 from ggrc.notifications.notification_handlers import SEND_TIME
 
 from ggrc_workflows.models import CycleTaskGroupObjectTask
@@ -98,43 +99,34 @@ class Services(object):
     return service(notif)
 
 
-def get_filter_data(
-    notification, people_cache, tasks_cache=None, del_rels_cache=None
-):
-  """Get filtered notification data.
-
-  This function gets notification data for all users who should receive it. A
-  single notification can be for multiple users (such as all assignees) but
-  only some should receive it depending on if it's an instant notification or
-  a daily digest and the specific users notification settings.
+def load_people(person_ids):
+  """Load people with their roles and notification configs in bulk.
 
   Args:
-    notification (Notification): Notification object for which we want to get
-      data.
-    tasks_cache (dict): prefetched CycleTaskGroupObjectTask instances
-      accessible by their ID as a key
-    del_rels_cache (dict): prefetched Revision instances representing the
-      relationships to Tasks that were deleted grouped by task ID as a key
+    person_ids (iterable of int): IDs of people to load.
 
   Returns:
-    dict: dictionary containing notification data for all users who should
-      receive it, according to their notification settings.
+    dict: people accessible by their ID as a key, the cache used by
+      should_receive.
   """
-  result = {}
-  data = Services.call_service(
-      notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache)
-
-  for user, user_data in data.iteritems():
-    if should_receive(notification, user_data, people_cache):
-      result[user] = user_data
-  return result
+  person_ids = sorted(set(person_ids) - {-1})
+  people_cache = {}
+  for ids_chunk in list_chunks(person_ids):
+    people = db.session.query(Person).options(
+        joinedload('user_roles').joinedload('role'),
+        joinedload('notification_configs')
+    ).filter(Person.id.in_(ids_chunk))
+    people_cache.update((person.id, person) for person in people)
+  return people_cache
 
 
 def get_notification_data(notifications):
   """Get notification data for all notifications.
 
   This function returns a filtered data for all notifications for the users
-  that should receive it.
+  that should receive it. Data of all notifications is collected first, so
+  that all recipients are loaded with a single query, then it is merged per
+  recipient.
 
   Args:
     notifications (list of Notification): List of notification for which we
@@ -146,17 +138,37 @@ def get_notification_data(notifications):
   """
   if not notifications:
     return {}
-  aggregate_data = {}
-  people_cache = {}
 
   tasks_cache = cycle_tasks_cache(notifications)
   deleted_rels_cache = deleted_task_rels_cache(tasks_cache.keys())
 
-  for notification in notifications:
-    filtered_data = get_filter_data(
-        notification, people_cache, tasks_cache=tasks_cache,
-        del_rels_cache=deleted_rels_cache)
-    aggregate_data = merge_dict(aggregate_data, filtered_data)
+  with benchmark("collect notifications data"):
+    notifications_data = [
+        (notification, Services.call_service(
+            notification,
+            tasks_cache=tasks_cache,
+            del_rels_cache=deleted_rels_cache,
+        ))
+        for notification in notifications
+    ]
+
+  with benchmark("load notification recipients"):
+    people_cache = load_people(
+        user_data["user"]["id"]
+        for _, data in notifications_data
+        for user_data in data.itervalues()
+    )
+
+  with benchmark("merge notifications data per recipient"):
+    aggregate_data = {}
+    for notification, data in notifications_data:
+      for user, user_data in data.iteritems():
+        if not should_receive(notification, user_data, people_cache):
+          continue
+        if user in aggregate_data:
+          merge_dict(aggregate_data[user], user_data, [str(user)])
+        else:
+          aggregate_data[user] = user_data
 
   # Remove notifications for objects without a contact (such as task groups)
   aggregate_data.pop("", None)
@@ -285,21 +297,36 @@ def should_receive(notif, user_data, people_cache):
 def send_daily_digest_notifications():
   """Send emails for today's or overdue notifications.
 
+  Emails are rendered and sent by NOTIFICATIONS_DIGEST_WORKERS threads.
+
   Returns:
     str: String containing a simple list of who received the notification.
   """
   # pylint: disable=invalid-name
   with benchmark("contributed cron job send_daily_digest_notifications"):
     notif_list, notif_data = get_daily_notifications()
-    sent_emails = []
     subject = "GGRC daily digest for {}".format(date.today().strftime("%b %d"))
 
+    def send_digest(item):
+      """Render and send digest email to a single recipient."""
+      user_email, data = item
+      data = modify_data(data)
+      email_body = settings.EMAIL_DIGEST.render(digest=data)
+      send_email(user_email, subject, email_body)
+      return user_email
+
     with benchmark("sending daily emails"):
-      for user_email, data in notif_data.iteritems():
-        data = modify_data(data)
-        email_body = settings.EMAIL_DIGEST.render(digest=data)
-        send_email(user_email, subject, email_body)
-        sent_emails.append(user_email)
+      items = notif_data.items()
+      workers = min(settings.NOTIFICATIONS_DIGEST_WORKERS, len(items))
+      if workers <= 1:
+        sent_emails = [send_digest(item) for item in items]
+      else:
+        pool = mp_pool.ThreadPool(workers)
+        try:
+          sent_emails = pool.map(send_digest, items)
+        finally:
+          pool.terminate()
+          pool.join()
 
     with benchmark("processing sent notifications"):
       process_sent_notifications(notif_list)
@@ -334,40 +361,77 @@ def generate_cycle_tasks_notifs():
     db.session.commit()
 
 
+def _get_deprecated_task_ids(notif_list):
+  """Get IDs of deprecated cycle tasks from the notifications list."""
+  task_ids = [notif.object_id for notif in notif_list
+              if notif.object_type == "CycleTaskGroupObjectTask"]
+  deprecated_ids = set()
+  for ids_chunk in list_chunks(task_ids):
+    deprecated_ids.update(task_id for task_id, in db.session.query(
+        CycleTaskGroupObjectTask.id
+    ).filter(
+        CycleTaskGroupObjectTask.id.in_(ids_chunk),
+        CycleTaskGroupObjectTask.status ==
+        CycleTaskGroupObjectTask.DEPRECATED,
+    ))
+  return deprecated_ids
+
+
 def process_sent_notifications(notif_list):
   """Process sent notifications.
 
   Set sent time to now for all notifications in the list
-  and move all non-repeatable notifications to history table.
+  and move all non-repeatable notifications to history table. Notifications
+  are updated with bulk statements instead of one statement per object.
 
   Args:
     notif_list (list of Notification): List of notification for which we want
       to modify sent_at field.
   """
-  from ggrc.models import all_models
+  deprecated_task_ids = _get_deprecated_task_ids(notif_list)
+  sent_at = datetime.utcnow()
+  repeating_ids = []
+  history_rows = []
   for notif in notif_list:
     if notif.object_type == "CycleTaskGroupObjectTask" and \
-       notif.object.status == all_models.CycleTaskGroupObjectTask.DEPRECATED:
+       notif.object_id in deprecated_task_ids:
       continue
     if notif.repeating:
-      notif.sent_at = datetime.utcnow()
+      repeating_ids.append(notif.id)
     else:
-      notif_history = create_notification_history_obj(notif)
-      db.session.add(notif_history)
-      db.session.delete(notif)
+      history_rows.append(_get_notification_history_row(notif, sent_at))
+
+  notifications_table = Notification.__table__
+  for ids_chunk in list_chunks(repeating_ids):
+    db.session.execute(notifications_table.update().where(
+        notifications_table.c.id.in_(ids_chunk)
+    ).values(sent_at=sent_at))
+  if history_rows:
+    db.session.execute(NotificationHistory.__table__.insert(), history_rows)
+  for ids_chunk in list_chunks([row["id"] for row in history_rows]):
+    db.session.execute(notifications_table.delete().where(
+        notifications_table.c.id.in_(ids_chunk)
+    ))
   db.session.commit()
 
 
+def _get_notification_history_row(notif, sent_at):
+  """Get values of notifications_history row for the sent notification."""
+  row = {c.key: getattr(notif, c.key)
+         for c in inspect(notif).mapper.column_attrs}
+  row["sent_at"] = sent_at
+  return row
+
+
 def create_notification_history_obj(notif):
   """Create notification history object.
 
   Args:
     notif: Notification object.
   """
-  notif_history_context = {c.key: getattr(notif, c.key)
-                           for c in inspect(notif).mapper.column_attrs}
-  notif_history_context["sent_at"] = datetime.utcnow()
-  return NotificationHistory(**notif_history_context)
+  return NotificationHistory(
+      **_get_notification_history_row(notif, datetime.utcnow())
+  )
 
 
 def show_pending_notifications():
@@ -19,6 +19,7 @@ from ggrc.utils import benchmark
 from ggrc.rbac import permissions
 from ggrc.query import custom_operators
 from ggrc.query import pagination
+from ggrc.query import subplans
 from ggrc.query.exceptions import BadQueryException
 
 
@@ -43,6 +44,11 @@ class QueryHelper(object):
         }
       ]
       limit: [from, to] - limit the result list to a slice result[from, to]
+      cursor: optional; null for the first page or "next_cursor" of the
+              previous page, enables keyset pagination instead of limit
+      page_size: number of objects on a page for keyset pagination
+      with_total: optional; if False, total count is not computed, by
+                  default it is computed only for limit pagination
       filters: {
         relevant_filters:
           these filters will return all ids of the "search class name" object
@@ -72,6 +78,8 @@ class QueryHelper(object):
       object_name: search class name,
       (all other object query fields)
       ids: [ list of filtered objects ids ]
+      next_cursor: token for the next page or null for the last page,
+                   present for keyset pagination
     }
   ]
 
@@ -82,6 +90,8 @@ class QueryHelper(object):
 
   def __init__(self, query):
     self.query = self._clean_query(query)
+    # subexpressions reused by object queries of the last batch
+    self.trace = []
 
   def _get_snapshot_child_type(self, object_query):
     """Return child_type for snapshot from a query"""
@@ -203,9 +213,11 @@ class QueryHelper(object):
     Returns:
       list of dicts: same query as the input with all ids that match the filter
     """
-    for object_query in self.query:
-      ids = self._get_ids(object_query)
-      object_query["ids"] = ids
+    with subplans.subplan_cache() as cache:
+      for object_query in self.query:
+        ids = self._get_ids(object_query)
+        object_query["ids"] = ids
+    self.trace = cache.trace
     return self.query
 
   @staticmethod
@@ -282,6 +294,19 @@ class QueryHelper(object):
       )
       if filter_expression is not None:
         query = query.filter(filter_expression)
+    if "cursor" in object_query:
+      with benchmark("Apply keyset pagination"):
+        ids, object_query["next_cursor"] = pagination.apply_keyset(
+            object_class,
+            query,
+            object_query.get("order_by"),
+            tgt_class,
+            object_query.get("page_size"),
+            object_query["cursor"],
+        )
+        object_query["total"] = self._get_total(object_query, query, False)
+      return ids
+
     if object_query.get("order_by"):
       with benchmark("Sorting: _get_ids > order_by"):
         query = pagination.apply_order_by(
@@ -294,7 +319,7 @@ class QueryHelper(object):
       limit = object_query.get("limit")
       if limit:
         limit_query = pagination.apply_limit(query, limit)
-        total = pagination.get_total_count(query)
+        total = self._get_total(object_query, query, True)
         ids = [obj.id for obj in limit_query]
       else:
         ids = [obj.id for obj in query]
@@ -303,6 +328,13 @@ class QueryHelper(object):
 
     return ids
 
+  @staticmethod
+  def _get_total(object_query, query, default):
+    """Get total count of filtered objects if it was requested."""
+    if not object_query.get("with_total", default):
+      return None
+    return pagination.get_total_count(query)
+
   @staticmethod
   def _slugs_to_ids(object_name, slugs):
     """Convert SLUG to proper ids for the given objec."""
@@ -14,11 +14,13 @@ from sqlalchemy.orm import load_only
 from ggrc import db
 from ggrc.models import all_models
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
+from ggrc.fulltext.mysql import get_content_filter
 from ggrc.models import inflector
 from ggrc.models import relationship_helper
 from ggrc.models.mixins.filterable import Filterable
 from ggrc.query import autocast
 from ggrc.query import my_objects
+from ggrc.query import subplans
 from ggrc.query.exceptions import BadQueryException
 from ggrc.snapshotter import rules
 
@@ -214,7 +216,7 @@ def text_search(exp, object_class, target_class, query):
       db.session.query(Record.key).filter(
           Record.type == object_class.__name__,
           Record.subproperty != '__sort__',
-          Record.content.ilike(u"%{}%".format(exp['text'])),
+          get_content_filter(exp['text']),
       ),
   )
 
@@ -344,10 +346,24 @@ def related_evidence(exp, object_class, target_class, query):
 
 
 def build_expression(exp, object_class, target_class, query):
-  """Make an SQLAlchemy filtering expression from exp expression tree."""
+  """Make an SQLAlchemy filtering expression from exp expression tree.
+
+  Inside of a subplan cache block equal subexpressions are built only once.
+  """
   if not exp:
     # empty expression doesn't required filter
     return None
+  cache = subplans.get_cache()
+  if cache is None:
+    return _build_expression(exp, object_class, target_class, query)
+  return cache.get_or_build(
+      subplans.get_key(exp, object_class, target_class, query),
+      lambda: _build_expression(exp, object_class, target_class, query),
+  )
+
+
+def _build_expression(exp, object_class, target_class, query):
+  """Make an SQLAlchemy filtering expression from not empty exp."""
   if autocast.is_autocast_required_for(exp):
     exp = validate("left", "right")(autocast.autocast)(exp, target_class)
   if not exp:
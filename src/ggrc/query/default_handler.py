@@ -4,6 +4,7 @@
 """This module contains special query helper class for query API."""
 
 from ggrc.builder import json
+from ggrc.query import subplans
 from ggrc.query.builder import QueryHelper
 from ggrc.models import inflector
 from ggrc.utils import benchmark
@@ -31,7 +32,9 @@ class DefaultHandler(QueryHelper):
       values: [ filtered objects in JSON ] (present if type is "values")
       ids: [ ids of filtered objects ] (present if type is "ids")
       count: the number of objects filtered, after "limit" is applied
-      total: the number of objects filtered, before "limit" is applied
+      total: the number of objects filtered, before "limit" is applied,
+             null if it was not requested
+      next_cursor: token for the next page of keyset pagination
   """
 
   def get_results(self):
@@ -44,33 +47,39 @@ class DefaultHandler(QueryHelper):
       list of dicts: same query as the input with requested results that match
                      the filter.
     """
-    for object_query in self.query:
-      query_type = object_query.get("type", "values")
-      if query_type not in {"values", "ids", "count"}:
-        raise NotImplementedError("Only 'values', 'ids' and 'count' queries "
-                                  "are supported now")
-      model = inflector.get_model(object_query["object_name"])
-      if query_type == "values":
-        with benchmark("Get result set: get_results > _get_objects"):
-          objects = self._get_objects(object_query)
-        object_query["count"] = len(objects)
-        with benchmark("get_results > _get_last_modified"):
-          object_query["last_modified"] = self._get_last_modified(model,
-                                                                  objects)
-        with benchmark("serialization: get_results > _transform_to_json"):
-          object_query["values"] = self._transform_to_json(
-              objects,
-              object_query.get("fields"),
-          )
-      else:
-        with benchmark("Get result set: get_results -> _get_ids"):
-          ids = self._get_ids(object_query)
-        object_query["count"] = len(ids)
-        object_query["last_modified"] = None  # synonymous to now()
-        if query_type == "ids":
-          object_query["ids"] = ids
+    with subplans.subplan_cache() as cache:
+      for object_query in self.query:
+        self._get_result(object_query)
+    self.trace = cache.trace
     return self.query
 
+  def _get_result(self, object_query):
+    """Update object query with results of the requested type."""
+    query_type = object_query.get("type", "values")
+    if query_type not in {"values", "ids", "count"}:
+      raise NotImplementedError("Only 'values', 'ids' and 'count' queries "
+                                "are supported now")
+    model = inflector.get_model(object_query["object_name"])
+    if query_type == "values":
+      with benchmark("Get result set: get_results > _get_objects"):
+        objects = self._get_objects(object_query)
+      object_query["count"] = len(objects)
+      with benchmark("get_results > _get_last_modified"):
+        object_query["last_modified"] = self._get_last_modified(model,
+                                                                objects)
+      with benchmark("serialization: get_results > _transform_to_json"):
+        object_query["values"] = self._transform_to_json(
+            objects,
+            object_query.get("fields"),
+        )
+    else:
+      with benchmark("Get result set: get_results -> _get_ids"):
+        ids = self._get_ids(object_query)
+      object_query["count"] = len(ids)
+      object_query["last_modified"] = None  # synonymous to now()
+      if query_type == "ids":
+        object_query["ids"] = ids
+
   @staticmethod
   def _transform_to_json(objects, fields=None):
     """Make a JSON representation of objects from the list."""
@@ -3,6 +3,11 @@
 
 """Pagination helpers module for query generation."""
 
+import base64
+import datetime
+import hashlib
+import json
+
 import sqlalchemy as sa
 
 from ggrc import models
@@ -50,6 +55,138 @@ def apply_limit(query, limit):
   return limit_query
 
 
+def get_page_size(page_size):
+  """Get validated page size for keyset pagination."""
+  try:
+    page_size = int(page_size)
+  except (ValueError, TypeError):
+    raise BadQueryException("Invalid page size. Integer expected.")
+  if page_size <= 0:
+    raise BadQueryException("Page size should be a positive number.")
+  return page_size
+
+
+def _encode_value(value):
+  """Make ordering value Json serializable."""
+  if isinstance(value, datetime.datetime):
+    return {"datetime": value.strftime("%Y-%m-%d %H:%M:%S.%f")}
+  if isinstance(value, datetime.date):
+    return {"date": value.isoformat()}
+  return value
+
+
+def _decode_value(value):
+  """Get ordering value from its Json representation."""
+  if isinstance(value, dict):
+    if "datetime" in value:
+      return datetime.datetime.strptime(value["datetime"],
+                                        "%Y-%m-%d %H:%M:%S.%f")
+    return datetime.datetime.strptime(value["date"], "%Y-%m-%d").date()
+  return value
+
+
+def _get_order_key(order_by):
+  """Get short fingerprint of ordering the cursor was created for."""
+  return hashlib.md5(json.dumps(order_by or [], sort_keys=True)).hexdigest()
+
+
+def encode_cursor(values, order_by=None):
+  """Encode ordering values of the last row into an opaque token."""
+  return base64.urlsafe_b64encode(json.dumps({
+      "values": [_encode_value(value) for value in values],
+      "order": _get_order_key(order_by),
+  }))
+
+
+def decode_cursor(cursor, order_by=None):
+  """Get ordering values of the last row of the previous page from token.
+
+  Raises:
+    BadQueryException if cursor is malformed or was created for another
+    ordering.
+  """
+  try:
+    data = json.loads(base64.urlsafe_b64decode(str(cursor)))
+    values = [_decode_value(value) for value in data["values"]]
+    order_key = data["order"]
+  except (TypeError, ValueError, KeyError, AttributeError):
+    raise BadQueryException("Invalid cursor.")
+  if order_key != _get_order_key(order_by):
+    raise BadQueryException("Cursor was created for a different order.")
+  return values
+
+
+def get_seek_condition(columns, values):
+  """Get filter for rows that follow the row with given ordering values.
+
+  MySQL puts NULL values first in ascending order and last in descending
+  order, so NULL values are handled separately.
+
+  Args:
+    columns: list of (column, desc) pairs the query is ordered by, the last
+      one should be a unique column.
+    values: ordering values of the last row of the previous page.
+  """
+  conditions = []
+  equal = []
+  for (column, desc), value in zip(columns, values):
+    if value is None:
+      after = sa.sql.false() if desc else column.isnot(None)
+      same = column.is_(None)
+    elif desc:
+      after = sa.or_(column < value, column.is_(None))
+      same = column == value
+    else:
+      after = column > value
+      same = column == value
+    conditions.append(sa.and_(*(equal + [after])))
+    equal.append(same)
+  return sa.or_(*conditions)
+
+
+def apply_keyset(model, query, order_by, tgt_class, page_size, cursor=None):
+  """Get a page of ids that follow the cursor position.
+
+  Rows are ordered by order_by columns and id, the page is found by
+  comparing these columns with values of the last row of the previous page
+  instead of skipping rows with OFFSET, so every page is equally fast.
+
+  Args:
+    model: the model instances of which are requested in query;
+    query: a query for ids of objects;
+    order_by: a list of dicts as in apply_order_by;
+    tgt_class: the snapshotted model if `model` is Snapshot else `model`;
+    page_size: max number of ids on the page;
+    cursor: token returned with the previous page, None for the first page.
+
+  Returns:
+    a tuple of ids on the page and token for the next page or None if it is
+    the last page.
+  """
+  page_size = get_page_size(page_size)
+  columns = [(model.id, False)]
+  if order_by:
+    query, order_columns = _apply_order_joins(model, query, order_by,
+                                              tgt_class)
+    columns = order_columns + columns
+  if cursor:
+    query = query.filter(
+        get_seek_condition(columns, decode_cursor(cursor, order_by))
+    )
+  query = query.add_columns(*[column for column, _ in columns[:-1]])
+  query = query.order_by(*[
+      column.desc() if desc else column for column, desc in columns
+  ])
+  with benchmark("Apply keyset: apply_keyset > query_page"):
+    rows = query.limit(page_size + 1).all()
+  next_cursor = None
+  if len(rows) > page_size:
+    rows = rows[:page_size]
+    last_row = rows[-1]
+    next_cursor = encode_cursor(list(last_row[1:]) + [last_row[0]], order_by)
+  return [row[0] for row in rows], next_cursor
+
+
 def get_total_count(query):
   """Get count of all objects in the query."""
   with benchmark("Apply limit: apply_limit > query_count"):
@@ -69,10 +206,11 @@ def _joins_and_order(counter, clause, model, tgt_class):
               "desc": reverse sort on this field if True}
 
   Returns:
-    ([joins], order) - a tuple of joins required for this ordering to work
-                        and ordering clause itself; join is None if no join
-                        required or [(aliased entity, relationship field)]
-                        if joins required.
+    ([joins], order, desc) - a tuple of joins required for this ordering to
+                        work, ordering column and reverse sort flag; join is
+                        None if no join required or
+                        [(aliased entity, relationship field)] if joins
+                        required.
   """
 
   def by_fulltext():
@@ -116,10 +254,7 @@ def _joins_and_order(counter, clause, model, tgt_class):
     # Snapshot or non object attributes are treated as custom attributes
     joins, order = by_fulltext()
 
-  if clause.get("desc", False):
-    order = order.desc()
-
-  return joins, order
+  return joins, order, clause.get("desc", False)
 
 
 def apply_order_by(model, query, order_by, tgt_class):
@@ -146,13 +281,23 @@ def apply_order_by(model, query, order_by, tgt_class):
     the query with sorting parameters.
   """
 
-  join_pairs = [
+  query, columns = _apply_order_joins(model, query, order_by, tgt_class)
+  return query.order_by(*[
+      column.desc() if desc else column for column, desc in columns
+  ])
+
+
+def _apply_order_joins(model, query, order_by, tgt_class):
+  """Add joins required for ordering to the query.
+
+  Returns:
+    the query with joins and a list of (column, desc) pairs to order by.
+  """
+  join_triples = [
       _joins_and_order(counter, clause, model, tgt_class)
       for counter, clause in enumerate(order_by)
   ]
-  join_lists, orders = zip(*join_pairs)
-  join_lists = [join_list for join_list in join_lists if join_list is not None]
-  for join_list in join_lists:
-    query = query.outerjoin(*join_list)
-
-  return query.order_by(*orders)
+  for join_list, _, _ in join_triples:
+    if join_list is not None:
+      query = query.outerjoin(*join_list)
+  return query, [(column, desc) for _, column, desc in join_triples]
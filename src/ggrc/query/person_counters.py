@@ -0,0 +1,424 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Materialized object counters of people for My Work page.
+
+Counters are stored per person and object type, ids of objects of the type
+related to the person are stored in a separate table. Counters are served by
+intersecting the stored ids with ids readable by the current user. The task
+row also holds the number of open tasks and the earliest due date of open
+tasks, so that the overdue flag stays correct when the date changes without
+any writes.
+
+Counters of a person are built on the first read and stored with the counters
+version of the person. Session hooks increment versions of people affected by
+ACL, custom attribute and cycle task changes in the same transaction, stored
+counters of older versions are ignored and rebuilt on the next read. Counters
+built from an older snapshot never overwrite counters of a newer version. The
+task row is always stored, its presence means that counters of the person are
+built. Ids of deleted objects are removed from stored ids by the same hooks.
+"""
+
+import datetime
+import logging
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import utils
+from ggrc.models import all_models
+from ggrc.query import my_objects
+
+
+logger = logging.getLogger(__name__)
+
+TASK_TYPE = "CycleTaskGroupObjectTask"
+
+# Object types shown on My Work page.
+MY_WORK_TYPES = (
+    "Issue",
+    "AccessGroup",
+    "Assessment",
+    "Audit",
+    "Contract",
+    "Control",
+    "DataAsset",
+    "Document",
+    "Evidence",
+    "Facility",
+    "Market",
+    "Objective",
+    "OrgGroup",
+    "Policy",
+    "Process",
+    "Product",
+    "Program",
+    "Project",
+    "Regulation",
+    "Risk",
+    "Requirement",
+    "Standard",
+    "System",
+    "TechnologyEnvironment",
+    "Threat",
+    "Vendor",
+    "CycleTaskGroupObjectTask",
+    "Metric",
+    "ProductGroup",
+)
+
+
+class PersonObjectCounter(db.Model):
+  """Counts of objects related to a person for a single object type."""
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = "person_object_counters"
+
+  person_id = db.Column(
+      db.Integer,
+      db.ForeignKey("people.id", ondelete="CASCADE"),
+      primary_key=True,
+  )
+  object_type = db.Column(db.String(250), primary_key=True)
+  open_count = db.Column(db.Integer, nullable=False, default=0)
+  next_due_date = db.Column(db.Date, nullable=True)
+  version = db.Column(db.Integer, nullable=False, default=0)
+  updated_at = db.Column(
+      db.DateTime,
+      nullable=False,
+      default=sa.func.now(),
+      onupdate=sa.func.now(),
+  )
+
+
+class PersonObjectCounterId(db.Model):
+  """Id of an object related to a person before the permission filter."""
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = "person_object_counter_ids"
+  __table_args__ = (
+      db.Index("ix_person_object_counter_ids_object",
+               "object_type", "object_id"),
+  )
+
+  person_id = db.Column(
+      db.Integer,
+      db.ForeignKey("people.id", ondelete="CASCADE"),
+      primary_key=True,
+  )
+  object_type = db.Column(db.String(250), primary_key=True)
+  object_id = db.Column(db.Integer, primary_key=True)
+  version = db.Column(db.Integer, nullable=False, default=0)
+
+
+class PersonObjectCounterVersion(db.Model):
+  """Version of object counters of a person, incremented on invalidation.
+
+  People without a row have version 0.
+  """
+  # pylint: disable=too-few-public-methods
+
+  __tablename__ = "person_object_counter_versions"
+
+  person_id = db.Column(
+      db.Integer,
+      db.ForeignKey("people.id", ondelete="CASCADE"),
+      primary_key=True,
+  )
+  version = db.Column(db.Integer, nullable=False, default=0)
+
+
+def _get_open_tasks(person_id):
+  """Get open task count and the earliest due date of open tasks."""
+  # query below ignores acr.read flag because this is done on a
+  # non_editable role that has read rights:
+  return db.session.execute(
+      """
+      SELECT
+          count(DISTINCT ct.id),
+          min(ct.end_date)
+      FROM cycle_task_group_object_tasks AS ct
+      JOIN cycles AS c ON
+          c.id = ct.cycle_id
+      JOIN access_control_list AS acl
+          ON acl.object_id = ct.id
+          AND acl.object_type = "CycleTaskGroupObjectTask"
+      JOIN access_control_people AS acp
+          ON acp.ac_list_id = acl.id
+      JOIN access_control_roles as acr
+          ON acl.ac_role_id = acr.id
+      WHERE
+          c.is_current = 1 AND
+          acp.person_id = :person_id AND
+          acr.name IN ("Task Assignees", "Task Secondary Assignees") AND (
+              (c.is_verification_needed = 1 AND ct.status != "Verified") OR
+              (c.is_verification_needed = 0 AND ct.status != "Finished")
+          )
+      """,
+      {"person_id": person_id},
+  ).fetchone()
+
+
+def compute_counters(person_id):
+  """Compute counters of a person from the source tables.
+
+  Returns:
+    dict with object types and (object_ids, open_count, next_due_date) tuples
+    for the task type and all types with related objects, object_ids are
+    sorted lists.
+  """
+  aliased = my_objects.get_myobjects_query(
+      types=MY_WORK_TYPES,
+      contact_id=person_id,
+  )
+  object_ids = {}
+  for type_, id_ in db.session.query(aliased.c.type, aliased.c.id).distinct():
+    object_ids.setdefault(type_, set()).add(id_)
+  counters = {type_: (sorted(ids), 0, None)
+              for type_, ids in object_ids.iteritems()}
+  open_count, next_due_date = _get_open_tasks(person_id)
+  counters[TASK_TYPE] = (
+      counters.get(TASK_TYPE, ([],))[0], open_count or 0, next_due_date,
+  )
+  return counters
+
+
+def get_version(person_id):
+  """Get current counters version of a person."""
+  version = db.session.query(PersonObjectCounterVersion.version).filter(
+      PersonObjectCounterVersion.person_id == person_id,
+  ).scalar()
+  return version or 0
+
+
+def store_counters(person_id, counters, version):
+  """Store counters of a person built for the given version.
+
+  Counters are inserted or updated without deleting rows. Stored counters of
+  a newer version are kept, they were built from a newer snapshot. Ids of
+  older versions are deleted, ids of the same or a newer version are kept.
+  """
+  db.session.execute(
+      sa.text("""
+          INSERT INTO person_object_counters (
+              person_id, object_type, open_count, next_due_date, version,
+              updated_at
+          )
+          VALUES (
+              :person_id, :object_type, :open_count, :next_due_date,
+              :version, NOW()
+          )
+          ON DUPLICATE KEY UPDATE
+              open_count = IF(
+                  VALUES(version) >= version, VALUES(open_count), open_count
+              ),
+              next_due_date = IF(
+                  VALUES(version) >= version,
+                  VALUES(next_due_date),
+                  next_due_date
+              ),
+              updated_at = IF(
+                  VALUES(version) >= version, VALUES(updated_at), updated_at
+              ),
+              version = GREATEST(version, VALUES(version))
+      """),
+      [{
+          "person_id": person_id,
+          "object_type": type_,
+          "open_count": open_count,
+          "next_due_date": next_due_date,
+          "version": version,
+      } for type_, (_, open_count, next_due_date) in sorted(
+          counters.iteritems()
+      )],
+  )
+  db.session.execute(
+      PersonObjectCounterId.__table__.delete().where(sa.and_(
+          PersonObjectCounterId.person_id == person_id,
+          PersonObjectCounterId.version < version,
+      ))
+  )
+  values = []
+  for type_, (object_ids, _, _) in sorted(counters.iteritems()):
+    values.extend({
+        "person_id": person_id,
+        "object_type": type_,
+        "object_id": id_,
+        "version": version,
+    } for id_ in object_ids)
+  inserter = sa.text("""
+      INSERT INTO person_object_counter_ids (
+          person_id, object_type, object_id, version
+      )
+      VALUES (:person_id, :object_type, :object_id, :version)
+      ON DUPLICATE KEY UPDATE version = GREATEST(version, VALUES(version))
+  """)
+  for values_chunk in utils.list_chunks(values):
+    db.session.execute(inserter, values_chunk)
+
+
+def _get_stored_counters(person_ids=None):
+  """Get stored counters of the current versions of people.
+
+  Returns:
+    dict with person ids and dicts of their counters in the format of
+    compute_counters.
+  """
+  versions = PersonObjectCounterVersion
+  counters_query = db.session.query(
+      PersonObjectCounter.person_id,
+      PersonObjectCounter.object_type,
+      PersonObjectCounter.open_count,
+      PersonObjectCounter.next_due_date,
+  ).outerjoin(
+      versions, versions.person_id == PersonObjectCounter.person_id,
+  ).filter(
+      PersonObjectCounter.version == sa.func.coalesce(versions.version, 0),
+  )
+  ids_query = db.session.query(
+      PersonObjectCounterId.person_id,
+      PersonObjectCounterId.object_type,
+      PersonObjectCounterId.object_id,
+  ).outerjoin(
+      versions, versions.person_id == PersonObjectCounterId.person_id,
+  ).filter(
+      PersonObjectCounterId.version == sa.func.coalesce(versions.version, 0),
+  )
+  if person_ids is not None:
+    counters_query = counters_query.filter(
+        PersonObjectCounter.person_id.in_(person_ids),
+    )
+    ids_query = ids_query.filter(
+        PersonObjectCounterId.person_id.in_(person_ids),
+    )
+  object_ids = {}
+  for person_id, type_, id_ in ids_query:
+    object_ids.setdefault((person_id, type_), []).append(id_)
+  stored = {}
+  for person_id, type_, open_count, next_due_date in counters_query:
+    stored.setdefault(person_id, {})[type_] = (
+        sorted(object_ids.get((person_id, type_), [])),
+        open_count,
+        next_due_date,
+    )
+  return stored
+
+
+def get_counters(person_id):
+  """Get stored counters of a person, building them if needed.
+
+  Counters built on a read are stored right away, so that they are not
+  computed from source tables on every read until the next rebuild.
+
+  Returns:
+    dict with object types and (object_ids, open_count, next_due_date)
+    tuples.
+  """
+  counters = _get_stored_counters([person_id]).get(person_id, {})
+  if TASK_TYPE not in counters:
+    # Version is read in the same snapshot as the source tables.
+    version = get_version(person_id)
+    counters = compute_counters(person_id)
+    store_counters(person_id, counters, version)
+    db.session.plain_commit()
+  return counters
+
+
+def get_task_count(person_id):
+  """Get open task count and overdue flag of a person."""
+  _, open_count, next_due_date = get_counters(person_id)[TASK_TYPE]
+  return {
+      "open_task_count": int(open_count),
+      # Using today instead of DATE(NOW()) for easier testing with freeze gun.
+      "has_overdue": bool(
+          next_due_date and next_due_date < datetime.date.today()
+      ),
+  }
+
+
+def invalidate(person_ids):
+  """Increment counters versions of the given people.
+
+  Stored counters of older versions are ignored and rebuilt on the next
+  read.
+
+  Args:
+    person_ids: set of person ids or None to invalidate counters of all
+      people.
+  """
+  where = ""
+  if person_ids is not None:
+    if not person_ids:
+      return
+    where = "WHERE id IN ({})".format(
+        ", ".join(str(int(id_)) for id_ in sorted(person_ids))
+    )
+  # People are selected from their table, so that ids of people deleted in
+  # the same transaction are skipped. Sorted ids keep the lock order.
+  db.session.execute(sa.text("""
+      INSERT INTO person_object_counter_versions (person_id, version)
+      SELECT id, 1 FROM people {where} ORDER BY id
+      ON DUPLICATE KEY UPDATE version = version + 1
+  """.format(where=where)))
+
+
+def remove_objects(objects):
+  """Remove ids of deleted objects from stored counters of all people.
+
+  Args:
+    objects: dict with object types and sets of ids of deleted objects.
+  """
+  for type_, ids in sorted(objects.iteritems()):
+    if type_ not in MY_WORK_TYPES or not ids:
+      continue
+    db.session.execute(
+        PersonObjectCounterId.__table__.delete().where(sa.and_(
+            PersonObjectCounterId.object_type == type_,
+            PersonObjectCounterId.object_id.in_(sorted(ids)),
+        ))
+    )
+
+
+def rebuild(chunk_size=100):
+  """Rebuild stored counters of all people.
+
+  Counters of each chunk of people are committed separately.
+  """
+  person_ids = [id_ for id_, in db.session.query(
+      all_models.Person.id
+  ).order_by(all_models.Person.id)]
+  for ids_chunk in utils.list_chunks(person_ids, chunk_size=chunk_size):
+    for person_id in ids_chunk:
+      version = get_version(person_id)
+      store_counters(person_id, compute_counters(person_id), version)
+    db.session.plain_commit()
+  logger.info("Rebuilt object counters of %s people", len(person_ids))
+
+
+def check(fix=False):
+  """Compare stored counters with counters computed from source tables.
+
+  Args:
+    fix: invalidate stored counters that do not match, they are rebuilt on
+      the next read.
+
+  Returns:
+    list of ids of people with stored counters that do not match.
+  """
+  stored = _get_stored_counters()
+  mismatched = [
+      person_id for person_id, counters in sorted(stored.iteritems())
+      if counters != compute_counters(person_id)
+  ]
+  if mismatched:
+    logger.warning("Object counters of %s people are inconsistent: %s",
+                   len(mismatched), mismatched)
+    if fix:
+      invalidate(set(mismatched))
+      db.session.plain_commit()
+  return mismatched
+
+
+def fix_inconsistent_counters():
+  """Nightly job invalidating counters that do not match source tables."""
+  check(fix=True)
@@ -0,0 +1,108 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Cache of /query results for "ids" and "count" queries.
+
+Results are stored under a key built from the canonical query Json, the
+permissions key of the user and the data generation counter. Permission
+changes and commits with data changes bump the counters, so a stored result
+is never returned after a write that could change it. Entries are kept in
+memcache and in a size bound in-process LRU cache.
+"""
+
+import collections
+import hashlib
+import json
+import logging
+
+from ggrc import settings
+from ggrc.cache import object_cache
+from ggrc.cache import utils as cache_utils
+
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_TYPES = {"ids", "count"}
+
+QUERY_CACHE_STATS = collections.Counter()
+
+LOCAL_CACHE = object_cache.LocalLRUCache(settings.QUERY_CACHE_LOCAL_SIZE)
+
+
+def _is_cacheable(query):
+  """Check if results of all object queries can be cached."""
+  return (
+      settings.QUERY_CACHE_ENABLED and
+      getattr(settings, "MEMCACHE_MECHANISM", False) and
+      isinstance(query, list) and
+      bool(query) and
+      all(isinstance(object_query, dict) and
+          object_query.get("type") in CACHEABLE_TYPES
+          for object_query in query)
+  )
+
+
+def _get_client():
+  return cache_utils.get_cache_manager().cache_object.memcache_client
+
+
+def get_key(query, user_id):
+  """Get cache key for the query of the user.
+
+  The key should be taken before the query is run, so that writes committed
+  while it runs make the stored result unreachable.
+
+  Returns:
+    cache key or None if the query results should not be cached.
+  """
+  if not _is_cacheable(query):
+    QUERY_CACHE_STATS["uncacheable"] += 1
+    return None
+  client = _get_client()
+  digest = hashlib.sha1(
+      json.dumps(query, sort_keys=True, separators=(",", ":"))
+  ).hexdigest()
+  return "query:{}:{}:{}".format(
+      digest,
+      cache_utils.get_permissions_key(client, user_id),
+      cache_utils.get_data_generation(client),
+  )
+
+
+def get(key):
+  """Get stored results for key or None."""
+  if key is None:
+    return None
+  results = LOCAL_CACHE.get(key)
+  if results is not None:
+    QUERY_CACHE_STATS["local_hits"] += 1
+    return results
+  results = _get_client().get(key)
+  if results is not None:
+    QUERY_CACHE_STATS["memcache_hits"] += 1
+    LOCAL_CACHE.set(key, results)
+    return results
+  QUERY_CACHE_STATS["misses"] += 1
+  return None
+
+
+def add(key, results):
+  """Store results if they are not too large."""
+  if key is None:
+    return
+  ids_count = sum(len(result.get("ids") or []) for result in results)
+  if ids_count > settings.QUERY_CACHE_MAX_IDS:
+    QUERY_CACHE_STATS["too_large"] += 1
+    return
+  _get_client().add(key, results, settings.QUERY_CACHE_TIMEOUT)
+  LOCAL_CACHE.set(key, results)
+  QUERY_CACHE_STATS["stored"] += 1
+
+
+def get_stats():
+  """Get hit ratio and counters of the query result cache."""
+  hits = QUERY_CACHE_STATS["local_hits"] + QUERY_CACHE_STATS["memcache_hits"]
+  total = hits + QUERY_CACHE_STATS["misses"]
+  stats = dict(QUERY_CACHE_STATS)
+  stats["hit_ratio"] = float(hits) / total if total else 0
+  return stats
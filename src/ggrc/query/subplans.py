@@ -0,0 +1,126 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Reuse of filter subexpressions shared by object queries of one request.
+
+Tree views send many object queries with the same filters, e.g. the same
+`relevant` filter for every object type. Filter expressions are brought to a
+canonical form and every distinct subexpression is built once per batch of
+object queries, later occurrences reuse the built filter.
+"""
+
+import collections
+import contextlib
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+COMMUTATIVE_OPS = {"AND", "OR"}
+
+_local = threading.local()
+
+
+class SubplanCache(object):
+  """Built filters of a single batch of object queries."""
+
+  def __init__(self):
+    self._filters = {}
+    self.hits = collections.Counter()
+
+  def get_or_build(self, key, build):
+    """Get filter for canonical key, build it if it is not cached yet."""
+    if key is None:
+      return build()
+    if key in self._filters:
+      self.hits[key] += 1
+      return self._filters[key]
+    result = build()
+    self._filters[key] = result
+    return result
+
+  @property
+  def trace(self):
+    """List of reused subexpressions with number of reuses."""
+    return [{
+        "object_name": object_name,
+        "target_name": target_name,
+        "op": expression[0],
+        "reused": hits,
+    } for (object_name, target_name, expression), hits in self.hits.items()]
+
+
+@contextlib.contextmanager
+def subplan_cache():
+  """Share built filters between object queries inside the block."""
+  previous = getattr(_local, "cache", None)
+  cache = _local.cache = SubplanCache()
+  try:
+    yield cache
+  finally:
+    _local.cache = previous
+    if cache.hits:
+      logger.debug("Reused query subexpressions: %s", cache.trace)
+
+
+def get_cache():
+  """Get subplan cache of the current batch or None outside of a batch."""
+  return getattr(_local, "cache", None)
+
+
+def get_key(exp, object_class, target_class, query):
+  """Get canonical key of an expression built for the given classes.
+
+  Returns:
+    hashable key or None if the expression can't be shared, e.g. it refers
+    to results of a previous object query that are not computed yet.
+  """
+  try:
+    canonical = _canonical(exp, query)
+  except (KeyError, IndexError, TypeError):
+    return None
+  return (object_class.__name__, target_class.__name__, canonical)
+
+
+def _canonical(exp, query):
+  """Get canonical hashable form of an expression.
+
+  Operands of commutative operations are flattened and sorted, id lists are
+  sorted and deduplicated and references to previous object queries are
+  replaced with their results.
+  """
+  if isinstance(exp, dict):
+    op_name = exp.get("op", {}).get("name")
+    if op_name in COMMUTATIVE_OPS:
+      operands = _flatten(exp, op_name)
+      return (op_name, tuple(sorted(_canonical(operand, query)
+                                    for operand in operands)))
+    if exp.get("object_name") == "__previous__":
+      previous = query[exp["ids"][0]]
+      exp = dict(exp, object_name=previous["object_name"],
+                 ids=previous["ids"])
+    items = []
+    for key, value in exp.iteritems():
+      if key == "ids":
+        value = tuple(sorted(set(value)))
+      else:
+        value = _canonical(value, query)
+      items.append((key, value))
+    return (op_name, tuple(sorted(items)))
+  if isinstance(exp, (list, tuple)):
+    return tuple(_canonical(value, query) for value in exp)
+  hash(exp)
+  return exp
+
+
+def _flatten(exp, op_name):
+  """Get operands of nested operations with the same commutative operator."""
+  operands = []
+  for operand in (exp["left"], exp["right"]):
+    if (isinstance(operand, dict) and
+            operand.get("op", {}).get("name") == op_name):
+      operands.extend(_flatten(operand, op_name))
+    else:
+      operands.append(operand)
+  return operands
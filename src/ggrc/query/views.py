@@ -11,9 +11,12 @@ from flask import request
 from flask import current_app
 from werkzeug.exceptions import BadRequest
 
+from ggrc import db
 from ggrc.models import all_models
 from ggrc.query.exceptions import BadQueryException
+from ggrc.query import result_cache
 from ggrc.query.default_handler import DefaultHandler
+from ggrc.login import get_current_user_id
 from ggrc.login import login_required
 from ggrc.models.inflector import get_model
 from ggrc.services.common import etag
@@ -70,13 +73,22 @@ def get_objects_by_query():
   """Return objects corresponding to a POST'ed query list."""
   query = request.json
 
-  results = get_handler_results(query)
+  cache_key = result_cache.get_key(query, get_current_user_id())
+  if cache_key is not None:
+    # Login has already started the request transaction. A new one makes the
+    # query see all data committed before the data generation was read.
+    db.session.rollback()
+  results = result_cache.get(cache_key)
+  if results is None:
+    results = get_handler_results(query)
+    result_cache.add(cache_key, results)
 
   last_modified_list = [result["last_modified"] for result in results
                         if result["last_modified"]]
   last_modified = max(last_modified_list) if last_modified_list else None
   collections = []
-  collection_fields = ["ids", "values", "count", "total", "object_name"]
+  collection_fields = ["ids", "values", "count", "total", "object_name",
+                       "next_cursor"]
 
   for result in results:
     model = get_model(result["object_name"])
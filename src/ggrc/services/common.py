@@ -42,7 +42,9 @@ from ggrc.services.attribute_query import AttributeQueryBuilder
 from ggrc.services import signals
 from ggrc.models.background_task import BackgroundTask, create_task
 from ggrc.query import utils as query_utils
+from ggrc.query.exceptions import BadQueryException
 from ggrc import settings
+from ggrc.cache import object_cache
 from ggrc.cache import utils as cache_utils
 from ggrc.utils import errors as ggrc_errors
 
@@ -718,6 +720,8 @@ class Resource(ModelView):
     page_size = min(
         int(request.args.get('__page_size', self.DEFAULT_PAGE_SIZE)),
         self.MAX_PAGE_SIZE)
+    if '__cursor' in request.args:
+      return self.apply_keyset_paging(matches_query, page_size)
     if '__page_only' in request.args:
       page_number = int(request.args.get('__page', 0))
       matches = []
@@ -739,9 +743,52 @@ class Resource(ModelView):
     }
     return matches, collection_extras
 
+  def apply_keyset_paging(self, matches_query, page_size):
+    """Get a page of matches that follow the __cursor position.
+
+    Matches are ordered by id and the page is found by comparing ids with
+    the last id of the previous page, so deep pages are as fast as the first
+    one. Empty __cursor requests the first page. Total count is computed
+    only if __with_total is requested. The order of matches_query is
+    replaced and __limit is not supported with __cursor.
+    """
+    from ggrc.query import pagination
+    if '__limit' in request.args:
+      raise BadRequest('__limit is not supported with __cursor.')
+    id_column = self.model._sa_class_manager.mapper.primary_key[0]
+    query = matches_query
+    cursor = request.args.get('__cursor')
+    if cursor:
+      try:
+        last_id, = pagination.decode_cursor(cursor)
+      except (BadQueryException, ValueError):
+        raise BadRequest('Invalid __cursor parameter.')
+      query = query.filter(id_column > last_id)
+    matches = query.order_by(None).order_by(id_column)\
+        .limit(page_size + 1).all()
+    paging = {}
+    if len(matches) > page_size:
+      matches = matches[:page_size]
+      args = dict((k, unicode(v)) for k, v in request.args.items())
+      args['__cursor'] = pagination.encode_cursor([matches[-1][0]])
+      paging['next'] = self.url_for() + '?' + urlencode(
+          utils.encoded_dict(args))
+    if '__with_total' in request.args:
+      paging['total'] = matches_query.count()
+    return matches, {'paging': paging}
+
+  @classmethod
+  def has_object_cache(cls):
+    """Check if collection GET objects are cached.
+
+    Cached objects embed related objects that don't invalidate them, so the
+    cache is used only if it is explicitly enabled.
+    """
+    return cls.has_cache() and settings.OBJECT_CACHE_ENABLED
+
   def get_matched_resources(self, matches):
     cache_objs = {}
-    if self.has_cache():
+    if self.has_object_cache():
       self.request.cache_manager = cache_utils.get_cache_manager()
       with benchmark("Query cache for resources"):
         cache_objs = self.get_resources_from_cache(matches)
@@ -751,8 +798,8 @@ class Resource(ModelView):
 
     database_objs = {}
     if database_matches:
-      database_objs = self.get_resources_from_database(matches)
-      if self.has_cache():
+      database_objs = self.get_resources_from_database(database_matches)
+      if self.has_object_cache():
         with benchmark("Add resources to cache"):
           self.add_resources_to_cache(database_objs)
     return cache_objs, database_objs
@@ -779,7 +826,8 @@ class Resource(ModelView):
       matches_query = self.get_collection_matches(
           self.model, filter_by_contexts)
     with benchmark("dispatch_request > collection_get > Query Data"):
-      if '__page' in request.args or '__page_only' in request.args:
+      paging_args = {'__page', '__page_only', '__cursor'}
+      if paging_args.intersection(request.args):
         with benchmark("Query matches with paging"):
           matches, extras = self.apply_paging(matches_query)
       else:
@@ -827,6 +875,14 @@ class Resource(ModelView):
         return self.json_success_response(
             collection, self.collection_last_modified(), cache_op=cache_op)
 
+  def get_object_cache(self):
+    """Get object cache used for the current request."""
+    if getattr(self.request, "object_cache", None) is None:
+      # Skip right to memcache
+      memcache_client = self.request.cache_manager.cache_object.memcache_client
+      self.request.object_cache = object_cache.ObjectCache(memcache_client)
+    return self.request.object_cache
+
   def get_resources_from_cache(self, matches):
     """Get resources from cache for specified matches"""
     resources = {}
@@ -835,11 +891,15 @@ class Resource(ModelView):
     # invalidation logic so we have to disabling memcache.
     if self.model.__name__ == 'BackgroundTask':
       return resources
-    # Skip right to memcache
-    memcache_client = self.request.cache_manager.cache_object.memcache_client
-    for match in matches:
-      key = cache_utils.get_cache_key(None, id_=match[0], type_=match[1])
-      val = memcache_client.get(key)
+    if request.args.get('__include'):
+      return resources
+    keys = {
+        match: cache_utils.get_cache_key(None, id_=match[0], type_=match[1])
+        for match in matches
+    }
+    values = self.get_object_cache().get_multi(keys.values())
+    for match, key in keys.iteritems():
+      val = values.get(key)
       if val:
         val = json.loads(val)
       else:
@@ -850,14 +910,17 @@ class Resource(ModelView):
 
   def add_resources_to_cache(self, match_obj_pairs):
     """Add resources to cache if they are not blocked by DeleteOp entries"""
-    # Skip right to memcache
+    # Published resources depend on requested includes, only the default
+    # representation is cached.
+    if request.args.get('__include'):
+      return
     cache_manager = self.request.cache_manager
-    memcache_client = cache_manager.cache_object.memcache_client
-    for match, obj in match_obj_pairs.items():
-      if obj.__class__.__name__ in cache_manager.supported_classes:
-        memcache_client.add(
-            cache_utils.get_cache_key(None, id_=match[0], type_=match[1]),
-            as_json(obj))
+    self.get_object_cache().add_multi({
+        cache_utils.get_cache_key(None, id_=match[0], type_=match[1]):
+            as_json(obj)
+        for match, obj in match_obj_pairs.items()
+        if match[1] in cache_manager.supported_classes
+    })
 
   def invalidate_cache_to(self, obj):
     """Invalidate api cache for sent object."""
@@ -3,8 +3,6 @@
 
 """Resource for handling special endpoints for people."""
 
-import datetime
-import collections
 import functools
 
 from logging import getLogger
@@ -15,12 +13,13 @@ from dateutil import parser as date_parser
 from ggrc import db
 from ggrc import login
 from ggrc import models
+from ggrc.cache import object_counts
 from ggrc.utils import benchmark
 from ggrc.utils.log_event import log_event
 from ggrc.services import common
 from ggrc.views import converters
-from ggrc.query import my_objects
-from ggrc.query import builder
+from ggrc.rbac import permissions
+from ggrc.query import person_counters
 from ggrc.models.person_profile import PersonProfile
 from ggrc.models.person import Person
 
@@ -35,37 +34,7 @@ class PersonResource(common.ExtendedResource):
   # method post is abstract and not used.
   # pylint: disable=abstract-method
 
-  MY_WORK_OBJECTS = {
-      "Issue": 0,
-      "AccessGroup": 0,
-      "Assessment": 0,
-      "Audit": 0,
-      "Contract": 0,
-      "Control": 0,
-      "DataAsset": 0,
-      "Document": 0,
-      "Evidence": 0,
-      "Facility": 0,
-      "Market": 0,
-      "Objective": 0,
-      "OrgGroup": 0,
-      "Policy": 0,
-      "Process": 0,
-      "Product": 0,
-      "Program": 0,
-      "Project": 0,
-      "Regulation": 0,
-      "Risk": 0,
-      "Requirement": 0,
-      "Standard": 0,
-      "System": 0,
-      "TechnologyEnvironment": 0,
-      "Threat": 0,
-      "Vendor": 0,
-      "CycleTaskGroupObjectTask": 0,
-      "Metric": 0,
-      "ProductGroup": 0,
-  }
+  MY_WORK_OBJECTS = dict.fromkeys(person_counters.MY_WORK_TYPES, 0)
 
   ALL_OBJECTS = {
       "Issue": 0,
@@ -216,125 +185,35 @@ class PersonResource(common.ExtendedResource):
     # id name is used as a kw argument and can't be changed here
     # pylint: disable=invalid-name,redefined-builtin
     with benchmark("Make response"):
-      # query below ignores acr.read flag because this is done on a
-      # non_editable role that has read rights:
-      counts_query = db.session.execute(
-          """
-          SELECT
-              overdue,
-              sum(task_count)
-          FROM (
-              SELECT
-                  ct.end_date < :today AS overdue,
-                  count(DISTINCT ct.id) AS task_count
-              FROM cycle_task_group_object_tasks AS ct
-              JOIN cycles AS c ON
-                  c.id = ct.cycle_id
-              JOIN access_control_list AS acl
-                  ON acl.object_id = ct.id
-                  AND acl.object_type = "CycleTaskGroupObjectTask"
-              JOIN access_control_people AS acp
-                  ON acp.ac_list_id = acl.id
-              JOIN access_control_roles as acr
-                  ON acl.ac_role_id = acr.id
-              WHERE
-                  ct.status != "Verified" AND
-                  c.is_verification_needed = 1 AND
-                  c.is_current = 1 AND
-                  acp.person_id = :person_id AND
-                  acr.name IN ("Task Assignees", "Task Secondary Assignees")
-              GROUP BY overdue
-
-              UNION ALL
-
-              SELECT
-                  ct.end_date < :today AS overdue,
-                  count(DISTINCT ct.id) AS task_count
-              FROM cycle_task_group_object_tasks AS ct
-              JOIN cycles AS c ON
-                  c.id = ct.cycle_id
-              JOIN access_control_list AS acl
-                  ON acl.object_id = ct.id
-                  AND acl.object_type = "CycleTaskGroupObjectTask"
-              JOIN access_control_people AS acp
-                  ON acp.ac_list_id = acl.id
-              JOIN access_control_roles as acr
-                  ON acl.ac_role_id = acr.id
-              WHERE
-                  ct.status != "Finished" AND
-                  c.is_verification_needed = 0 AND
-                  c.is_current = 1 AND
-                  acp.person_id = :person_id AND
-                  acr.name IN ("Task Assignees", "Task Secondary Assignees")
-              GROUP BY overdue
-          ) as temp
-          GROUP BY overdue
-          """,
-          {
-              # Using today instead of DATE(NOW()) for easier testing with
-              # freeze gun.
-              "today": datetime.date.today(),
-              "person_id": id,
-          }
-      )
-      counts = dict(counts_query.fetchall())
-      response_object = {
-          "open_task_count": int(sum(counts.values())),
-          "has_overdue": bool(counts.get(1, 0)),
-      }
+      response_object = person_counters.get_task_count(id)
       return self.json_success_response(response_object, )
 
-  def _my_work_count(self, **kwargs):  # pylint: disable=unused-argument
+  def _my_work_count(self, **kwargs):
     """Get object counts for my work page."""
     with benchmark("Make response"):
-      aliased = my_objects.get_myobjects_query(
-          types=self.MY_WORK_OBJECTS.keys(),
-          contact_id=login.get_current_user_id()
-      )
-      all_ = db.session.query(
-          aliased.c.type,
-          aliased.c.id,
-      )
-
-      all_ids = collections.defaultdict(set)
-      for type_, id_ in all_:
-        all_ids[type_].add(id_)
-
+      counters = person_counters.get_counters(kwargs["id"])
       response_object = self.MY_WORK_OBJECTS.copy()
-      for type_, ids in all_ids.items():
-        model = models.get_model(type_)
-        # pylint: disable=protected-access
-        # We must move the type permissions query to a proper utility function
-        # but we will not do that for a patch release
-        permission_filter = builder.QueryHelper._get_type_query(model, "read")
-        if permission_filter is not None:
-          count = model.query.filter(
-              model.id.in_(ids),
-              permission_filter,
-          ).count()
-        else:
-          count = model.query.filter(model.id.in_(ids)).count()
-        response_object[type_] = count
-
+      system_wide_read = permissions.has_system_wide_read()
+      for type_, (ids, _, _) in counters.iteritems():
+        if type_ not in response_object or not ids:
+          continue
+        # Stored ids are not filtered by permissions.
+        if not system_wide_read:
+          contexts, resources = permissions.get_context_resource(
+              model_name=type_, permission_type="read",
+          )
+          if contexts is not None:
+            ids = set(ids).intersection(resources or ())
+        response_object[type_] = len(ids)
       return self.json_success_response(response_object, )
 
   def _all_objects_count(self, **kwargs):  # pylint: disable=unused-argument
-    """Get object counts for all objects page."""
+    """Get approximate object counts for all objects page."""
     with benchmark("Make response"):
-
       response_object = self.ALL_OBJECTS.copy()
-      for model_type in response_object:
-        model = models.get_model(model_type)
-        # pylint: disable=protected-access
-        # We must move the type permissions query to a proper utility function
-        # but we will not do that for a patch release
-        permission_filter = builder.QueryHelper._get_type_query(model, "read")
-        if permission_filter is not None:
-          count = model.query.filter(permission_filter).count()
-        else:
-          count = model.query.count()
-        response_object[model_type] = count
-
+      response_object.update(object_counts.get_readable_counts(
+          [models.get_model(model_type) for model_type in response_object]
+      ))
       return self.json_success_response(response_object, )
 
   @staticmethod
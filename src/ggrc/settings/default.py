@@ -238,3 +238,104 @@ DEFAULT_QUEUE = "ggrc"
 
 APPENGINE_INSTANCE = os.environ.get('APPENGINE_INSTANCE')
 APPENGINE_LOCATION = os.environ.get('APPENGINE_LOCATION', 'us-central1')
+
+# Number of imported rows committed in a single transaction. Every row is
+# processed in its own savepoint, so an error in one row does not affect the
+# other rows of the batch. Set to 1 to commit each row separately.
+IMPORT_BATCH_SIZE = int(os.environ.get('GGRC_IMPORT_BATCH_SIZE', '100'))
+
+# Use the InnoDB FULLTEXT index on fulltext_record_properties.content for
+# text search instead of scanning the table with LIKE '%term%'. Search terms
+# are matched as word prefixes, words shorter than FULLTEXT_MIN_TOKEN_SIZE are
+# only checked with LIKE. FULLTEXT_MIN_TOKEN_SIZE must not be less than
+# innodb_ft_min_token_size of the database server. The index is not created by
+# migrations, run /admin/create_fulltext_index before enabling the setting.
+FULLTEXT_INVERTED_INDEX = bool(os.environ.get('GGRC_FULLTEXT_INVERTED_INDEX'))
+FULLTEXT_MIN_TOKEN_SIZE = int(
+    os.environ.get('GGRC_FULLTEXT_MIN_TOKEN_SIZE', '3')
+)
+
+# Update fulltext records of reindexed objects by writing only added, changed
+# and removed records instead of deleting and inserting all of them.
+FULLTEXT_DIFF_REINDEX = (
+    os.environ.get('GGRC_FULLTEXT_DIFF_REINDEX', 'true').lower() == 'true'
+)
+
+# Number of objects in a single shard of full reindex. Every shard is
+# reindexed by a separate background task.
+REINDEX_SHARD_SIZE = int(os.environ.get('GGRC_REINDEX_SHARD_SIZE', '10000'))
+
+# Cache serialized objects returned by collection GET. Cached objects are not
+# invalidated by changes of embedded related objects, e.g. ACL people and
+# custom attribute values, and can be stale for up to OBJECT_CACHE_TTL.
+OBJECT_CACHE_ENABLED = bool(os.environ.get('GGRC_OBJECT_CACHE_ENABLED'))
+
+# Max number of serialized objects kept in the in-process tier of the
+# collection GET cache. Set to 0 to use memcache only.
+OBJECT_CACHE_LOCAL_SIZE = int(
+    os.environ.get('GGRC_OBJECT_CACHE_LOCAL_SIZE', '5000')
+)
+
+# Expiration time in seconds of collection GET cache entries. Serialized
+# objects embed related objects, so this bounds how long they can be stale.
+OBJECT_CACHE_TTL = int(os.environ.get('GGRC_OBJECT_CACHE_TTL', '600'))
+
+# Store new revision content as compressed Json. Revisions with plain Json
+# content stay readable and can be compressed with the compress_revisions
+# admin job.
+REVISION_CONTENT_COMPRESSION = bool(
+    os.environ.get('GGRC_REVISION_CONTENT_COMPRESSION')
+)
+REVISION_COMPRESSION_CHUNK_SIZE = int(
+    os.environ.get('GGRC_REVISION_COMPRESSION_CHUNK_SIZE', '1000')
+)
+
+# Cache results of "ids" and "count" /query requests. Works only together
+# with memcache.
+QUERY_CACHE_ENABLED = bool(os.environ.get('GGRC_QUERY_CACHE_ENABLED'))
+QUERY_CACHE_TIMEOUT = int(os.environ.get('GGRC_QUERY_CACHE_TIMEOUT', '600'))
+# Results with more ids are not cached.
+QUERY_CACHE_MAX_IDS = int(os.environ.get('GGRC_QUERY_CACHE_MAX_IDS', '10000'))
+QUERY_CACHE_LOCAL_SIZE = int(
+    os.environ.get('GGRC_QUERY_CACHE_LOCAL_SIZE', '1000')
+)
+
+# Max age in seconds of stored total object counts shown on the all objects
+# page. Counts are changed after every commit, expired counts are queried
+# again to pick up writes that bypass the session.
+OBJECT_COUNTS_MAX_AGE = int(
+    os.environ.get('GGRC_OBJECT_COUNTS_MAX_AGE', '300')
+)
+
+# Publish objects with attribute publishers compiled once per model class
+# instead of inspecting class attributes for every published object.
+COMPILED_JSON_BUILDER = (
+    os.environ.get('GGRC_COMPILED_JSON_BUILDER', 'true').lower() == 'true'
+)
+
+# Number of threads computing chunks of computed attribute values in
+# parallel. Each thread uses its own database connection.
+COMPUTED_ATTRIBUTES_WORKERS = int(
+    os.environ.get('GGRC_COMPUTED_ATTRIBUTES_WORKERS', '1')
+)
+
+# Number of threads sending requests to Issue Tracker during bulk tickets
+# generation and update, and the max number of requests per second they send
+# together.
+ISSUE_TRACKER_BULK_SYNC_WORKERS = int(
+    os.environ.get('GGRC_ISSUE_TRACKER_BULK_SYNC_WORKERS', '4')
+)
+ISSUE_TRACKER_RATE_LIMIT = float(
+    os.environ.get('GGRC_ISSUE_TRACKER_RATE_LIMIT', '10')
+)
+
+# Number of threads rendering and sending daily digest emails.
+NOTIFICATIONS_DIGEST_WORKERS = int(
+    os.environ.get('GGRC_NOTIFICATIONS_DIGEST_WORKERS', '4')
+)
+
+# Number of workflows which recurring cycles are started by the cron job
+# with a single ACL propagation and fulltext indexing.
+WORKFLOW_CYCLES_BATCH_SIZE = int(
+    os.environ.get('GGRC_WORKFLOW_CYCLES_BATCH_SIZE', '50')
+)
@@ -5,6 +5,7 @@
 
 import logging
 from collections import defaultdict
+from collections import namedtuple
 from functools import partial
 import itertools
 
@@ -13,14 +14,15 @@ from sqlalchemy import orm
 
 from ggrc import db
 from ggrc import models
+from ggrc import utils
 from ggrc.models import all_models
+from ggrc.models import cache_generation
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.fulltext import get_indexer
 from ggrc.models.reflection import AttributeInfo
-from ggrc.utils import generate_query_chunks, helpers
+from ggrc.utils import benchmark, helpers
 
 from ggrc.snapshotter.rules import Types
-from ggrc.snapshotter.datastructures import Pair
 from ggrc.fulltext.attributes import FullTextAttr
 
 
@@ -55,6 +57,37 @@ TAG_TMPL = u"{parent_type}-{parent_id}-{child_type}"
 PARENT_PROPERTY_TMPL = u"{parent_type}-{parent_id}"
 CHILD_PROPERTY_TMPL = u"{child_type}-{child_id}"
 
+# Number of snapshots reindexed in a single transaction.
+SNAPSHOT_CHUNK_SIZE = 1000
+# Number of records written with a single executemany insert.
+RECORD_CHUNK_SIZE = 10000
+
+
+class CadInfo(namedtuple("CadInfo", ["id", "title", "attribute_type",
+                                     "default_value", "value_mapping"])):
+  """Custom attribute definition data needed for indexing.
+
+  Unlike CustomAttributeDefinition instances these are not bound to the
+  session, so they stay valid between transactions.
+  """
+  __slots__ = ()
+
+  @classmethod
+  def from_cad(cls, cad):
+    return cls(cad.id, cad.title, cad.attribute_type, cad.default_value,
+               cad.value_mapping)
+
+  def get_indexed_value(self, value):
+    return self.value_mapping.get(value, value)
+
+
+def _get_cad_definition_types():
+  """Get mapping of CAD definition types to snapshottable model names."""
+  # pylint: disable=protected-access
+  return {
+      getattr(all_models, c)._inflector.table_singular: c for c in Types.all
+  }
+
 
 def _get_custom_attribute_dict():
   """Get fulltext indexable properties for all snapshottable objects
@@ -65,10 +98,7 @@ def _get_custom_attribute_dict():
     custom_attribute_definitions dict - representing dictionary of custom
                                         attribute definition attributes.
   """
-  # pylint: disable=protected-access
-  cadef_klass_names = {
-      getattr(all_models, c)._inflector.table_singular: c for c in Types.all
-  }
+  cadef_klass_names = _get_cad_definition_types()
 
   query = models.CustomAttributeDefinition.query.filter(
       models.CustomAttributeDefinition.definition_type.in_(
@@ -77,10 +107,31 @@ def _get_custom_attribute_dict():
   )
   cads = defaultdict(list)
   for cad in query:
-    cads[cadef_klass_names[cad.definition_type]].append(cad)
+    cads[cadef_klass_names[cad.definition_type]].append(CadInfo.from_cad(cad))
   return cads
 
 
+def _build_metadata():
+  """Load custom attribute definitions and options used for indexing."""
+  return _get_custom_attribute_dict(), get_options()
+
+
+# Custom attribute definitions and options used for the last reindex.
+_METADATA_CACHE = cache_generation.GenerationCache(
+    "snapshot_metadata", _build_metadata,
+)
+
+
+def get_metadata():
+  """Get custom attribute definitions and options used for indexing.
+
+  Returns:
+    tuple of custom attribute definitions dict and options dict. Both are
+    loaded again only if CADs or options have changed since the last call.
+  """
+  return _METADATA_CACHE.get()
+
+
 def get_searchable_attributes(attributes, cads, content):
   """Get all searchable attributes for a given object that should be indexed
 
@@ -130,35 +181,30 @@ def get_options():
 @helpers.without_sqlalchemy_cache
 def reindex():
   """Reindex all snapshots."""
-  columns = db.session.query(
-      models.Snapshot.parent_type,
-      models.Snapshot.parent_id,
-      models.Snapshot.child_type,
-      models.Snapshot.child_id,
-  )
-  all_count = columns.count()
-  handled = 0
-  for query_chunk in generate_query_chunks(columns):
-    handled += query_chunk.count()
-    logger.info("Snapshot: %s/%s", handled, all_count)
-    pairs = {Pair.from_4tuple(p) for p in query_chunk}
-    reindex_pairs(pairs)
-    db.session.commit()
+  snapshot_ids = [
+      id_ for id_, in db.session.query(models.Snapshot.id).order_by(
+          models.Snapshot.id
+      )
+  ]
+  _reindex_ids(snapshot_ids)
 
 
 def reindex_snapshots(snapshot_ids):
   """Reindex selected snapshots"""
   if not snapshot_ids:
     return
-  columns = db.session.query(
-      models.Snapshot.parent_type,
-      models.Snapshot.parent_id,
-      models.Snapshot.child_type,
-      models.Snapshot.child_id,
-  ).filter(models.Snapshot.id.in_(snapshot_ids))
-  for query_chunk in generate_query_chunks(columns):
-    pairs = {Pair.from_4tuple(p) for p in query_chunk}
-    reindex_pairs(pairs)
+  _reindex_ids(sorted(snapshot_ids))
+
+
+def _reindex_ids(snapshot_ids):
+  """Reindex snapshots with given ids chunk by chunk."""
+  all_count = len(snapshot_ids)
+  handled = 0
+  for ids_chunk in utils.list_chunks(snapshot_ids,
+                                     chunk_size=SNAPSHOT_CHUNK_SIZE):
+    handled += len(ids_chunk)
+    logger.info("Snapshot: %s/%s", handled, all_count)
+    _reindex_filtered(models.Snapshot.id.in_(ids_chunk))
     db.session.commit()
 
 
@@ -186,6 +232,23 @@ def insert_records(payload):
   db.session.commit()
 
 
+def _replace_records(snapshot_ids, payload):
+  """Replace records of snapshots within the current transaction.
+
+  Records are inserted with executemany in chunks of RECORD_CHUNK_SIZE.
+  """
+  if not snapshot_ids:
+    return
+  db.session.query(Record).filter(
+      Record.type == "Snapshot",
+      Record.key.in_(snapshot_ids)
+  ).delete(synchronize_session=False)
+  inserter = Record.__table__.insert()
+  for payload_chunk in utils.list_chunks(payload,
+                                         chunk_size=RECORD_CHUNK_SIZE):
+    db.session.execute(inserter, payload_chunk)
+
+
 def get_person_data(rec, person):
   """Get list of Person properties for fulltext indexing
   """
@@ -356,23 +419,25 @@ def reindex_pairs(pairs):
   """
   if not pairs:
     return
-  snapshots = dict()
-  options = get_options()
-  snapshot_query = models.Snapshot.query.filter(
-      tuple_(
-          models.Snapshot.parent_type,
-          models.Snapshot.parent_id,
-          models.Snapshot.child_type,
-          models.Snapshot.child_id,
-      ).in_(
-          {pair.to_4tuple() for pair in pairs}
-      )
-  ).options(
-      orm.subqueryload("revision").load_only(
+  _reindex_filtered(tuple_(
+      models.Snapshot.parent_type,
+      models.Snapshot.parent_id,
+      models.Snapshot.child_type,
+      models.Snapshot.child_id,
+  ).in_(
+      {pair.to_4tuple() for pair in pairs}
+  ))
+  db.session.commit()
+
+
+def _get_snapshots_data(snapshot_filter, cad_dict):
+  """Get data of filtered snapshots needed to build their records."""
+  snapshot_query = models.Snapshot.query.filter(snapshot_filter).options(
+      orm.joinedload("revision").load_only(
           "id",
           "resource_type",
           "resource_id",
-          "_content",
+          "_raw_content",
       ),
       orm.load_only(
           "id",
@@ -383,8 +448,10 @@ def reindex_pairs(pairs):
           "revision_id",
       )
   )
-  cad_dict = _get_custom_attribute_dict()
-  for snapshot in snapshot_query:
+  snapshot_list = snapshot_query.all()
+  models.Revision.populate_many([s.revision for s in snapshot_list])
+  snapshots = dict()
+  for snapshot in snapshot_list:
     revision = snapshot.revision
     snapshots[snapshot.id] = {
         "id": snapshot.id,
@@ -397,8 +464,13 @@ def reindex_pairs(pairs):
             cad_dict[revision.resource_type],
             revision.content)
     }
+  return snapshots
+
+
+def _get_search_payload(snapshots, options):
+  """Build fulltext records for snapshots data."""
   search_payload = []
-  for snapshot in snapshots.values():
+  for snapshot in snapshots.itervalues():
     for prop, val in get_properties(snapshot).items():
       search_payload.extend(
           get_record_value(
@@ -413,5 +485,15 @@ def reindex_pairs(pairs):
               options
           )
       )
-  delete_records(snapshots.keys())
-  insert_records(search_payload)
+  return search_payload
+
+
+def _reindex_filtered(snapshot_filter):
+  """Reindex snapshots matching the filter in the current transaction."""
+  cad_dict, options = get_metadata()
+  with benchmark("Snapshot indexer. Load snapshots"):
+    snapshots = _get_snapshots_data(snapshot_filter, cad_dict)
+  with benchmark("Snapshot indexer. Build records"):
+    search_payload = _get_search_payload(snapshots, options)
+  with benchmark("Snapshot indexer. Write records"):
+    _replace_records(snapshots.keys(), search_payload)
@@ -51,3 +51,17 @@ def assert_type(obj, expected_type):
         "Object of incorrect type '{}' provided. "
         "Should be '{}'".format(type(obj), expected_type)
     )
+
+
+def is_outermost_transaction(session):
+  """Check if the session transaction ends the whole database transaction.
+
+  Commit and rollback events are fired for savepoints too, this is used by
+  their listeners that have to act only on the outermost transaction.
+  """
+  # pylint: disable=protected-access
+  transaction = session.transaction
+  while (transaction is not None and not transaction.nested and
+         transaction._parent is not None):
+    transaction = transaction._parent
+  return transaction is None or not transaction.nested
@@ -16,9 +16,10 @@ from ggrc.login import get_current_user_id
 logger = getLogger(__name__)
 
 
-def _revision_generator(user_id, action, objects):
-  for obj in objects:
-    yield Revision(obj, user_id, action, obj.log_json())
+def _revision_generator(user_id, action, objects, cache):
+  objects = list(objects)
+  for obj, log_json in zip(objects, cache.get_log_jsons(objects)):
+    yield Revision(obj, user_id, action, log_json)
 
 
 def _get_log_revisions(current_user_id, obj=None, force_obj=False):
@@ -46,10 +47,10 @@ def _get_log_revisions(current_user_id, obj=None, force_obj=False):
         modified_objects.add(documentable)
 
   revisions.extend(_revision_generator(
-      current_user_id, "created", cache.new
+      current_user_id, "created", cache.new, cache
   ))
   revisions.extend(_revision_generator(
-      current_user_id, "modified", modified_objects
+      current_user_id, "modified", modified_objects, cache
   ))
   if force_obj and obj is not None and obj not in cache.dirty:
     # If the ``obj`` has been updated, but only its custom attributes have
@@ -59,7 +60,7 @@ def _get_log_revisions(current_user_id, obj=None, force_obj=False):
     revision = Revision(obj, current_user_id, 'modified', obj.log_json())
     revisions.append(revision)
   revisions.extend(_revision_generator(
-      current_user_id, "deleted", cache.deleted
+      current_user_id, "deleted", cache.deleted, cache
   ))
   return revisions
 
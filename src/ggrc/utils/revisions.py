@@ -5,9 +5,13 @@
 
 from logging import getLogger
 
+import sqlalchemy as sa
+
 from ggrc import db
+from ggrc import settings
 from ggrc.login import get_current_user_id
 from ggrc.models import all_models
+from ggrc.models import types
 
 logger = getLogger(__name__)
 
@@ -120,3 +124,47 @@ def get_last_revision_content(obj_type, obj_id):
   else:
     content = last_revision.content if last_revision else None
   return content
+
+
+def compress_revisions(chunk_size=None):
+  """Rewrite plain Json content of all revisions in compressed format.
+
+  Revisions are handled in chunks ordered by id with a commit after every
+  chunk. Already compressed content is skipped, so the job can be restarted
+  at any time.
+
+  Returns:
+    number of compressed revisions.
+  """
+  chunk_size = chunk_size or settings.REVISION_COMPRESSION_CHUNK_SIZE
+  table = all_models.Revision.__table__
+  update = table.update().where(
+      table.c.id == sa.bindparam("_id")
+  ).values(
+      content=sa.bindparam("_content"),
+      # keep revision dates, they are used for old revisions content
+      updated_at=table.c.updated_at,
+  )
+  last_id = 0
+  compressed = 0
+  while True:
+    rows = db.session.execute(
+        sa.select([table.c.id, table.c.content]).where(
+            table.c.id > last_id
+        ).order_by(table.c.id).limit(chunk_size)
+    ).fetchall()
+    if not rows:
+      break
+    last_id = rows[-1].id
+    values = [
+        {"_id": id_, "_content": types.compress_json(content)}
+        for id_, content in rows
+        if not content.startswith(types.COMPRESSED_JSON_PREFIX)
+    ]
+    if values:
+      db.session.execute(update, values)
+    db.session.plain_commit()
+    compressed += len(values)
+    logger.info("Compressed %s revisions, last revision id %s",
+                compressed, last_id)
+  return compressed
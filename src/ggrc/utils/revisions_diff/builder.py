@@ -8,6 +8,8 @@ import collections
 
 from flask import g
 
+from ggrc import db
+
 from ggrc.utils.revisions_diff import meta_info
 
 
@@ -48,28 +50,45 @@ def rewarm_latest_content():
   del g.latest_revision_content_markers
   if not cache:
     return
-  query = all_models.Revision.query.filter(
-      all_models.Revision.resource_type == cache.keys()[0],
-      all_models.Revision.resource_id.in_(cache[cache.keys()[0]])
+  model = all_models.Revision
+  id_columns = (
+      model.id,
+      model.resource_type,
+      model.resource_id,
+      model.created_at,
+  )
+  query = db.session.query(*id_columns).filter(
+      model.resource_type == cache.keys()[0],
+      model.resource_id.in_(cache[cache.keys()[0]])
   )
   for type_, ids in cache.items()[1:]:
     query = query.union_all(
-        all_models.Revision.query.filter(
-            all_models.Revision.resource_type == type_,
-            all_models.Revision.resource_id.in_(ids)
+        db.session.query(*id_columns).filter(
+            model.resource_type == type_,
+            model.resource_id.in_(ids)
         ))
   query = query.order_by(
-      all_models.Revision.resource_id,
-      all_models.Revision.resource_type,
-      all_models.Revision.created_at.desc(),
-      all_models.Revision.id.desc(),
+      model.resource_id,
+      model.resource_type,
+      model.created_at.desc(),
+      model.id.desc(),
   )
+  # Only ids are loaded for all revisions, content is loaded and decoded
+  # for the latest revision of each object.
   key = None
-  for revision in query:
-    if key == (revision.resource_type, revision.resource_id):
+  latest_ids = []
+  for revision_id, resource_type, resource_id, _ in query:
+    if key == (resource_type, resource_id):
       continue
-    key = (revision.resource_type, revision.resource_id)
-    g.latest_revision_content[key] = revision.content
+    key = (resource_type, resource_id)
+    latest_ids.append(revision_id)
+  if not latest_ids:
+    return
+  latest_revisions = model.query.filter(model.id.in_(latest_ids)).all()
+  model.populate_many(latest_revisions)
+  for latest in latest_revisions:
+    key = (latest.resource_type, latest.resource_id)
+    g.latest_revision_content[key] = latest.content
 
 
 def get_person_email(person_id):
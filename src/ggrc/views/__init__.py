@@ -19,12 +19,15 @@ from ggrc import fulltext, login, models, settings, utils as ggrc_utils, \
     extensions as ggrc_extensions, converters as ggrc_converters
 from ggrc.app import app, db
 from ggrc.builder import json as builder_json
+from ggrc.cache import object_cache
 from ggrc.cache import utils as cache_utils
-from ggrc.fulltext import mixin
+from ggrc.fulltext import mysql
+from ggrc.fulltext import reindex as fulltext_reindex
 from ggrc.integrations import integrations_errors, issues
 from ggrc.models import background_task, reflection, revision
 from ggrc.models.hooks.issue_tracker import integration_utils
 from ggrc.notifications import common
+from ggrc.query import person_counters
 from ggrc.query import views as query_views
 from ggrc.rbac import permissions
 from ggrc.services import common as services_common
@@ -41,9 +44,9 @@ REINDEX_CHUNK_SIZE = 100
 # Needs to be secured as we are removing @login_required
 @app.route("/_background_tasks/propagate_acl", methods=["POST"])
 @background_task.queued_task
-def propagate_acl(_):
+def propagate_acl(task):
   """Web hook to update revision content."""
-  models.hooks.acl.propagation.propagate_all()
+  models.hooks.acl.propagation.propagate_all(task)
   return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
@@ -55,6 +58,33 @@ def create_missing_revisions(_):
   return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
+@app.route("/_background_tasks/compress_revisions", methods=["POST"])
+@background_task.queued_task
+def compress_revisions(_):
+  """Web hook to compress content of existing revisions."""
+  with benchmark("Compress revisions content"):
+    revisions.compress_revisions()
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
+@app.route("/_background_tasks/rebuild_person_counters", methods=["POST"])
+@background_task.queued_task
+def rebuild_person_counters(_):
+  """Web hook to rebuild object counters of all people."""
+  with benchmark("Rebuild person object counters"):
+    person_counters.rebuild()
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
+@app.route("/_background_tasks/create_fulltext_index", methods=["POST"])
+@background_task.queued_task
+def create_fulltext_index(_):
+  """Web hook to create the fulltext index on fulltext records content."""
+  with benchmark("Create fulltext index"):
+    mysql.create_fulltext_index()
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
 @app.route("/_background_tasks/reindex_snapshots", methods=["POST"])
 @background_task.queued_task
 def reindex_snapshots(_):
@@ -75,9 +105,23 @@ def reindex(_):
 
 @app.route("/_background_tasks/full_reindex", methods=["POST"])
 @background_task.queued_task
-def full_reindex(_):
+def full_reindex(task):
   """Web hook to update the full text search index for all models."""
-  do_full_reindex()
+  parameters = getattr(task, "parameters", None) or {}
+  do_full_reindex(resume=parameters.get("resume", False))
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
+@app.route("/_background_tasks/reindex_shard", methods=["POST"])
+def reindex_shard(*_, **kwargs):
+  """Web hook to update the full text search index for a single shard."""
+  shard_id = ggrc_utils.get_task_attr("shard_id", kwargs)
+  with benchmark("Run reindex_shard background task"):
+    fulltext_reindex.reindex_shard(
+        shard_id,
+        REINDEX_CHUNK_SIZE,
+        on_finish=lambda: start_compute_attributes(revision_ids="all_latest"),
+    )
   return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
@@ -99,7 +143,11 @@ def compute_attributes(*_, **kwargs):
       revision_ids = list(revision_ids)
 
     from ggrc.data_platform import computed_attributes
-    computed_attributes.compute_attributes(revision_ids)
+    if revision_ids == "all_latest":
+      resume = ggrc_utils.get_task_attr("resume", kwargs)
+      computed_attributes.compute_all_attributes(resume=bool(resume))
+    else:
+      computed_attributes.compute_attributes(revision_ids)
     return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
@@ -314,17 +362,32 @@ def start_update_cad_related_objs(event_id, model_name, need_revisions=None):
   )
 
 
-def start_compute_attributes(revision_ids=None, event_id=None):
+def start_compute_attributes(revision_ids=None, event_id=None, resume=False):
   """Start a background task for computed attributes."""
   background_task.create_lightweight_task(
       name="compute_attributes",
       url=flask.url_for(compute_attributes.__name__),
-      parameters={"revision_ids": revision_ids, "event_id": event_id},
+      parameters={
+          "revision_ids": revision_ids,
+          "event_id": event_id,
+          "resume": resume,
+      },
       method="POST",
       queued_callback=compute_attributes
   )
 
 
+def start_reindex_shard(shard_id):
+  """Start a background task to reindex a full reindex shard."""
+  background_task.create_lightweight_task(
+      name="reindex_shard",
+      url=flask.url_for(reindex_shard.__name__),
+      parameters={"shard_id": shard_id},
+      method="POST",
+      queued_callback=reindex_shard
+  )
+
+
 def start_update_audit_issues(audit_id, message):
   """Start a background task to update IssueTracker issues related to Audit."""
   bg_task = background_task.create_task(
@@ -355,20 +418,8 @@ def do_reindex(with_reindex_snapshots=False):
   """Update the full text search index."""
 
   indexer = fulltext.get_indexer()
-  indexed_models = {
-      m.__name__: m for m in models.all_models.all_models
-      if issubclass(m, mixin.Indexed) and m.REQUIRED_GLOBAL_REINDEX
-  }
-  people_query = db.session.query(
-      models.all_models.Person.id,
-      models.all_models.Person.name,
-      models.all_models.Person.email
-  )
-  indexer.cache["people_map"] = {p.id: (p.name, p.email) for p in people_query}
-  indexer.cache["ac_role_map"] = dict(db.session.query(
-      models.all_models.AccessControlRole.id,
-      models.all_models.AccessControlRole.name,
-  ))
+  indexed_models = fulltext_reindex.get_indexed_models()
+  fulltext_reindex.warmup_indexer_cache()
   for model_name in sorted(indexed_models.keys()):
     logger.info("Updating index for: %s", model_name)
     with benchmark("Create records for %s" % model_name):
@@ -392,11 +443,18 @@ def do_reindex(with_reindex_snapshots=False):
 
 
 @helpers.without_sqlalchemy_cache
-def do_full_reindex():
-  """Update the full text search index for all models."""
+def do_full_reindex(resume=False):
+  """Update the full text search index for all models.
 
-  do_reindex(with_reindex_snapshots=True)
-  start_compute_attributes(revision_ids="all_latest")
+  Reindex is split into shards handled by separate background tasks. With
+  resume flag the not finished shards of the latest run are restarted from
+  their checkpoints instead of starting a new run.
+  """
+  shards = fulltext_reindex.resume_shards() if resume else []
+  if not shards:
+    shards = fulltext_reindex.create_shards()
+  for shard in shards:
+    start_reindex_shard(shard.id)
 
 
 class SetEncoder(json.JSONEncoder):
@@ -707,17 +765,38 @@ def admin_full_reindex():
                          [('Content-Type', 'text/html')])))
 
 
+@app.route("/admin/resume_full_reindex", methods=["POST"])
+@login.login_required
+@login.admin_required
+def admin_resume_full_reindex():
+  """Calls a webhook that continues the interrupted full reindex
+  """
+  bg_task = background_task.create_task(
+      name="full_reindex",
+      url=flask.url_for(full_reindex.__name__),
+      parameters={"resume": True},
+      queued_callback=full_reindex
+  )
+  db.session.commit()
+  return bg_task.make_response(
+      app.make_response(("scheduled %s" % bg_task.name, 200,
+                         [('Content-Type', 'text/html')])))
+
+
 @app.route("/admin/compute_attributes", methods=["POST"])
 @login.login_required
 @login.admin_required
 def send_event_job():
   """Trigger background task on every event for computed attributes."""
   with benchmark("POST /admin/compute_attributes"):
+    resume = False
     if flask.request.data:
-      revision_ids = flask.request.get_json().get("revision_ids", [])
+      data = flask.request.get_json()
+      resume = bool(data.get("resume"))
+      revision_ids = "all_latest" if resume else data.get("revision_ids", [])
     else:
       revision_ids = "all_latest"
-    start_compute_attributes(revision_ids=revision_ids)
+    start_compute_attributes(revision_ids=revision_ids, resume=resume)
     return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
@@ -761,6 +840,75 @@ def admin_create_missing_revisions():
                         [('Content-Type', 'text/html')])))
 
 
+@app.route("/admin/compress_revisions", methods=["POST"])
+@login.login_required
+@login.admin_required
+def admin_compress_revisions():
+  """Compress content of revisions stored as plain Json"""
+  admins = getattr(settings, "BOOTSTRAP_ADMIN_USERS", [])
+  if login.get_current_user().email not in admins:
+    raise exceptions.Forbidden()
+
+  bg_task = background_task.create_task(
+      name="compress_revisions",
+      url=flask.url_for(compress_revisions.__name__),
+      queued_callback=compress_revisions,
+  )
+  db.session.commit()
+  return bg_task.make_response(
+      app.make_response(("scheduled %s" % bg_task.name, 200,
+                        [('Content-Type', 'text/html')])))
+
+
+@app.route("/admin/rebuild_person_counters", methods=["POST"])
+@login.login_required
+@login.admin_required
+def admin_rebuild_person_counters():
+  """Rebuild object counters shown on My Work page for all people"""
+  admins = getattr(settings, "BOOTSTRAP_ADMIN_USERS", [])
+  if login.get_current_user().email not in admins:
+    raise exceptions.Forbidden()
+
+  bg_task = background_task.create_task(
+      name="rebuild_person_counters",
+      url=flask.url_for(rebuild_person_counters.__name__),
+      queued_callback=rebuild_person_counters,
+  )
+  db.session.commit()
+  return bg_task.make_response(
+      app.make_response(("scheduled %s" % bg_task.name, 200,
+                        [('Content-Type', 'text/html')])))
+
+
+@app.route("/admin/create_fulltext_index", methods=["POST"])
+@login.login_required
+@login.admin_required
+def admin_create_fulltext_index():
+  """Create the fulltext index used by FULLTEXT_INVERTED_INDEX search"""
+  admins = getattr(settings, "BOOTSTRAP_ADMIN_USERS", [])
+  if login.get_current_user().email not in admins:
+    raise exceptions.Forbidden()
+
+  bg_task = background_task.create_task(
+      name="create_fulltext_index",
+      url=flask.url_for(create_fulltext_index.__name__),
+      queued_callback=create_fulltext_index,
+  )
+  db.session.commit()
+  return bg_task.make_response(
+      app.make_response(("scheduled %s" % bg_task.name, 200,
+                        [('Content-Type', 'text/html')])))
+
+
+@app.route("/admin/cache_stats", methods=["GET"])
+@login.login_required
+@login.admin_required
+def admin_cache_stats():
+  """Hit ratio and latency of the collection GET cache in this process"""
+  response = {"object_cache": object_cache.get_stats()}
+  return flask.Response(json.dumps(response), mimetype='application/json')
+
+
 @app.route("/admin")
 @login.login_required
 @login.admin_required
@@ -931,7 +1079,7 @@ def make_document_admin():
   for doc in docs:
     doc.add_admin_role()
   db.session.commit()
-  cache_utils.clear_permission_cache()
+  cache_utils.clear_users_permission_cache([login.get_current_user_id()])
   response = utils.DocumentEndpoint.build_make_admin_response(
       flask.request.json,
       docs
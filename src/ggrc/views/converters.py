@@ -22,6 +22,7 @@ from flask import request
 from flask import json
 from flask import render_template
 from flask import g
+from flask import stream_with_context
 from werkzeug.exceptions import (
     BadRequest, InternalServerError, Unauthorized, Forbidden, NotFound
 )
@@ -81,8 +82,17 @@ def parse_export_request():
 
 
 def export_file(export_to, filename, csv_string=None):
-  """Export file to csv file or gdrive file"""
+  """Export file to csv file or gdrive file
+
+  Args:
+    export_to: "csv" or "gdrive".
+    filename: name of exported file.
+    csv_string: csv data either as a string or as an iterable with chunks of
+      csv data. Chunks are streamed to the client when exporting to csv.
+  """
   if export_to == "gdrive":
+    if not isinstance(csv_string, basestring):
+      csv_string = "".join(csv_string)
     gfile = fa.create_gdrive_file(csv_string, filename)
     headers = [('Content-Type', 'application/json'), ]
     return current_app.make_response((json.dumps(gfile), 200, headers))
@@ -91,6 +101,8 @@ def export_file(export_to, filename, csv_string=None):
         ("Content-Type", "text/csv"),
         ("Content-Disposition", "attachment"),
     ]
+    if not isinstance(csv_string, basestring):
+      csv_string = stream_with_context(csv_string)
     return current_app.make_response((csv_string, 200, headers))
   raise BadRequest(app_errors.BAD_PARAMS)
 
@@ -161,14 +173,19 @@ def handle_export_csv_template_request():
   return export_file(export_to, filename, csv_string)
 
 
-def make_export(objects, exportable_objects=None):
-  """Make export"""
+def get_export_converter(objects, exportable_objects=None):
+  """Get export converter for objects from query"""
   query_helper = QueryHelper(objects)
   ids_by_type = query_helper.get_ids()
-  converter = ExportConverter(
+  return ExportConverter(
       ids_by_type=ids_by_type,
       exportable_queries=exportable_objects
   )
+
+
+def make_export(objects, exportable_objects=None):
+  """Make export"""
+  converter = get_export_converter(objects, exportable_objects)
   csv_data = converter.export_csv_data()
   object_names = "_".join(converter.get_object_names())
   return csv_data, object_names
@@ -245,13 +262,15 @@ def run_export(objects, ie_id, user_id, url_root, exportable_objects):
       ie = import_export.get(ie_id)
       check_for_previous_run()
 
-      content, _ = make_export(objects, exportable_objects)
+      converter = get_export_converter(objects, exportable_objects)
+      with benchmark("Store export content"):
+        ie.store_content_parts(converter.export_csv_chunks())
       db.session.refresh(ie)
       if ie.status == "Stopped":
+        db.session.rollback()
         return
       ie.status = "Finished"
       ie.end_at = datetime.utcnow()
-      ie.content = content
       db.session.commit()
       job_emails.send_email(job_emails.EXPORT_COMPLETED, user.email, url_root,
                             ie.title, ie_id)
@@ -501,7 +520,7 @@ def handle_file_download(id2):
   try:
     export_to = request.args.get("export_to")
     ie = import_export.get(id2)
-    return export_file(export_to, ie.title, ie.content.encode("utf-8"))
+    return export_file(export_to, ie.title, ie.iter_content())
   except (Forbidden, NotFound, Unauthorized):
     raise
   except Exception as e:
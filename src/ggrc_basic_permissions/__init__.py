@@ -3,9 +3,11 @@
 
 """RBAC module"""
 
+import collections
 import cPickle
 import datetime
 import itertools
+import time
 import zlib
 import logging
 
@@ -48,6 +50,10 @@ blueprint = flask.Blueprint(
 
 PERMISSION_CACHE_TIMEOUT = 3600  # 60 minutes
 
+# Permission cache hits, misses and total permissions rebuild time in
+# seconds for the current process.
+PERMISSION_CACHE_STATS = collections.Counter()
+
 
 def get_public_config(_):
   """Expose additional permissions-dependent config to client.
@@ -143,38 +149,31 @@ def collect_permissions(src_permissions, context_id, permissions):
             })
 
 
-def query_memcache(key):
+def query_memcache(user_id):
   """Check if cached permissions are available
 
   Args:
-      key (string): key of the stored permissions
+      user_id (int): id of the user whose permissions are requested
   Returns:
       cache (memcache_client): memcache client or None if caching
                                is not available
+      key (string): key of the current permissions entry of the user
       permissions_cache (dict): dict with all permissions or None if there
                                 was a cache miss
   """
   if not getattr(settings, 'MEMCACHE_MECHANISM', False):
-    return None, None
+    return None, None, None
 
   cache = cache_utils.get_cache_manager().cache_object.memcache_client
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key not in cached_keys_set:
-    # We set the permissions:list variable so that we are able to batch
-    # remove all permissions related keys from memcache
-    cached_keys_set.add(key)
-    cache.set('permissions:list', cached_keys_set, PERMISSION_CACHE_TIMEOUT)
-    return cache, None
-
+  # The key contains generation counters that are bumped on invalidation, so
+  # an entry stored under it is never outdated.
+  key = cache_utils.get_permissions_key(cache, user_id)
   permissions_data = cache.get(key)
   if permissions_data:
     # permissions_cache is stored in compressed state,
     # need to decompress it before using
-    permissions_cache = cPickle.loads(zlib.decompress(permissions_data))
-    # If the key is both in permissions:list and in memcache itself
-    # it is safe to return the cached permissions
-    return cache, permissions_cache
-  return cache, None
+    return cache, key, cPickle.loads(zlib.decompress(permissions_data))
+  return cache, key, None
 
 
 def load_default_permissions(permissions):
@@ -408,16 +407,14 @@ def store_results_into_memcache(permissions, cache, key):
   if cache is None:
     return
 
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key in cached_keys_set:
-    # Size of permissions dict can be too big for memcache (> 1 Mb),
-    # so compressed dict will be stored.
-    compressed_permissions = zlib.compress(cPickle.dumps(permissions))
-
-    # We only add the permissions to the cache if the
-    # key still exists in the permissions:list after
-    # the query has executed.
-    cache.set(key, compressed_permissions, PERMISSION_CACHE_TIMEOUT)
+  # Size of permissions dict can be too big for memcache (> 1 Mb),
+  # so compressed binary pickle will be stored. If the permissions got
+  # invalidated while they were loaded, the key is already outdated and the
+  # stored value will never be read.
+  compressed_permissions = zlib.compress(
+      cPickle.dumps(permissions, cPickle.HIGHEST_PROTOCOL)
+  )
+  cache.set(key, compressed_permissions, PERMISSION_CACHE_TIMEOUT)
 
 
 def load_permissions_for(user):
@@ -439,12 +436,16 @@ def load_permissions_for(user):
   'terms' are the arguments to the 'condition'.
   """
   permissions = {}
-  key = 'permissions:{}'.format(user.id)
 
   with benchmark("load_permissions > query memcache"):
-    cache, result = query_memcache(key)
+    cache, key, result = query_memcache(user.id)
     if result:
+      PERMISSION_CACHE_STATS["hits"] += 1
       return result
+    if cache is not None:
+      PERMISSION_CACHE_STATS["misses"] += 1
+
+  start = time.time()
 
   with benchmark("load_permissions > load default permissions"):
     load_default_permissions(permissions)
@@ -471,6 +472,10 @@ def load_permissions_for(user):
     with benchmark("load_permissions > store results into memcache"):
       store_results_into_memcache(permissions, cache, key)
 
+  rebuild_time = time.time() - start
+  PERMISSION_CACHE_STATS["rebuild_time"] += rebuild_time
+  logger.debug("Loaded permissions for user %s in %.4fs (cache: %s)",
+               user.id, rebuild_time, dict(PERMISSION_CACHE_STATS))
   return permissions
 
 
@@ -29,6 +29,10 @@ class UserRoleColumnHandler(UserColumnHandler):
       ""
   ]
 
+  @classmethod
+  def get_lookup_values(cls, object_class, key, raw_value, options):
+    return []
+
   def parse_item(self):
     value = self.raw_value.lower()
     if value.title() not in self._allowed_roles:
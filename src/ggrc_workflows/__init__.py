@@ -13,13 +13,15 @@ from flask import Blueprint
 from sqlalchemy import inspect, orm
 
 from ggrc import db
+from ggrc import settings
 from ggrc.login import get_current_user
 from ggrc.models import all_models
+from ggrc.models.cache import Cache
 from ggrc.models.relationship import Relationship
 from ggrc.rbac.permissions import is_allowed_update
 from ggrc.access_control import role
 from ggrc.services import signals
-from ggrc.utils import benchmark
+from ggrc.utils import benchmark, list_chunks
 from ggrc.utils.log_event import log_event
 from ggrc_workflows import models, notification
 from ggrc_workflows import services
@@ -210,7 +212,68 @@ def _create_cycle_task(task_group_task, cycle, cycle_task_group, current_user):
   return cycle_task_group_object_task
 
 
-def create_old_style_cycle(cycle, task_group, cycle_task_group, current_user):
+def _map_cycle_task(cycle_task, task_group_object, relationships=None):
+  """Map cycle task to the object of the task group.
+
+  If relationships list is given, the mapping is only added there to be
+  created later by insert_cycle_task_relationships.
+  """
+  if relationships is None:
+    Relationship(source=cycle_task, destination=task_group_object.object)
+  else:
+    relationships.append((cycle_task,
+                          task_group_object.object_type,
+                          task_group_object.object_id))
+
+
+def insert_cycle_task_relationships(relationships):
+  """Create relationships between cycle tasks and objects in bulk.
+
+  Relationships are inserted with multi-row statements, added to the session
+  cache to get revisions and queued for ACL propagation like automappings.
+
+  Args:
+    relationships: list of (cycle task, object type, object id) tuples
+        collected by build_cycle.
+  """
+  if not relationships:
+    return
+  from ggrc.models.hooks import acl
+  db.session.flush()
+  now = datetime.utcnow()
+  values = [{
+      "id": None,
+      "modified_by_id": cycle_task.modified_by_id,
+      "created_at": now,
+      "updated_at": now,
+      "source_id": cycle_task.id,
+      "source_type": cycle_task.type,
+      "destination_id": object_id,
+      "destination_type": object_type,
+      "context_id": None,
+      "parent_id": None,
+      "automapping_id": None,
+      "is_external": False,
+  } for cycle_task, object_type, object_id in relationships]
+  inserter = Relationship.__table__.insert()
+  for values_chunk in list_chunks(values):
+    db.session.execute(inserter.values(values_chunk))
+
+  cycle_task_ids = list({value["source_id"] for value in values})
+  created = []
+  for ids_chunk in list_chunks(cycle_task_ids):
+    created.extend(Relationship.query.filter(
+        Relationship.source_type == models.CycleTaskGroupObjectTask.__name__,
+        Relationship.source_id.in_(ids_chunk),
+    ))
+  cache = Cache.get_cache(create=True)
+  if cache:
+    cache.new.update((relationship, None) for relationship in created)
+  acl.add_relationships({relationship.id for relationship in created})
+
+
+def create_old_style_cycle(cycle, task_group, cycle_task_group, current_user,
+                           relationships=None):
   """ This function preserves the old style of creating cycles, so each object
   gets its own task assigned to it.
   """
@@ -221,16 +284,20 @@ def create_old_style_cycle(cycle, task_group, cycle_task_group, current_user):
           current_user)
 
   for task_group_object in task_group.task_group_objects:
-    object_ = task_group_object.object
     for task_group_task in task_group.task_group_tasks:
       cycle_task_group_object_task = _create_cycle_task(
           task_group_task, cycle, cycle_task_group,
           current_user)
-      Relationship(source=cycle_task_group_object_task, destination=object_)
+      _map_cycle_task(cycle_task_group_object_task, task_group_object,
+                      relationships)
 
 
-def build_cycle(workflow, cycle=None, current_user=None):
-  """Build a cycle with it's child objects"""
+def build_cycle(workflow, cycle=None, current_user=None, relationships=None):
+  """Build a cycle with it's child objects
+
+  If relationships list is given, relationships of cycle tasks are not
+  created but added there, see insert_cycle_task_relationships.
+  """
   build_failed = False
 
   if not workflow.tasks:
@@ -285,16 +352,16 @@ def build_cycle(workflow, cycle=None, current_user=None):
     # preserve the old cycle creation for old workflows, so each object
     # gets its own cycle task
     if workflow.is_old_workflow:
-      create_old_style_cycle(cycle, task_group, cycle_task_group, current_user)
+      create_old_style_cycle(cycle, task_group, cycle_task_group, current_user,
+                             relationships)
     else:
       for task_group_task in task_group.task_group_tasks:
         cycle_task_group_object_task = _create_cycle_task(
             task_group_task, cycle, cycle_task_group, current_user)
 
         for task_group_object in task_group.task_group_objects:
-          object_ = task_group_object.object
-          Relationship(source=cycle_task_group_object_task,
-                       destination=object_)
+          _map_cycle_task(cycle_task_group_object_task, task_group_object,
+                          relationships)
 
   update_cycle_dates(cycle)
   workflow.repeat_multiplier += 1
@@ -742,30 +809,80 @@ def init_extra_views(app):
   views.init_extra_views(app)
 
 
+def _start_workflow_cycles(workflow, event):
+  """Start all due cycles of the workflow and commit them.
+
+  Commit hooks are not run for the commit, objects to reindex are
+  collected by ids to not keep them in the session.
+
+  Returns:
+    Event of the revisions created for the workflow cycles.
+  """
+  relationships = []
+  # Follow same steps as in model_posted.connect_via(models.Cycle)
+  while workflow.next_cycle_start_date <= date.today():
+    cycle = build_cycle(workflow, relationships=relationships)
+    if not cycle:
+      break
+    db.session.add(cycle)
+    notification.handle_cycle_created(cycle, False)
+    notification.handle_workflow_modify(None, workflow)
+  insert_cycle_task_relationships(relationships)
+  event = log_event(db.session, event=event)
+  if hasattr(db.session, "reindex_set"):
+    db.session.reindex_set.warmup()
+  db.session.commit_hooks_enable_flag.disable()
+  try:
+    db.session.commit()
+  finally:
+    db.session.commit_hooks_enable_flag.enable()
+  return event
+
+
 def start_recurring_cycles():
-  """Start recurring cycles by cron job."""
+  """Start recurring cycles by cron job.
+
+  Each workflow is loaded with its task groups, tasks and task ACLs in
+  bulk, and its cycles are committed separately to free memory on each
+  iteration, a single commit exceeded maximum memory limit on AppEngine
+  instance. Revisions, ACL propagation and fulltext indexing are done with
+  a single event and once per batch of WORKFLOW_CYCLES_BATCH_SIZE
+  workflows.
+  """
   with benchmark("contributed cron job start_recurring_cycles"):
     today = date.today()
-    workflows = models.Workflow.query.filter(
+    workflow_ids = [workflow_id for workflow_id, in db.session.query(
+        models.Workflow.id
+    ).filter(
         models.Workflow.next_cycle_start_date <= today,
         models.Workflow.recurrences == True  # noqa
-    )
-    event = None
-    for workflow in workflows:
-      # Follow same steps as in model_posted.connect_via(models.Cycle)
-      while workflow.next_cycle_start_date <= date.today():
-        cycle = build_cycle(workflow)
-        if not cycle:
-          break
-        db.session.add(cycle)
-        notification.handle_cycle_created(cycle, False)
-        notification.handle_workflow_modify(None, workflow)
-      # db.session.commit was moved into cycle intentionally.
-      # 'Cycles' for each 'Workflow' should be committed separately
-      # to free memory on each iteration. Single commit exeeded
-      # maximum memory limit on AppEngine instance.
-      event = log_event(db.session, event=event)
-      db.session.commit()
+    ).order_by(models.Workflow.id)]
+    batch_size = settings.WORKFLOW_CYCLES_BATCH_SIZE
+    for ids_chunk in list_chunks(workflow_ids, chunk_size=batch_size):
+      with benchmark("start recurring cycles for a batch of workflows"):
+        event = None
+        try:
+          for workflow_id in ids_chunk:
+            # Workflows are loaded one by one, the commit of each workflow
+            # would expire the objects loaded for the whole batch.
+            workflow = models.Workflow.query.options(
+                orm.subqueryload_all(
+                    "task_groups.task_group_tasks._access_control_list."
+                    "access_control_people.person"
+                ),
+                orm.subqueryload_all("task_groups.task_group_objects"),
+            ).filter(models.Workflow.id == workflow_id).one()
+            event = _start_workflow_cycles(workflow, event)
+        except Exception:
+          logger.exception("Failed to start cycles of workflow %s",
+                           workflow_id)
+          # Workflows committed before the failure are not started again,
+          # so their ACLs are propagated and objects indexed anyway.
+          db.session.rollback()
+          db.session.commit()
+          raise
+        # Commit with hooks propagates ACLs and indexes objects of the batch.
+        db.session.commit()
 
 
 class WorkflowRoleContributions(RoleContributions):
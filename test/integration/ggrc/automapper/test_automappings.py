@@ -5,6 +5,8 @@
 
 import itertools
 from contextlib import contextmanager
+
+import mock
 from sqlalchemy.orm import load_only
 
 import ggrc
@@ -12,6 +14,8 @@ from ggrc import automapper
 from ggrc import models
 from ggrc.models import all_models
 from ggrc.models import Automapping
+from ggrc.models.relationship import RelationshipsCache
+from ggrc.models.relationship import Stub
 from integration.ggrc import TestCase
 from integration.ggrc import generator
 from integration.ggrc.models import factories
@@ -496,3 +500,49 @@ class TestIssueAutomappings(TestCase):
                                   destination=self.asmt)
 
     self.assertEqual(all_models.Automapping.query.count(), 0)
+
+  def test_bulk_issue_automapping(self):
+    """Automappings for all relationships of a flush are generated at once."""
+    with factories.single_commit():
+      issues = [factories.IssueFactory() for _ in range(10)]
+
+    populate_cache = RelationshipsCache.populate_cache
+    with mock.patch.object(RelationshipsCache, "populate_cache",
+                           autospec=True,
+                           side_effect=populate_cache) as populate_mock:
+      with factories.single_commit():
+        for issue in issues:
+          factories.RelationshipFactory(source=issue, destination=self.asmt)
+
+    self.assertEqual(all_models.Automapping.query.count(), len(issues))
+    automapped = all_models.Relationship.query.filter(
+        all_models.Relationship.automapping_id.isnot(None),
+    ).all()
+    expected = [(self.audit, issue) for issue in issues]
+    expected += [(issue, self.snapshot) for issue in issues]
+    self.assertItemsEqual(
+        self._ordered_pairs_from_relationships(automapped),
+        expected,
+    )
+    self.assertLessEqual(populate_mock.call_count, 3)
+
+  def test_discarded_automappings(self):
+    """Automappings over the limit do not block later automappings."""
+    # pylint: disable=protected-access
+    with mock.patch.object(automapper.AutomapperGenerator,
+                           "generate_automappings_for"):
+      relationship = factories.RelationshipFactory(source=self.issue,
+                                                   destination=self.asmt)
+    automapper_ = automapper.AutomapperGenerator()
+    automapper_.prefetch([Stub.from_source(relationship),
+                          Stub.from_destination(relationship)])
+
+    with automapping_count_limit(0):
+      self.assertIsNone(automapper_._generate(relationship))
+    auto_mappings = automapper_._generate(relationship)
+
+    self.assertItemsEqual(auto_mappings, [
+        automapper_.order(Stub(obj1.type, obj1.id), Stub(obj2.type, obj2.id))
+        for obj1, obj2 in ((self.audit, self.issue),
+                           (self.issue, self.snapshot))
+    ])
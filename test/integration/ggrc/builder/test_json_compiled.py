@@ -0,0 +1,47 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for compiled attribute publishers of the JSON builder."""
+
+import ddt
+import mock
+
+from ggrc import settings
+from ggrc.builder import json
+from ggrc.models import all_models
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+@ddt.ddt
+class TestCompiledBuilder(TestCase):
+  """Compiled publishers give the same output as attribute inspection."""
+
+  @staticmethod
+  def _publish(obj, compiled, inclusions=()):
+    with mock.patch.object(settings, "COMPILED_JSON_BUILDER", compiled):
+      return json.publish_representation(json.publish(obj, inclusions))
+
+  @ddt.data(
+      factories.ControlFactory,
+      factories.AssessmentFactory,
+      factories.IssueFactory,
+      factories.PersonFactory,
+      factories.RiskFactory,
+      factories.RelationshipFactory,
+  )
+  def test_same_output(self, factory):
+    """Test compiled publishers of {0} give the same output."""
+    obj = factory()
+    obj = obj.__class__.query.get(obj.id)
+    self.assertEqual(self._publish(obj, True), self._publish(obj, False))
+
+  def test_inclusions(self):
+    """Test included objects are published the same way."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+    audit = all_models.Audit.query.get(audit.id)
+    inclusions = (("program",), ("context",))
+    compiled = self._publish(audit, True, inclusions)
+    self.assertEqual(compiled, self._publish(audit, False, inclusions))
+    self.assertIn("title", compiled["program"])
@@ -3,13 +3,18 @@
 
 """Tests for basic Block Converter."""
 
+import collections
 from collections import defaultdict
 
 import mock
+import sqlalchemy as sa
 from ddt import data, ddt
 
+from ggrc import db
 from ggrc import models
 from ggrc.converters import base_block
+from ggrc.converters import base_row
+from ggrc.converters import errors
 from ggrc.utils import QueryCounter
 from integration.ggrc import TestCase
 from integration.ggrc.models import factories
@@ -107,3 +112,109 @@ class TestBaseBlock(TestCase):
     )
     id_map = block._get_identifier_mappings(relationships)
     self.assertEqual(expected_id_map, id_map)
+
+
+@ddt
+class TestImportBlockBatches(TestCase):
+  """Tests for batched commits of ImportBlockConverter."""
+
+  @staticmethod
+  def _market_rows(count):
+    """Get import data for count markets."""
+    return [collections.OrderedDict([
+        ("object_type", "Market"),
+        ("code", "market-{}".format(i)),
+        ("title", "Market {}".format(i)),
+        ("Admin", "user@example.com"),
+    ]) for i in range(count)]
+
+  @data(1, 2, 100)
+  def test_batched_import(self, batch_size):
+    """Test all rows are imported with batch size {0}."""
+    with mock.patch("ggrc.settings.IMPORT_BATCH_SIZE", batch_size):
+      response = self.import_data(*self._market_rows(5))
+    self.check_import_errors(response)
+    self.assertEqual(response[0]["created"], 5)
+    self.assertEqual(models.Market.query.count(), 5)
+    revisions = models.Revision.query.filter_by(resource_type="Market")
+    self.assertEqual(revisions.count(), 5)
+
+  @data(1, 2, 100)
+  def test_row_error_in_batch(self, batch_size):
+    """Test failed row doesn't affect other rows with batch size {0}."""
+    original_insert = base_row.ImportRowConverter.insert_secondary_objects
+
+    def insert_secondary_objects(row):
+      """Fail secondary objects insertion for a single row."""
+      if row.obj.slug == "market-2":
+        raise sa.exc.SQLAlchemyError("Test error")
+      original_insert(row)
+
+    with mock.patch("ggrc.settings.IMPORT_BATCH_SIZE", batch_size):
+      with mock.patch.object(base_row.ImportRowConverter,
+                             "insert_secondary_objects",
+                             insert_secondary_objects):
+        response = self.import_data(*self._market_rows(5))
+
+    self.assertEqual(response[0]["row_errors"], [
+        errors.UNKNOWN_ERROR.format(line=5),
+    ])
+    self.assertEqual(response[0]["created"], 4)
+    self.assertEqual(response[0]["ignored"], 1)
+    slugs = {market.slug for market in models.Market.query}
+    self.assertEqual(slugs, {"market-0", "market-1", "market-3", "market-4"})
+    revisions = models.Revision.query.filter_by(resource_type="Market")
+    self.assertEqual(revisions.count(), 4)
+
+  def test_commit_in_row(self):
+    """Test commits done while processing a row keep the row savepoint."""
+    original_insert = base_row.ImportRowConverter.insert_secondary_objects
+
+    def insert_secondary_objects(row):
+      """Commit in every row and fail a single row after the commit."""
+      original_insert(row)
+      db.session.commit()
+      if row.obj.slug == "market-2":
+        raise sa.exc.SQLAlchemyError("Test error")
+
+    with mock.patch("ggrc.settings.IMPORT_BATCH_SIZE", 100):
+      with mock.patch.object(base_row.ImportRowConverter,
+                             "insert_secondary_objects",
+                             insert_secondary_objects):
+        response = self.import_data(*self._market_rows(5))
+
+    self.assertEqual(response[0]["created"], 4)
+    self.assertEqual(response[0]["ignored"], 1)
+    slugs = {market.slug for market in models.Market.query}
+    self.assertEqual(slugs, {"market-0", "market-1", "market-3", "market-4"})
+
+  def test_batch_commit_error(self):
+    """Test rows of a failed batch commit are reported as failed rows."""
+    original_update = base_block.cache_utils.update_memcache_before_commit
+    calls = []
+
+    def update_memcache_before_commit(*args):
+      """Fail commit of the first batch."""
+      calls.append(args)
+      if len(calls) == 1:
+        raise sa.exc.SQLAlchemyError("Test error")
+      original_update(*args)
+
+    with mock.patch("ggrc.settings.IMPORT_BATCH_SIZE", 2):
+      with mock.patch.object(base_block.cache_utils,
+                             "update_memcache_before_commit",
+                             update_memcache_before_commit):
+        response = self.import_data(*self._market_rows(5))
+
+    self.assertEqual(response[0]["row_errors"], [
+        errors.UNKNOWN_ERROR.format(line=3),
+        errors.UNKNOWN_ERROR.format(line=4),
+    ])
+    self.assertEqual(response[0]["block_errors"], [])
+    self.assertEqual(response[0]["rows"], 5)
+    self.assertEqual(response[0]["created"], 3)
+    self.assertEqual(response[0]["ignored"], 2)
+    slugs = {market.slug for market in models.Market.query}
+    self.assertEqual(slugs, {"market-2", "market-3", "market-4"})
+    revisions = models.Revision.query.filter_by(resource_type="Market")
+    self.assertEqual(revisions.count(), 3)
@@ -0,0 +1,166 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for bulk lookups of objects referenced in import blocks."""
+
+import collections
+
+import mock
+
+from ggrc import db
+from ggrc import models
+from ggrc.converters.handlers import handlers
+from ggrc.converters.lookup_index import LookupIndex
+from ggrc.utils import QueryCounter
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestLookupIndex(TestCase):
+  """Tests for LookupIndex."""
+
+  @staticmethod
+  def _block_converter(rows):
+    """Get block converter with person and market mapping columns."""
+    block_converter = mock.MagicMock()
+    block_converter.object_class = models.Control
+    block_converter.headers = collections.OrderedDict([
+        ("contact", {"handler": handlers.UserColumnHandler,
+                     "unique": False}),
+        ("map:market", {"handler": handlers.MappingColumnHandler,
+                        "attr_name": "market",
+                        "unique": False}),
+    ])
+    block_converter.rows = rows
+    return block_converter
+
+  def test_bulk_lookup(self):
+    """Test referenced objects are fetched once for the whole block."""
+    with factories.single_commit():
+      people = [factories.PersonFactory() for _ in range(5)]
+      markets = [factories.MarketFactory() for _ in range(5)]
+    emails = [person.email for person in people]
+    slugs = [market.slug for market in markets]
+    rows = [[email.upper(), "{}\n{}".format(slug, slug.lower())]
+            for email, slug in zip(emails, slugs)]
+    rows.append([u"missing@example.com", u"missing-market"])
+    index = LookupIndex(self._block_converter(rows))
+
+    with QueryCounter() as counter:
+      for email, slug in zip(emails, slugs):
+        self.assertEqual(
+            index.get_object(models.Person, email, key="email").email, email
+        )
+        self.assertEqual(index.get_object(models.Market, slug).slug, slug)
+      self.assertIsNone(
+          index.get_object(models.Person, "missing@example.com", key="email")
+      )
+      self.assertIsNone(index.get_object(models.Market, "missing-market"))
+      self.assertEqual(counter.get, 2)
+
+  def test_not_indexed_value(self):
+    """Test values not present in block rows are queried directly."""
+    market = factories.MarketFactory()
+    index = LookupIndex(self._block_converter([]))
+    self.assertEqual(index.get_object(models.Market, market.slug), market)
+
+  def test_deleted_object(self):
+    """Test objects deleted after indexing are not returned."""
+    market = factories.MarketFactory()
+    slug = market.slug
+    index = LookupIndex(self._block_converter([[u"", slug]]))
+    self.assertEqual(index.get_object(models.Market, slug), market)
+    db.session.delete(models.Market.query.get(market.id))
+    db.session.flush()
+    self.assertIsNone(index.get_object(models.Market, slug))
+
+  def test_expired_object(self):
+    """Test objects changed and expired after indexing are reloaded."""
+    market = factories.MarketFactory()
+    slug = market.slug
+    index = LookupIndex(self._block_converter([[u"", slug]]))
+    self.assertEqual(index.get_object(models.Market, slug), market)
+    db.session.execute(
+        models.Market.__table__.update().where(
+            models.Market.id == market.id
+        ).values(slug="changed-{}".format(slug))
+    )
+    db.session.commit()
+    self.assertIsNone(index.get_object(models.Market, slug))
+
+
+class TestImportLookups(TestCase):
+  """Tests for lookup queries done by import of several blocks."""
+
+  # Columns that reference existing objects by the lookup keys.
+  LOOKUP_COLUMNS = ("people.email", "markets.slug")
+
+  def setUp(self):
+    super(TestImportLookups, self).setUp()
+    with factories.single_commit():
+      self.emails = [factories.PersonFactory().email for _ in range(6)]
+      self.slugs = [factories.MarketFactory().slug for _ in range(6)]
+
+  def _import_lookups(self, count, prefix):
+    """Import count markets and org groups and count lookup queries."""
+    rows = [collections.OrderedDict([
+        ("object_type", "Market"),
+        ("code", "{}-market-{}".format(prefix, i)),
+        ("title", "{} Market {}".format(prefix, i)),
+        ("Admin", self.emails[i]),
+    ]) for i in range(count)]
+    rows.extend(collections.OrderedDict([
+        ("object_type", "OrgGroup"),
+        ("code", "{}-org-group-{}".format(prefix, i)),
+        ("title", "{} Org Group {}".format(prefix, i)),
+        ("Admin", self.emails[i]),
+        ("map:market", self.slugs[i]),
+    ]) for i in range(count))
+    with QueryCounter() as counter:
+      response = self.import_data(*rows)
+    self.check_import_errors(response)
+    self.assertEqual([block["created"] for block in response], [count, count])
+    return len([
+        query for query in counter.queries
+        if "WHERE" in query and any(column in query.split("WHERE", 1)[1]
+                                    for column in self.LOOKUP_COLUMNS)
+    ])
+
+  def test_lookups_per_block(self):
+    """Test lookup queries do not depend on the number of rows."""
+    small = self._import_lookups(2, "small")
+    large = self._import_lookups(6, "large")
+    self.assertEqual(small, large)
+    # People and markets are fetched at most once per block and column.
+    self.assertLessEqual(large, 4)
+
+  def test_labels(self):
+    """Test labels are fetched once and new labels are created once."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      factories.LabelFactory(name="Existing", object_type="Assessment")
+    rows = [collections.OrderedDict([
+        ("object_type", "Assessment"),
+        ("Code*", ""),
+        ("Audit", audit.slug),
+        ("Assignees", self.emails[0]),
+        ("Creators", self.emails[0]),
+        ("Title", "Assessment {}".format(i)),
+        ("Labels", "existing, New label"),
+    ]) for i in range(3)]
+    with QueryCounter() as counter:
+      response = self.import_data(*rows)
+    self.check_import_errors(response)
+    label_queries = [
+        query for query in counter.queries
+        if "WHERE" in query and "labels.name" in query.split("WHERE", 1)[1]
+    ]
+    self.assertEqual(len(label_queries), 1)
+    labels = models.Label.query.filter_by(
+        object_type="Assessment"
+    ).all()
+    self.assertItemsEqual([label.name for label in labels],
+                          ["Existing", "New label"])
+    for assessment in models.Assessment.query:
+      self.assertItemsEqual([label.name for label in assessment.labels],
+                            ["Existing", "New label"])
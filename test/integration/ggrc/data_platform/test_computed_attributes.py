@@ -3,10 +3,16 @@
 
 """Test last assessment module."""
 
+import datetime
 
+import mock
+
+from ggrc import db
 from ggrc.data_platform import computed_attributes
+from ggrc.models import all_models
 
 from integration.ggrc import TestCase
+from integration.ggrc.models import factories
 
 
 class TestComputedAttributes(TestCase):
@@ -27,3 +33,66 @@ class TestComputedAttributes(TestCase):
             ("Assessment", "last_comment"),
         }
     )
+
+
+class TestComputeAllAttributes(TestCase):
+  """Integration tests for full and resumed recompute of attributes."""
+
+  def setUp(self):
+    super(TestComputeAllAttributes, self).setUp()
+    with factories.single_commit():
+      assessment = factories.AssessmentFactory(
+          finished_date=datetime.datetime(2017, 2, 20, 13, 40, 0),
+          status="Completed",
+      )
+      control = factories.ControlFactory()
+      snapshots = self._create_snapshots(assessment.audit, [control])
+      factories.RelationshipFactory(
+          source=assessment,
+          destination=snapshots[0]
+      )
+    self.control_id = control.id
+    all_models.Attributes.query.delete()
+    db.session.commit()
+
+  def test_compute_all(self):
+    """Test values of all objects are computed and progress is stored."""
+    computed_attributes.compute_all_attributes()
+    # One entry for control and one for the control snapshot.
+    self.assertEqual(all_models.Attributes.query.count(), 2)
+    progress = computed_attributes.ComputedAttributesProgress.query.all()
+    self.assertEqual(len(progress), 3)
+    self.assertEqual(
+        {record.status for record in progress},
+        {computed_attributes.ComputedAttributesProgress.DONE},
+    )
+
+  def test_resume(self):
+    """Test resumed run continues after the last computed id."""
+    attributes = computed_attributes.load_computed_attributes()
+    progress = computed_attributes.create_progress(attributes)
+    for record in progress:
+      record.last_id = self.control_id
+    db.session.commit()
+
+    computed_attributes.compute_all_attributes(resume=True)
+    self.assertEqual(all_models.Attributes.query.count(), 0)
+    self.assertEqual(computed_attributes.resume_progress(), [])
+
+  def test_chunked_revisions(self):
+    """Test objects affected by several revision chunks are computed once."""
+    revision_ids = [id_ for id_, in db.session.query(all_models.Revision.id)]
+    recompute_objects = mock.Mock(
+        wraps=computed_attributes.recompute_objects,
+    )
+    with mock.patch.multiple(computed_attributes, CA_CHUNK_SIZE=1,
+                             recompute_objects=recompute_objects):
+      computed_attributes.compute_attributes(revision_ids)
+    self.assertEqual(all_models.Attributes.query.count(), 2)
+    computed = [
+        obj
+        for call in recompute_objects.call_args_list
+        for objects in call[0][0].itervalues()
+        for obj in objects
+    ]
+    self.assertEqual(len(computed), len(set(computed)))
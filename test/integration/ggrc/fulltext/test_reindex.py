@@ -41,3 +41,32 @@ class TestReindex(TestCase):
 
     # Check that all Assessment.archived were properly reindexed
     self.assertEqual(archived_index.count(), obj_count)
+
+  def test_diff_records(self):
+    """Test only changed records are written on reindex."""
+    with factories.single_commit():
+      control = factories.ControlFactory(title="old title")
+    control_id = control.id
+    updated_at = control.updated_at
+    control.__class__.bulk_record_update_for([control_id])
+    records = mysql.MysqlRecordProperty.query.filter(
+        mysql.MysqlRecordProperty.type == "Control",
+        mysql.MysqlRecordProperty.key == control_id,
+    )
+    records_count = records.count()
+
+    inserted, updated, deleted = control.__class__.diff_records([control_id])
+    self.assertEqual((inserted, updated, deleted), (0, 0, 0))
+
+    control.__class__.query.filter_by(id=control_id).update({
+        "title": "new title",
+        "updated_at": updated_at,
+    })
+    inserted, updated, deleted = control.__class__.diff_records([control_id])
+    self.assertEqual((inserted, updated, deleted), (0, 1, 0))
+    self.assertEqual(records.count(), records_count)
+    self.assertEqual(
+        records.filter(mysql.MysqlRecordProperty.property == "title").one()
+        .content,
+        "new title",
+    )
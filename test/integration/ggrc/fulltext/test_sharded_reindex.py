@@ -0,0 +1,79 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for sharded full reindex."""
+
+import mock
+
+from ggrc import db
+from ggrc.fulltext import reindex
+from ggrc.fulltext.mysql import MysqlRecordProperty
+from ggrc.models import all_models
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestShardedReindex(TestCase):
+  """Tests for sharded full reindex."""
+
+  def setUp(self):
+    super(TestShardedReindex, self).setUp()
+    with factories.single_commit():
+      self.market_ids = [factories.MarketFactory().id for _ in range(5)]
+
+  @staticmethod
+  def _market_records():
+    """Get query for fulltext records of markets."""
+    return MysqlRecordProperty.query.filter(
+        MysqlRecordProperty.type == "Market"
+    )
+
+  def test_create_shards(self):
+    """Test ids of every model are split into shards of given size."""
+    shards = reindex.create_shards(shard_size=2)
+    market_shards = [(shard.min_id, shard.max_id) for shard in shards
+                     if shard.model_name == "Market"]
+    ids = sorted(self.market_ids)
+    self.assertEqual(
+        market_shards,
+        [(ids[0], ids[1]), (ids[2], ids[3]), (ids[4], ids[4])],
+    )
+    self.assertEqual(shards[-1].model_name, reindex.SNAPSHOT_STEP)
+
+  def test_reindex_shard(self):
+    """Test shard reindex stores progress and runs final step once."""
+    shards = reindex.create_shards(shard_size=2)
+    shard_ids = [shard.id for shard in shards]
+    self._market_records().delete()
+    db.session.commit()
+    on_finish = mock.MagicMock()
+
+    for shard_id in shard_ids:
+      reindex.reindex_shard(shard_id, chunk_size=1, on_finish=on_finish)
+
+    self.assertEqual(on_finish.call_count, 1)
+    self.assertEqual(
+        {record.key for record in self._market_records()},
+        set(self.market_ids),
+    )
+    for shard in all_models.ReindexShard.query:
+      self.assertEqual(shard.status, all_models.ReindexShard.DONE)
+      if shard.model_name == "Market":
+        self.assertEqual(shard.last_id, shard.max_id)
+        self.assertGreater(shard.objects_count, 0)
+
+  def test_resume(self):
+    """Test resumed shard continues from the last checkpoint."""
+    shards = reindex.create_shards(shard_size=10)
+    shard = [shard for shard in shards if shard.model_name == "Market"][0]
+    ids = sorted(self.market_ids)
+    shard.last_id = ids[2]
+    shard.status = all_models.ReindexShard.RUNNING
+    db.session.commit()
+
+    resumed = reindex.resume_shards()
+    self.assertIn(shard.id, [resumed_shard.id for resumed_shard in resumed])
+    with mock.patch.object(all_models.Market,
+                           "bulk_record_update_for") as update_mock:
+      reindex.reindex_shard(shard.id, chunk_size=10)
+    update_mock.assert_called_once_with(ids[3:])
@@ -303,3 +303,31 @@ class TestIssueIntegration(ggrc.TestCase):
           primary_contacts_emails,
           [second_assignee.email, new_assignee.email, ]
       )
+
+  def test_sync_skips_unchanged(self):
+    """Test unchanged tickets are not applied to unchanged Issues again."""
+    iti = factories.IssueTrackerIssueFactory(
+        enabled=True,
+        issue_id="1",
+        issue_tracked_obj=factories.IssueFactory(status="Draft")
+    )
+    batches = [{
+        "1": {
+            "status": "accepted",
+            "type": "BUG",
+            "priority": "P2",
+            "severity": "S2",
+        }
+    }]
+
+    with mock.patch.object(sync_utils, "iter_issue_batches",
+                           side_effect=lambda *_, **__: iter(batches)):
+      first_stats = issue_sync_job.sync_issue_attributes()
+      second_stats = issue_sync_job.sync_issue_attributes()
+
+    self.assertEqual(first_stats["updated"], 1)
+    self.assertEqual(second_stats["skipped"], 1)
+    self.assertEqual(second_stats["updated"], 0)
+    iti = all_models.IssuetrackerIssue.query.get(iti.id)
+    self.assertIsNotNone(iti.local_fingerprint)
+    self.assertIsNotNone(iti.remote_fingerprint)
@@ -8,6 +8,7 @@
 # Disable protected access since this test suite tests internal function for
 # ACL propagation.
 
+import collections
 import itertools
 from collections import defaultdict
 from collections import OrderedDict
@@ -413,6 +414,119 @@ class TestPropagation(BaseTestPropagation):
         # 6 for normal object documents
     )
 
+  def test_propagation_metrics(self):
+    """Test propagation returns metrics for every propagation step."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      assessment = factories.AssessmentFactory(audit=audit)
+      factories.RelationshipFactory(source=audit.program, destination=audit)
+      factories.RelationshipFactory(source=audit, destination=assessment)
+
+    acl_ids = [acl.id for acl in audit.program._access_control_list]
+
+    steps = propagation._propagate(acl_ids, self.user_id)
+
+    self.assertEqual([step.depth for step in steps], range(len(steps)))
+    # Program Managers, Program Editors and Program Readers propagate.
+    self.assertEqual(steps[0].parent_count, 3)
+    propagated_count = all_models.AccessControlList.query.filter(
+        all_models.AccessControlList.parent_id.isnot(None)
+    ).count()
+    # 3 roles propagated to audit, assessment and 2 relationships
+    self.assertEqual(propagated_count, 3 * 4)
+    self.assertEqual(
+        sum(step.inserted_count for step in steps),
+        propagated_count,
+    )
+
+  def test_propagation_graph(self):
+    """Test role propagation graph built from access control roles."""
+    graph = propagation.get_propagation_graph()
+    self.assertIn(self.roles["Program"]["Program Editors"].id,
+                  graph.propagating_role_ids)
+    self.assertTrue(graph.is_propagated_relationship("Audit", "Program"))
+    self.assertTrue(graph.is_propagated_relationship("Program", "Audit"))
+    self.assertFalse(graph.is_propagated_relationship("Person", "Person"))
+    self.assertIs(propagation.get_propagation_graph(), graph)
+
+  def test_propagation_graph_changes(self):
+    """Test role propagation graph is rebuilt after roles change."""
+    graph = propagation.get_propagation_graph()
+    parent_role = factories.AccessControlRoleFactory(object_type="Control")
+    parent_id = parent_role.id
+    new_graph = propagation.get_propagation_graph()
+    self.assertIsNot(new_graph, graph)
+    self.assertNotIn(parent_id, new_graph.propagating_role_ids)
+
+    factories.AccessControlRoleFactory(
+        object_type="Relationship",
+        parent_id=parent_id,
+    )
+    self.assertIn(parent_id,
+                  propagation.get_propagation_graph().propagating_role_ids)
+
+  def test_skip_non_propagated_relationship(self):
+    """Test relationships without propagation rules are skipped."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      relationship = factories.RelationshipFactory(
+          source=audit,
+          destination=audit.program,
+      )
+      person_relationship = factories.RelationshipFactory(
+          source=factories.PersonFactory(),
+          destination=factories.PersonFactory(),
+      )
+
+    steps = propagation._propagate_relationships(
+        [person_relationship.id], [], self.user_id
+    )
+    self.assertEqual(steps, [])
+    steps = propagation._propagate_relationships(
+        [relationship.id, person_relationship.id], [], self.user_id
+    )
+    self.assertEqual(steps[0].parent_count, 1)
+    self.assertEqual(all_models.AccessControlList.query.count(), 13)
+
+  def test_propagate_all_checkpoint(self):
+    """Test propagate_all resumes after the stored checkpoint."""
+    with factories.single_commit():
+      audits = [factories.AuditFactory() for _ in range(2)]
+      for audit in audits:
+        factories.RelationshipFactory(source=audit, destination=audit.program)
+    checkpoint = ("Program", audits[0].program.id)
+    task = all_models.BackgroundTask(
+        name="propagate_acl",
+        payload={"propagate_all_checkpoint": checkpoint},
+    )
+    db.session.add(task)
+    db.session.commit()
+    propagated = all_models.AccessControlList.query.filter(
+        all_models.AccessControlList.parent_id.isnot(None),
+    )
+
+    with app.app.app_context():
+      propagation.propagate_all(task)
+    self.assertEqual(
+        {acl.object_id for acl in propagated.filter_by(object_type="Audit")},
+        {audits[1].id},
+    )
+    task = all_models.BackgroundTask.query.get(task.id)
+    self.assertEqual(
+        tuple(task.payload["propagate_all_checkpoint"]),
+        ("Program", audits[1].program.id),
+    )
+
+  def test_chunk_by_object(self):
+    """Test ACL entries of one object are never split between chunks."""
+    row = collections.namedtuple("Row", ["id", "object_type", "object_id"])
+    rows = [row(i, "Control", i // 3) for i in range(10)]
+    chunks = list(propagation._chunk_by_object(rows, chunk_size=4))
+    self.assertEqual(
+        [[r.id for r in chunk] for chunk in chunks],
+        [[0, 1, 2, 3, 4, 5], [6, 7, 8, 9]],
+    )
+
 
 class TestPropagationViaImport(BaseTestPropagation):
   """Test case for import propagation scenarios."""
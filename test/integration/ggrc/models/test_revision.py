@@ -6,7 +6,11 @@ import ddt
 import mock
 
 import ggrc.models
+from ggrc import db
 from ggrc.models import all_models
+from ggrc.models import types
+from ggrc.utils import QueryCounter
+from ggrc.utils import revisions as revision_utils
 import integration.ggrc.generator
 from integration.ggrc import TestCase
 
@@ -387,3 +391,60 @@ class TestRevisions(TestCase):
     }
 
     self.assertEqual(review, expected)
+
+  def test_populate_many(self):
+    """Test content of revisions is populated with shared queries."""
+    with factories.single_commit():
+      controls = [factories.ControlFactory() for _ in range(3)]
+      for control in controls:
+        factories.CustomAttributeDefinitionFactory(
+            title="local cad",
+            definition_type="control",
+            definition_id=control.id,
+            attribute_type="Text",
+        )
+    control_ids = [control.id for control in controls]
+    expected = {
+        revision.resource_id: revision.content
+        for revision in all_models.Revision.query.filter(
+            all_models.Revision.resource_type == "Control",
+            all_models.Revision.resource_id.in_(control_ids),
+        )
+    }
+    revisions = all_models.Revision.query.filter(
+        all_models.Revision.resource_type == "Control",
+        all_models.Revision.resource_id.in_(control_ids),
+    ).all()
+    with QueryCounter() as counter:
+      all_models.Revision.populate_many(revisions)
+      populate_queries = counter.get
+      for revision in revisions:
+        self.assertEqual(revision.content, expected[revision.resource_id])
+      self.assertEqual(counter.get, populate_queries)
+    self.assertLessEqual(populate_queries, 3)
+
+  def test_content_memo_reset(self):
+    """Test memoized content is rebuilt when saved content is replaced."""
+    control = factories.ControlFactory()
+    revision = _get_revisions(control)[0]
+    self.assertIs(revision.content, revision.content)
+    # pylint: disable=protected-access
+    new_content = dict(revision._content, title="new title")
+    revision.content = new_content
+    self.assertEqual(revision.content["title"], "new title")
+
+  def test_compress_revisions(self):
+    """Test plain Json revision content is compressed by the job."""
+    control = factories.ControlFactory()
+    expected = _get_revisions(control)[0].content
+    revision_id = _get_revisions(control)[0].id
+    self.assertGreater(revision_utils.compress_revisions(chunk_size=2), 0)
+    self.assertEqual(revision_utils.compress_revisions(chunk_size=2), 0)
+
+    db.session.expire_all()
+    revision = all_models.Revision.query.get(revision_id)
+    # pylint: disable=protected-access
+    self.assertTrue(
+        revision._raw_content.startswith(types.COMPRESSED_JSON_PREFIX)
+    )
+    self.assertEqual(revision.content, expected)
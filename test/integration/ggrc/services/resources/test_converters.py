@@ -23,6 +23,7 @@ from google.appengine.ext import deferred
 
 from ggrc import db
 from ggrc.models import all_models
+from ggrc.views import converters as views_converters
 
 from integration.ggrc import api_helper
 from integration.ggrc.models import factories
@@ -249,6 +250,41 @@ class TestImportExports(TestCase):
         headers=self.headers)
     self.assert200(response)
 
+  @mock.patch("ggrc.converters.base.ExportConverter.CSV_CHUNK_SIZE", 100)
+  def test_export_stored_in_parts(self):
+    """Test export content is stored in parts and downloaded as a whole."""
+    user = all_models.Person.query.first()
+    with factories.single_commit():
+      assessments = [factories.AssessmentFactory() for _ in range(5)]
+    objects = [{
+        "object_name": "Assessment",
+        "ids": [assessment.id for assessment in assessments],
+        "fields": ["slug", "title"],
+    }]
+    ie1 = factories.ImportExportFactory(
+        job_type="Export",
+        status="In Progress",
+        created_at=datetime.now(),
+        created_by=user,
+        title="test.csv",
+    )
+    ie_id = ie1.id
+    with mock.patch("ggrc.views.converters.check_for_previous_run"):
+      views_converters.run_export(objects, ie_id, user.id, "", [])
+
+    ie1 = all_models.ImportExport.query.get(ie_id)
+    self.assertEqual(ie1.status, "Finished")
+    self.assertIsNone(ie1.content)
+    self.assertGreater(ie1.parts.count(), 1)
+
+    response = self.client.get(
+        "/api/people/{}/exports/{}/download?export_to=csv".format(
+            user.id, ie_id),
+        headers=self.headers)
+    self.assert200(response)
+    for assessment in assessments:
+      self.assertIn(assessment.slug, response.data)
+
   @ddt.data("Import", "Export")
   def test_download(self, job_type):
     """Test imports/exports download"""
@@ -0,0 +1,129 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for materialized object counters of people."""
+
+from ggrc import db
+from ggrc.models import all_models
+from ggrc.query import person_counters
+
+from integration.ggrc.models import factories
+from integration.ggrc.services import TestCase
+
+
+class TestPersonCounters(TestCase):
+  """Tests for stored My Work counters and their invalidation."""
+
+  def setUp(self):
+    super(TestPersonCounters, self).setUp()
+    self.client.get("/login")
+    self.user = all_models.Person.query.first()
+    self.user_id = self.user.id
+
+  def _get_stored(self):
+    """Get stored counters of the current version of the user."""
+    return person_counters.PersonObjectCounter.query.filter_by(
+        person_id=self.user_id,
+        version=person_counters.get_version(self.user_id),
+    ).all()
+
+  def _get_stored_ids(self, type_="Control"):
+    """Get stored ids of the current version of the user."""
+    query = person_counters.PersonObjectCounterId.query.filter_by(
+        person_id=self.user_id,
+        object_type=type_,
+        version=person_counters.get_version(self.user_id),
+    )
+    return [counter_id.object_id for counter_id in query]
+
+  def _get_my_work_count(self, type_="Control"):
+    response = self.client.get(
+        "/api/people/{}/my_work_count".format(self.user_id)
+    )
+    self.assert200(response)
+    return response.json[type_]
+
+  def _add_control(self):
+    with factories.single_commit():
+      control = factories.ControlFactory()
+      control.add_person_with_role_name(
+          all_models.Person.query.get(self.user_id), "Admin",
+      )
+    return control
+
+  def test_counters_stored(self):
+    """Test counters are built on the first read and stored."""
+    self._add_control()
+    self.assertEqual(self._get_stored(), [])
+    self.assertEqual(self._get_my_work_count(), 1)
+    stored = {counter.object_type for counter in self._get_stored()}
+    self.assertIn("Control", stored)
+    self.assertIn(person_counters.TASK_TYPE, stored)
+    self.assertEqual(len(self._get_stored_ids()), 1)
+
+  def test_acl_changes(self):
+    """Test new and deleted ACL people invalidate counters."""
+    self._add_control()
+    self.assertEqual(self._get_my_work_count(), 1)
+    control = self._add_control()
+    self.assertEqual(self._get_stored(), [])
+    self.assertEqual(self._get_my_work_count(), 2)
+
+    db.session.delete(all_models.Control.query.get(control.id))
+    db.session.commit()
+    self.assertEqual(self._get_stored(), [])
+    self.assertEqual(self._get_my_work_count(), 1)
+
+  def test_other_people_counters(self):
+    """Test changes of other people do not invalidate counters."""
+    self._get_my_work_count()
+    with factories.single_commit():
+      control = factories.ControlFactory()
+      control.add_person_with_role_name(factories.PersonFactory(), "Admin")
+    self.assertNotEqual(self._get_stored(), [])
+
+  def test_check(self):
+    """Test consistency check finds and deletes outdated counters."""
+    self._add_control()
+    self._get_my_work_count()
+    self.assertEqual(person_counters.check(), [])
+
+    db.session.add(person_counters.PersonObjectCounterId(
+        person_id=self.user_id,
+        object_type="Control",
+        object_id=0,
+        version=person_counters.get_version(self.user_id),
+    ))
+    db.session.commit()
+    self.assertEqual(person_counters.check(fix=True), [self.user_id])
+    self.assertEqual(self._get_stored(), [])
+    self.assertEqual(self._get_my_work_count(), 1)
+
+  def test_deleted_ids_removed(self):
+    """Test ids of deleted objects are removed from stored counters."""
+    control = self._add_control()
+    other_control = self._add_control()
+    self.assertEqual(self._get_my_work_count(), 2)
+    person_counters.remove_objects({"Control": {control.id}})
+    db.session.commit()
+    self.assertEqual(self._get_stored_ids(), [other_control.id])
+    self.assertEqual(self._get_my_work_count(), 1)
+
+  def test_outdated_counters_not_stored(self):
+    """Test counters built for an old version do not replace new ones."""
+    self._add_control()
+    self.assertEqual(self._get_my_work_count(), 1)
+    old_version = person_counters.get_version(self.user_id)
+    person_counters.invalidate({self.user_id})
+    db.session.commit()
+    self.assertEqual(self._get_stored(), [])
+    self.assertEqual(self._get_my_work_count(), 1)
+
+    person_counters.store_counters(
+        self.user_id,
+        {"Control": ([], 0, None), person_counters.TASK_TYPE: ([], 0, None)},
+        old_version,
+    )
+    db.session.commit()
+    self.assertEqual(len(self._get_stored_ids()), 1)
+    self.assertEqual(self._get_my_work_count(), 1)
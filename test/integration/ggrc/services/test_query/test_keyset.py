@@ -0,0 +1,90 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests keyset pagination for /query api and collection endpoints."""
+
+import json
+
+import ddt
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+from integration.ggrc.query_helper import WithQueryApi
+
+
+@ddt.ddt
+class TestKeysetPagination(TestCase, WithQueryApi):
+  """Tests for cursor based pagination."""
+
+  def setUp(self):
+    super(TestKeysetPagination, self).setUp()
+    self.client.get("/login")
+    with factories.single_commit():
+      # duplicate titles and empty descriptions check ties and NULL values
+      for idx in range(8):
+        factories.MarketFactory(
+            title="market {}".format(idx // 2),
+            description="description {}".format(idx) if idx % 3 else None,
+        )
+
+  def _query_page(self, order_by, cursor, **kwargs):
+    """Get a page of market ids with keyset pagination."""
+    query = self._make_query_dict("Market", type_="ids", order_by=order_by)
+    query.update(cursor=cursor, page_size=3, **kwargs)
+    return self._get_first_result_set(query, "Market")
+
+  @ddt.data(
+      [{"name": "title"}],
+      [{"name": "title", "desc": True}],
+      [{"name": "description"}, {"name": "title", "desc": True}],
+      [{"name": "description", "desc": True}],
+      None,
+  )
+  def test_pages(self, order_by):
+    """Test all pages match ordered query result for {0}."""
+    expected = self._get_first_result_set(
+        self._make_query_dict("Market", type_="ids", order_by=order_by),
+        "Market", "ids",
+    )
+    ids = []
+    cursor = None
+    for _ in range(len(expected)):
+      result = self._query_page(order_by, cursor)
+      ids.extend(result["ids"])
+      cursor = result["next_cursor"]
+      if not cursor:
+        break
+    self.assertEqual(ids, expected)
+    self.assertIsNone(result["total"])
+
+  def test_total(self):
+    """Test total count is returned only if requested."""
+    result = self._query_page(None, None, with_total=True)
+    self.assertEqual(result["total"], 8)
+    self.assertEqual(result["count"], 3)
+
+  def test_invalid_cursor(self):
+    """Test cursor of another order is rejected."""
+    cursor = self._query_page([{"name": "title"}], None)["next_cursor"]
+    query = self._make_query_dict("Market", type_="ids",
+                                  order_by=[{"name": "description"}])
+    query.update(cursor=cursor, page_size=3)
+    self.assert400(self._post(query))
+
+  def test_collection_cursor(self):
+    """Test collection endpoint pages with __cursor."""
+    ids = []
+    url = "/api/markets?__cursor=&__page_size=3"
+    while url:
+      response = self.client.get(url)
+      self.assert200(response)
+      collection = json.loads(response.data)["markets_collection"]
+      ids.extend(market["id"] for market in collection["markets"])
+      url = collection["paging"].get("next")
+    self.assertEqual(len(ids), 8)
+    self.assertEqual(ids, sorted(ids))
+
+  def test_collection_cursor_limit(self):
+    """Test collection endpoint rejects __limit with __cursor."""
+    response = self.client.get("/api/markets?__cursor=&__limit=2")
+    self.assert400(response)
@@ -4,8 +4,10 @@
 """Tests for relevant operator."""
 
 import ddt
+import mock
 
 from ggrc.models import all_models
+from ggrc.models import relationship_helper
 
 from integration.ggrc import TestCase
 from integration.ggrc.query_helper import WithQueryApi
@@ -128,3 +130,33 @@ class TestRelevant(TestCase, WithQueryApi):
     self.assertIn(evidence1_id, ids)
     self.assertIn(evidence2_id, ids)
     self.assertNotIn(evidence3_id, ids)
+
+  def test_shared_relevant_filter(self):
+    """Relevant filter shared by object queries is evaluated once."""
+    audit = all_models.Audit.query.first()
+    relevant = {
+        "object_name": "Audit",
+        "op": {"name": "relevant"},
+        "ids": [audit.id, audit.id],
+    }
+    title_filter = {"left": "title", "op": {"name": "!="}, "right": "x"}
+    queries = [{
+        "object_name": "Assessment",
+        "type": "ids",
+        "filters": {"expression": expression},
+    } for expression in (
+        relevant,
+        dict(relevant, ids=[audit.id]),
+        {"op": {"name": "AND"}, "left": title_filter, "right": relevant},
+        {"op": {"name": "AND"}, "left": relevant, "right": title_filter},
+    )]
+    with mock.patch.object(
+        relationship_helper, "get_ids_related_to",
+        wraps=relationship_helper.get_ids_related_to,
+    ) as get_related:
+      response = self._post(queries)
+    self.assert200(response)
+    self.assertEqual(get_related.call_count, 1)
+    results = [result["Assessment"]["ids"] for result in response.json]
+    self.assertEqual(len(results[0]), 1)
+    self.assertTrue(all(ids == results[0] for ids in results))
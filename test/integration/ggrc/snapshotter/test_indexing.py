@@ -11,6 +11,7 @@ from ggrc import db
 from ggrc import models
 from ggrc.models import all_models
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
+from ggrc.snapshotter import indexer
 from ggrc.snapshotter.indexer import delete_records
 
 from integration.ggrc.snapshotter import SnapshotterBaseTestCase
@@ -642,3 +643,21 @@ class TestSnapshotIndexing(SnapshotterBaseTestCase):
     self.assert_indexed_fields(snapshot, "kind", {
         "": option_title
     })
+
+  def test_metadata_cache(self):
+    """Test CADs and options are reloaded only after they change."""
+    cads, options = indexer.get_metadata()
+    self.assertIs(indexer.get_metadata()[0], cads)
+
+    with factories.single_commit():
+      cad = factories.CustomAttributeDefinitionFactory(
+          definition_type="control",
+          title="new cad",
+      )
+      option = factories.OptionFactory()
+      cad_id, option_id = cad.id, option.id
+    new_cads, new_options = indexer.get_metadata()
+    self.assertIsNot(new_cads, cads)
+    self.assertNotIn(option_id, options)
+    self.assertIn(option_id, new_options)
+    self.assertIn(cad_id, [cad_info.id for cad_info in new_cads["Control"]])
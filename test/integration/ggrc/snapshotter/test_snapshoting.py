@@ -9,6 +9,7 @@ import sqlalchemy as sa
 
 from ggrc import db
 import ggrc.models as models
+from ggrc.models import types
 from ggrc.snapshotter.rules import Types
 
 from integration.ggrc.models import factories
@@ -141,7 +142,9 @@ class TestSnapshoting(SnapshotterBaseTestCase):
     )
 
     self.assertEqual(snapshot_revision.count(), 1)
-    snapshot_revision_content = snapshot_revision.first()[2]
+    snapshot_revision_content = types.decode_json(
+        snapshot_revision.first()[2]
+    )
     self.assertEqual(snapshot_revision_content["child_type"], "Control")
     self.assertEqual(snapshot_revision_content["child_id"], control.id)
 
@@ -287,7 +290,8 @@ class TestSnapshoting(SnapshotterBaseTestCase):
     audit = db.session.query(models.Audit).filter(
         models.Audit.title.like("%Snapshotable audit%")).one()
 
-    revision = db.session.query(
+    # Revision content can be compressed, so it is matched after decoding.
+    revisions = db.session.query(
         models.Revision.id,
         models.Revision.resource_type,
         models.Revision.resource_id,
@@ -295,8 +299,10 @@ class TestSnapshoting(SnapshotterBaseTestCase):
     ).filter(
         models.Revision.resource_type == control.type,
         models.Revision.resource_id == control.id,
-        models.Revision._content.like("%Test Control Snapshot 1 EDIT 2%"),
-    ).one()
+    )
+    title = "Test Control Snapshot 1 EDIT 2"
+    revision, = [rev for rev in revisions
+                 if types.decode_json(rev[3])["title"] == title]
 
     audit = self.refresh_object(audit)
     self.api.modify_object(audit, {
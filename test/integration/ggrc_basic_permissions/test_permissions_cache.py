@@ -0,0 +1,96 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for versioned permissions cache."""
+# pylint: disable=unused-import
+from ggrc.app import app  # NOQA
+
+import ggrc_basic_permissions
+from ggrc.cache import utils as cache_utils
+from ggrc.models import all_models
+from ggrc.models.cache import Cache
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+from appengine import base
+
+
+@base.with_memcache
+class TestPermissionsCache(TestCase):
+  """Tests for permissions cache invalidation."""
+
+  def setUp(self):
+    super(TestPermissionsCache, self).setUp()
+    with factories.single_commit():
+      self.people = [factories.PersonFactory() for _ in range(2)]
+    for person in self.people:
+      ggrc_basic_permissions.load_permissions_for(person)
+
+  def _is_cached(self, person):
+    """Check if permissions of the person are cached."""
+    _, _, permissions = ggrc_basic_permissions.query_memcache(person.id)
+    return permissions is not None
+
+  def test_cache_hit(self):
+    """Test cached permissions are returned on the second load."""
+    stats = ggrc_basic_permissions.PERMISSION_CACHE_STATS
+    hits = stats["hits"]
+    permissions = ggrc_basic_permissions.load_permissions_for(self.people[0])
+    self.assertEqual(stats["hits"], hits + 1)
+    self.assertIn("__GGRC_ADMIN__", permissions)
+
+  def test_clear_user_permissions(self):
+    """Test only permissions of the given user are invalidated."""
+    cache_utils.clear_users_permission_cache([self.people[0].id])
+    self.assertFalse(self._is_cached(self.people[0]))
+    self.assertTrue(self._is_cached(self.people[1]))
+
+  def test_clear_all_permissions(self):
+    """Test permissions of all users are invalidated."""
+    cache_utils.clear_permission_cache()
+    self.assertFalse(self._is_cached(self.people[0]))
+    self.assertFalse(self._is_cached(self.people[1]))
+
+  def test_acl_person_changes(self):
+    """Test new ACL person invalidates only that person's permissions."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      audit.add_person_with_role_name(self.people[0], "Auditors")
+    acp = all_models.AccessControlPerson.query.filter_by(
+        person_id=self.people[0].id
+    ).one()
+    modified_objects = Cache()
+    modified_objects.new[acp] = acp.log_json()
+
+    changes = cache_utils.collect_permission_changes(modified_objects)
+    self.assertFalse(changes.clear_all)
+    self.assertEqual(changes.user_ids, {self.people[0].id})
+
+    cache_utils.invalidate_permission_cache(changes)
+    self.assertFalse(self._is_cached(self.people[0]))
+    self.assertTrue(self._is_cached(self.people[1]))
+
+  def test_relationship_changes(self):
+    """Test new relationship affects people with propagated roles."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      audit.add_person_with_role_name(self.people[0], "Auditors")
+      assessment = factories.AssessmentFactory(audit=audit)
+    relationship = factories.RelationshipFactory(
+        source=audit,
+        destination=assessment,
+    )
+    changes = cache_utils.PermissionChanges()
+    changes.add(relationship)
+    changes.load_user_ids()
+    self.assertIn(self.people[0].id, changes.user_ids)
+    self.assertNotIn(self.people[1].id, changes.user_ids)
+
+  def test_role_changes(self):
+    """Test role changes invalidate permissions of all users."""
+    modified_objects = Cache()
+    role = all_models.AccessControlRole.query.first()
+    modified_objects.dirty[role] = role.log_json()
+    changes = cache_utils.collect_permission_changes(modified_objects)
+    self.assertTrue(changes.clear_all)
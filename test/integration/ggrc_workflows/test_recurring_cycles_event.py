@@ -3,11 +3,14 @@
 
 """Tests single event creation during start_recurring_cycles job execution."""
 
+import mock
 from freezegun import freeze_time
 
 from ggrc import models
+import ggrc_workflows
 from ggrc_workflows import start_recurring_cycles, models as wf_models
 from integration.ggrc import TestCase
+from integration.ggrc.models import factories
 from integration.ggrc_workflows import WorkflowsGenerator
 
 
@@ -72,3 +75,88 @@ class TestRecurringCyclesEvent(TestCase):
     self.assertEqual(new_cycles_count, self.cycles_count)
     self.assertEqual(len(events), 0)
     self.assertEqual(new_revisions_count, revisions_count)
+
+
+class TestRecurringCyclesRelationships(TestCase):
+  """Tests relationships of cycle tasks started by start_recurring_cycles."""
+
+  def setUp(self):
+    super(TestRecurringCyclesRelationships, self).setUp()
+    wf_generator = WorkflowsGenerator()
+    self.control_id = factories.ControlFactory().id
+
+    with freeze_time('2018-01-17'):
+      _, workflow = wf_generator.generate_workflow(data={
+          'unit': 'week',
+          'repeat_every': 1
+      })
+      _, task_group = wf_generator.generate_task_group(workflow=workflow)
+      wf_generator.generate_task_group_task(task_group=task_group, data={
+          'start_date': '2018-01-17',
+          'end_date': '2018-01-17'
+      })
+      wf_generator.generate_task_group_object(
+          task_group=task_group,
+          obj=models.all_models.Control.query.get(self.control_id),
+      )
+      wf_generator.activate_workflow(workflow)
+
+  def test_cycle_task_relationships(self):
+    """Test relationships of started cycle tasks are created with revisions."""
+    with freeze_time('2018-01-24'):
+      start_recurring_cycles()
+
+    task = wf_models.CycleTaskGroupObjectTask.query.filter(
+        wf_models.CycleTaskGroupObjectTask.start_date == '2018-01-24'
+    ).one()
+    relationship = models.all_models.Relationship.query.filter(
+        models.all_models.Relationship.source_type == task.type,
+        models.all_models.Relationship.source_id == task.id,
+    ).one()
+    self.assertEqual(relationship.destination_type, "Control")
+    self.assertEqual(relationship.destination_id, self.control_id)
+    revisions = models.Revision.query.filter(
+        models.Revision.resource_type == "Relationship",
+        models.Revision.resource_id == relationship.id,
+    ).count()
+    self.assertEqual(revisions, 1)
+
+  def test_failed_workflow(self):
+    """Test ACLs of workflows started before a failure are propagated."""
+    wf_generator = WorkflowsGenerator()
+    with freeze_time('2018-01-17'):
+      _, workflow = wf_generator.generate_workflow(data={
+          'unit': 'week',
+          'repeat_every': 1
+      })
+      _, task_group = wf_generator.generate_task_group(workflow=workflow)
+      wf_generator.generate_task_group_task(task_group=task_group, data={
+          'start_date': '2018-01-17',
+          'end_date': '2018-01-17'
+      })
+      wf_generator.activate_workflow(workflow)
+    failed_id = workflow.id
+    start_workflow_cycles = ggrc_workflows._start_workflow_cycles
+
+    def start_or_fail(workflow, event):
+      if workflow.id == failed_id:
+        raise ValueError("Failed workflow")
+      return start_workflow_cycles(workflow, event)
+
+    with freeze_time('2018-01-24'):
+      with mock.patch("ggrc_workflows._start_workflow_cycles",
+                      side_effect=start_or_fail):
+        with self.assertRaises(ValueError):
+          start_recurring_cycles()
+
+    task = wf_models.CycleTaskGroupObjectTask.query.filter(
+        wf_models.CycleTaskGroupObjectTask.start_date == '2018-01-24'
+    ).one()
+    self.assertNotEqual(task.cycle.workflow_id, failed_id)
+    acl = models.all_models.AccessControlList
+    propagated = acl.query.filter(
+        acl.object_type == task.type,
+        acl.object_id == task.id,
+        acl.parent_id.isnot(None),
+    ).count()
+    self.assertGreater(propagated, 0)
@@ -0,0 +1,160 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for two tier object cache."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc.cache import object_cache
+
+
+class FakeMemcacheClient(object):
+  """Dict based memcache client counting its calls."""
+
+  def __init__(self):
+    self.data = {}
+    self.times = {}
+    self.calls = 0
+
+  def get_multi(self, keys):
+    self.calls += 1
+    return {key: self.data[key] for key in keys if key in self.data}
+
+  def add_multi(self, mapping, time=0):
+    # pylint: disable=redefined-outer-name
+    self.calls += 1
+    not_added = [key for key in mapping if key in self.data]
+    for key, value in mapping.iteritems():
+      if key not in self.data:
+        self.data[key] = value
+        self.times[key] = time
+    return not_added
+
+  def set_multi(self, mapping, time=0):
+    # pylint: disable=redefined-outer-name
+    self.calls += 1
+    self.data.update(mapping)
+    self.times.update(dict.fromkeys(mapping, time))
+    return []
+
+
+class TestLocalLRUCache(unittest.TestCase):
+  """Tests for LocalLRUCache."""
+
+  def test_eviction(self):
+    """Least recently used values are evicted."""
+    cache = object_cache.LocalLRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    self.assertEqual(cache.get("a"), 1)
+    self.assertIsNone(cache.get("b"))
+    self.assertEqual(cache.get("c"), 3)
+
+
+class TestObjectCache(unittest.TestCase):
+  """Tests for ObjectCache."""
+
+  KEYS = ["collection:controls:{}".format(i) for i in range(5)]
+
+  def setUp(self):
+    patcher = mock.patch("ggrc.cache.object_cache.LOCAL_CACHE",
+                         object_cache.LocalLRUCache(10))
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    self.client = FakeMemcacheClient()
+    cache = object_cache.ObjectCache(self.client)
+    cache.get_multi(self.KEYS)
+    cache.add_multi({
+        key: u'{{"id": "{}"}}'.format(key) for key in self.KEYS
+    })
+    self.client.calls = 0
+
+  def test_local_hits(self):
+    """Objects with unchanged version are read with a single call."""
+    result = object_cache.ObjectCache(self.client).get_multi(self.KEYS)
+    self.assertItemsEqual(result.keys(), self.KEYS)
+    self.assertEqual(self.client.calls, 1)
+
+  def test_memcache_hits(self):
+    """Objects missing in local cache are read with a second call."""
+    object_cache.LOCAL_CACHE.clear()
+    result = object_cache.ObjectCache(self.client).get_multi(self.KEYS)
+    self.assertItemsEqual(result.keys(), self.KEYS)
+    self.assertEqual(self.client.calls, 2)
+
+  def test_invalidated(self):
+    """Objects without version entry are skipped and can be added again."""
+    del self.client.data[self.KEYS[0]]
+    cache = object_cache.ObjectCache(self.client)
+    self.assertNotIn(self.KEYS[0], cache.get_multi(self.KEYS))
+    cache.add_multi({self.KEYS[0]: u"new"})
+    result = object_cache.ObjectCache(self.client).get_multi(self.KEYS[:1])
+    self.assertEqual(result, {self.KEYS[0]: u"new"})
+
+  def test_stale_data(self):
+    """Data entry with another version is not returned."""
+    object_cache.LOCAL_CACHE.clear()
+    self.client.data[self.KEYS[0]] += 1
+    result = object_cache.ObjectCache(self.client).get_multi(self.KEYS)
+    self.assertNotIn(self.KEYS[0], result)
+    self.assertEqual(len(result), len(self.KEYS) - 1)
+
+  def test_legacy_value(self):
+    """Values stored without version are replaced on add."""
+    self.client.data[self.KEYS[0]] = u'{"id": 1}'
+    cache = object_cache.ObjectCache(self.client)
+    self.assertNotIn(self.KEYS[0], cache.get_multi(self.KEYS[:1]))
+    cache.add_multi({self.KEYS[0]: u"new"})
+    result = object_cache.ObjectCache(self.client).get_multi(self.KEYS[:1])
+    self.assertEqual(result, {self.KEYS[0]: u"new"})
+
+  def test_ttl(self):
+    """Versions and data entries expire."""
+    self.assertEqual(
+        set(self.client.times.values()),
+        {object_cache.settings.OBJECT_CACHE_TTL},
+    )
+
+  def test_invalidated_while_loading(self):
+    """Objects invalidated after their version is read are not returned."""
+    del self.client.data[self.KEYS[0]]
+    cache = object_cache.ObjectCache(self.client)
+    cache.get_multi(self.KEYS[:1])
+    # Invalidation by a concurrent write after the version is reserved.
+    del self.client.data[self.KEYS[0]]
+    cache.add_multi({self.KEYS[0]: u"stale"})
+    result = object_cache.ObjectCache(self.client).get_multi(self.KEYS[:1])
+    self.assertEqual(result, {})
+
+  def test_not_reserved(self):
+    """Objects without a version read before loading are not added."""
+    del self.client.data[self.KEYS[0]]
+    object_cache.ObjectCache(self.client).add_multi({self.KEYS[0]: u"new"})
+    self.assertNotIn(self.KEYS[0], self.client.data)
+
+  def test_delete_op(self):
+    """Objects with writes in progress are neither returned nor added."""
+    del self.client.data[self.KEYS[0]]
+    self.client.data["DeleteOp:" + self.KEYS[0]] = {"status": "InProgress"}
+    self.client.data["DeleteOp:" + self.KEYS[1]] = {"status": "InProgress"}
+    cache = object_cache.ObjectCache(self.client)
+    result = cache.get_multi(self.KEYS)
+    self.assertItemsEqual(result.keys(), self.KEYS[2:])
+    cache.add_multi({self.KEYS[0]: u"new"})
+    self.assertNotIn(self.KEYS[0], self.client.data)
+
+  def test_stats(self):
+    """Hit counters are collected per resource type."""
+    object_cache.OBJECT_CACHE_STATS.clear()
+    object_cache.ObjectCache(self.client).get_multi(
+        self.KEYS + ["collection:markets:1"]
+    )
+    stats = object_cache.get_stats()
+    self.assertEqual(stats["controls"]["local_hits"], len(self.KEYS))
+    self.assertEqual(stats["controls"]["hit_ratio"], 1)
+    self.assertEqual(stats["markets"]["misses"], 1)
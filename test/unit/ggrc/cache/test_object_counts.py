@@ -0,0 +1,122 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for approximate object counts."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc.cache import object_counts
+
+
+class FakeMemcacheClient(object):
+  """Dict based memcache client."""
+
+  def __init__(self):
+    self.data = {}
+
+  def get_multi(self, keys):
+    return {key: self.data[key] for key in keys if key in self.data}
+
+  def add_multi(self, mapping, time=0):
+    # pylint: disable=unused-argument,redefined-outer-name
+    for key, value in mapping.iteritems():
+      self.data.setdefault(key, value)
+
+  def offset_multi(self, mapping):
+    for key, delta in mapping.iteritems():
+      if key in self.data:
+        self.data[key] = max(self.data[key] + delta, 0)
+
+
+def _model(name, count):
+  """Get model mock with the given name and query count."""
+  model = mock.MagicMock(__name__=name)
+  model.query.count.return_value = count
+  return model
+
+
+class Control(object):
+  pass
+
+
+class TestObjectCounts(unittest.TestCase):
+  """Tests for stored total and readable object counts."""
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    self.client = FakeMemcacheClient()
+    patcher = mock.patch("ggrc.cache.object_counts._get_client",
+                         return_value=self.client)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    self.models = [_model("Control", 3), _model("Risk", 2)]
+
+  def test_total_counts(self):
+    """Test total counts are queried once and then taken from memcache."""
+    expected = {"Control": 3, "Risk": 2}
+    self.assertEqual(object_counts.get_total_counts(self.models), expected)
+    self.assertEqual(object_counts.get_total_counts(self.models), expected)
+    for model in self.models:
+      self.assertEqual(model.query.count.call_count, 1)
+
+  @staticmethod
+  def _session():
+    """Session mock in the outermost transaction."""
+    return mock.MagicMock(
+        info={}, transaction=mock.Mock(nested=False, _parent=None),
+    )
+
+  def test_committed_changes(self):
+    """Test created and deleted objects change stored counts."""
+    object_counts.get_total_counts(self.models)
+    session = self._session()
+    session.new = {Control(), Control()}
+    session.deleted = {Control()}
+    object_counts._collect_deltas(session, None)
+    object_counts._apply_deltas(session)
+    self.assertEqual(object_counts.get_total_counts(self.models),
+                     {"Control": 4, "Risk": 2})
+    self.assertNotIn(object_counts.DELTAS_KEY, session.info)
+
+  def test_savepoint_changes(self):
+    """Test changes are applied on commit of the outermost transaction."""
+    object_counts.get_total_counts(self.models)
+    session = self._session()
+    session.new = {Control()}
+    session.deleted = set()
+    object_counts._collect_deltas(session, None)
+    outer_transaction = session.transaction
+    session.transaction = mock.Mock(nested=True, _parent=outer_transaction)
+    object_counts._apply_deltas(session)
+    object_counts._discard_deltas(session)
+    self.assertEqual(object_counts.get_total_counts(self.models)["Control"], 3)
+    session.transaction = outer_transaction
+    object_counts._apply_deltas(session)
+    self.assertEqual(object_counts.get_total_counts(self.models)["Control"], 4)
+
+  def test_rolled_back_changes(self):
+    """Test rolled back changes do not change stored counts."""
+    object_counts.get_total_counts(self.models)
+    session = self._session()
+    session.new = {Control()}
+    session.deleted = set()
+    object_counts._collect_deltas(session, None)
+    object_counts._discard_deltas(session)
+    object_counts._apply_deltas(session)
+    self.assertEqual(object_counts.get_total_counts(self.models)["Control"], 3)
+
+  @mock.patch("ggrc.rbac.permissions.has_system_wide_read",
+              return_value=False)
+  @mock.patch("ggrc.rbac.permissions.get_context_resource")
+  def test_readable_counts(self, get_context_resource, _):
+    """Test restricted counts are sizes of permission resource sets."""
+    get_context_resource.side_effect = lambda model_name, **_: {
+        "Control": ([], [1, 2, 2]),
+        "Risk": (None, None),
+    }[model_name]
+    self.assertEqual(object_counts.get_readable_counts(self.models),
+                     {"Control": 2, "Risk": 2})
+    self.models[0].query.count.assert_not_called()
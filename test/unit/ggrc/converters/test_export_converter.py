@@ -0,0 +1,73 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for chunked csv generation in ExportConverter."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc.converters.base import ExportConverter
+from ggrc.converters.import_helper import CsvStringBuilder
+
+
+class TestCsvStringBuilder(unittest.TestCase):
+  """Unit tests for CsvStringBuilder."""
+
+  def test_pop_csv_string(self):
+    """Test pop_csv_string empties the buffer."""
+    builder = CsvStringBuilder(2)
+    builder.append_line([u"a", u"b"])
+    self.assertEqual(builder.size, len("a,b\r\n"))
+    self.assertEqual(builder.pop_csv_string(), "a,b\r\n")
+    self.assertEqual(builder.size, 0)
+    builder.append_line([u"c"])
+    self.assertEqual(builder.pop_csv_string(), "c,\r\n")
+
+
+class TestExportConverterChunks(unittest.TestCase):
+  """Unit tests for ExportConverter.iter_csv_chunks."""
+
+  @staticmethod
+  def _block_converter(name, rows):
+    """Get mocked block converter with 2 columns."""
+    block_converter = mock.MagicMock()
+    block_converter.name = name
+    block_converter.block_width = 2
+    block_converter.generate_csv_header.side_effect = lambda: [
+        [u"desc 1", u"desc 2"],
+        [u"Title", u"Code"],
+    ]
+    block_converter.generate_row_data.side_effect = lambda: (
+        list(row) for row in rows
+    )
+    return block_converter
+
+  def setUp(self):
+    with mock.patch("ggrc.converters.base.get_exportables", return_value={}):
+      self.converter = ExportConverter(ids_by_type=[])
+    rows = [[u"title {}".format(i), u"CODE-{}".format(i)] for i in range(20)]
+    self.converter.block_converters = [
+        self._block_converter(u"Control", rows),
+        self._block_converter(u"Market", rows[:5]),
+    ]
+
+  def test_chunks_match_full_export(self):
+    """Joined chunks are equal to the whole csv string."""
+    full_csv = "".join(self.converter.iter_csv_chunks(10 ** 6))
+    chunks = list(self.converter.iter_csv_chunks(50))
+    self.assertGreater(len(chunks), 1)
+    self.assertEqual("".join(chunks), full_csv)
+    self.assertEqual(self.converter.build_csv_from_row_data(), full_csv)
+
+  def test_chunks_end_with_line(self):
+    """Every chunk contains only whole csv lines."""
+    for chunk in self.converter.iter_csv_chunks(50):
+      self.assertTrue(chunk.endswith("\r\n"))
+
+  def test_chunk_size(self):
+    """All chunks except the last one reach chunk size."""
+    chunks = list(self.converter.iter_csv_chunks(100))
+    for chunk in chunks[:-1]:
+      self.assertGreaterEqual(len(chunk), 100)
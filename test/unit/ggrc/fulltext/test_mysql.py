@@ -0,0 +1,59 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for fulltext index filters."""
+
+import unittest
+
+import mock
+from sqlalchemy.dialects import mysql as mysql_dialect
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc.fulltext import mysql
+
+
+def _compile(clause):
+  """Compile clause for MySQL."""
+  return clause.compile(dialect=mysql_dialect.dialect())
+
+
+@mock.patch("ggrc.settings.FULLTEXT_MIN_TOKEN_SIZE", 3)
+class TestFulltextFilter(unittest.TestCase):
+  """Tests for fulltext search filters."""
+
+  def test_search_tokens(self):
+    """Short words, stopwords and operators are skipped."""
+    self.assertEqual(
+        mysql.get_search_tokens(u"The +Audit* of ab (control-Audit)"),
+        [u"audit", u"control"],
+    )
+
+  @mock.patch("ggrc.settings.FULLTEXT_INVERTED_INDEX", True)
+  def test_match_filter(self):
+    """Indexed words are required as prefixes and checked with LIKE."""
+    compiled = _compile(mysql.get_content_filter(u"control aud"))
+    self.assertIn(
+        u"MATCH (fulltext_record_properties.content) AGAINST",
+        unicode(compiled),
+    )
+    self.assertIn(u"LIKE", unicode(compiled))
+    self.assertItemsEqual(
+        compiled.params.values(),
+        [u"+control* +aud*", u"control aud"],
+    )
+
+  @mock.patch("ggrc.settings.FULLTEXT_INVERTED_INDEX", True)
+  def test_no_indexed_words(self):
+    """Only LIKE is used for terms without indexed words."""
+    sql = unicode(_compile(mysql.get_content_filter(u"a b")))
+    self.assertNotIn(u"MATCH", sql)
+    self.assertIn(u"LIKE", sql)
+
+  @mock.patch("ggrc.settings.FULLTEXT_INVERTED_INDEX", False)
+  def test_index_disabled(self):
+    """Only LIKE is used if fulltext index is disabled."""
+    sql = unicode(_compile(mysql.get_content_filter(u"audit")))
+    self.assertNotIn(u"MATCH", sql)
+    self.assertNotIn(
+        u"MATCH", unicode(_compile(mysql.get_relevance_column(u"audit")))
+    )
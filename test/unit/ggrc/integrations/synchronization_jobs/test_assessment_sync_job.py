@@ -260,12 +260,13 @@ class BaseClientTest(unittest.TestCase):
         sync_utils,
         iter_issue_batches=mock.MagicMock(
             return_value=iter(batches)),
-        update_issue=mock.DEFAULT
-    ):
+        update_issue=mock.DEFAULT,
+        store_fingerprints=mock.DEFAULT,
+    ), mock.patch.object(assessment_sync_job, "db"):
       with mock.patch.object(sync_utils,
                              "collect_issue_tracker_info",
                              return_value=assessment_issues):
-        assessment_sync_job.sync_assessment_attributes()
+        stats = assessment_sync_job.sync_assessment_attributes()
         iter_calls = sync_utils.iter_issue_batches.call_args_list
         self.assertEqual(len(iter_calls), 1)
         self.assertItemsEqual(iter_calls[0][0][0], ['1', '2'])
@@ -277,6 +278,64 @@ class BaseClientTest(unittest.TestCase):
             'ccs': [],
             'component_id': None
         })
+        self.assertEqual(stats["compared"], 2)
+        self.assertEqual(stats["updated"], 1)
+
+  def test_sync_skips_unchanged(self):
+    """Tests tickets with unchanged fingerprints are not compared."""
+    issue_state = {
+        'status': 'In Review',
+        'type': 'BUG1',
+        'priority': 'P1',
+        'severity': 'S1',
+        'due_date': None,
+    }
+    ticket_state = {
+        'status': 'FIXED',
+        'type': 'BUG1',
+        'priority': 'P1',
+        'severity': 'S1',
+        'custom_fields': [],
+    }
+    issue_info = {
+        'object_id': 1,
+        'issuetracker_issue_id': 10,
+        'state': issue_state,
+    }
+    issue_info['fingerprints'] = (
+        sync_utils.get_local_fingerprint(issue_info),
+        sync_utils.get_fingerprint(ticket_state),
+    )
+
+    sync_utils_patch = mock.patch.multiple(
+        sync_utils,
+        iter_issue_batches=mock.MagicMock(
+            return_value=iter([{1: dict(ticket_state)}])),
+        collect_issue_tracker_info=mock.MagicMock(
+            return_value={'1': issue_info}),
+        update_issue=mock.DEFAULT,
+        store_fingerprints=mock.DEFAULT,
+    )
+    cli_patch = mock.patch.object(sync_utils.issues, 'Client')
+    db_patch = mock.patch.object(assessment_sync_job, "db")
+    with sync_utils_patch, cli_patch, db_patch:
+      stats = assessment_sync_job.sync_assessment_attributes()
+      sync_utils.update_issue.assert_not_called()
+      sync_utils.store_fingerprints.assert_called_once_with([])
+    self.assertEqual(stats["fetched"], 1)
+    self.assertEqual(stats["skipped"], 1)
+    self.assertEqual(stats["compared"], 0)
+
+  def test_fingerprint(self):
+    """Tests fingerprint doesn't depend on order of keys."""
+    self.assertEqual(
+        sync_utils.get_fingerprint({'a': 1, 'b': [1, 2]}),
+        sync_utils.get_fingerprint({'b': [1, 2], 'a': 1}),
+    )
+    self.assertNotEqual(
+        sync_utils.get_fingerprint({'a': 1}),
+        sync_utils.get_fingerprint({'a': 2}),
+    )
 
   def test_due_date_equals(self):
     """Due date current and issue tracker equals."""
@@ -21,3 +21,40 @@ class TestBulkIssuesGenerate(TestCase):
       # pylint: disable=protected-access
       self.creator._update_failed_items([])
     list_mock.assert_not_called()
+
+  @mock.patch("ggrc.settings.ISSUE_TRACKER_BULK_SYNC_WORKERS", 4)
+  def test_sync_issues_order(self):
+    """Test concurrent synchronization keeps the order of results."""
+    error = issuetracker_bulk_sync.integrations_errors.Error("error")
+
+    def sync_issue(issue_json, issue_id):
+      del issue_id
+      if issue_json["id"] % 3 == 0:
+        raise error
+      return {"issueId": issue_json["id"]}
+
+    jobs = [({"id": id_}, None) for id_ in range(20)]
+    with mock.patch.object(self.creator, "sync_issue", side_effect=sync_issue):
+      results = self.creator.sync_issues(jobs)
+    self.assertEqual(results, [
+        (None, error) if id_ % 3 == 0 else ({"issueId": id_}, None)
+        for id_ in range(20)
+    ])
+
+  @mock.patch("ggrc.settings.ISSUE_TRACKER_BULK_SYNC_WORKERS", 1)
+  def test_sync_issues_fatal_error(self):
+    """Test issues after a fatal error are skipped."""
+    self.creator.break_on_errs = True
+    error = issuetracker_bulk_sync.integrations_errors.HttpError(
+        issuetracker_bulk_sync.WRONG_COMPONENT_ERR.format(1),
+    )
+    jobs = [({"id": id_, "hotlist_ids": [2], "component_id": 1}, None)
+            for id_ in range(3)]
+    with mock.patch.object(self.creator, "sync_issue",
+                           side_effect=[{"issueId": 0}, error]):
+      results = self.creator.sync_issues(jobs)
+    self.assertEqual(results, [
+        ({"issueId": 0}, None),
+        (None, error),
+        (issuetracker_bulk_sync.SKIPPED, None),
+    ])
@@ -0,0 +1,59 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for Issue Tracker rate limiter."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa pylint: disable=unused-import
+from ggrc.integrations import integrations_errors
+from ggrc.integrations import rate_limiter
+from ggrc.integrations.synchronization_jobs import sync_utils
+
+
+@mock.patch("time.sleep")
+@mock.patch("time.time", return_value=100.0)
+class TestRateLimiter(unittest.TestCase):
+  """Tests for token bucket with adaptive rate."""
+
+  def test_acquire(self, _, sleep):
+    """Test requests over capacity wait for reserved tokens."""
+    limiter = rate_limiter.RateLimiter(rate=2)
+    limiter.acquire()
+    limiter.acquire()
+    sleep.assert_not_called()
+    limiter.acquire()
+    limiter.acquire()
+    self.assertEqual([call[0][0] for call in sleep.call_args_list],
+                     [0.5, 1.0])
+
+  def test_rate_limited(self, _, sleep):
+    """Test rate limited responses slow down requests exponentially."""
+    limiter = rate_limiter.RateLimiter(rate=4)
+    limiter.rate_limited(0, 1)
+    limiter.rate_limited(3, 1)
+    limiter.rate_limited(10, 1)
+    self.assertEqual([call[0][0] for call in sleep.call_args_list],
+                     [1, 8, rate_limiter.RateLimiter.MAX_BACKOFF])
+    self.assertEqual(limiter.rate, 0.5)
+    for _ in range(100):
+      limiter.succeeded()
+    self.assertEqual(limiter.rate, 4)
+
+  def test_create_issue(self, _, sleep):
+    """Test create_issue retries rate limited requests with backoff."""
+    client = mock.Mock()
+    client.create_issue.side_effect = [
+        integrations_errors.HttpError("Rate limited", status=429),
+        integrations_errors.HttpError("Rate limited", status=429),
+        {"issueId": 1},
+    ]
+    limiter = rate_limiter.RateLimiter(rate=100)
+    result = sync_utils.create_issue(client, {}, interval=1,
+                                     rate_limiter=limiter)
+    self.assertEqual(result, {"issueId": 1})
+    # Backoff waits and waits for tokens of the slowed down rate.
+    self.assertEqual([call[0][0] for call in sleep.call_args_list],
+                     [1, 0.02, 2, 0.08])
@@ -0,0 +1,81 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for log JSON of objects tracked by the session cache."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa pylint: disable=unused-import
+from ggrc.models import cache as cache_module
+
+
+class LoggedObject(object):
+  """Object with counted log_json calls."""
+
+  def __init__(self, name):
+    self.name = name
+    self.log_json = mock.Mock(side_effect=lambda: {"name": self.name})
+
+
+def _session(new=(), dirty=(), deleted=()):
+  session = mock.MagicMock(new=set(new), dirty=set(dirty),
+                           deleted=set(deleted))
+  session.is_modified.return_value = True
+  return session
+
+
+@mock.patch.object(cache_module, "preload_log_json")
+class TestCacheLogJson(unittest.TestCase):
+  """Tests for log JSON built once per object state."""
+
+  def setUp(self):
+    self.cache = cache_module.Cache()
+
+  def test_lazy_log_json(self, preload):
+    """Test new and dirty objects are serialized once after the flush."""
+    new, dirty = LoggedObject("new"), LoggedObject("dirty")
+    self.cache.update_before_flush(_session(new=[new], dirty=[dirty]), None)
+    new.log_json.assert_not_called()
+    dirty.log_json.assert_not_called()
+
+    for _ in range(2):
+      self.assertEqual(self.cache.get_log_jsons([new, dirty]),
+                       [{"name": "new"}, {"name": "dirty"}])
+    self.assertEqual(new.log_json.call_count, 1)
+    self.assertEqual(dirty.log_json.call_count, 1)
+    preload.assert_called_with([new, dirty])
+
+  def test_changed_object(self, _):
+    """Test log JSON is built again after a flush with changes."""
+    obj = LoggedObject("first")
+    self.cache.update_before_flush(_session(new=[obj]), None)
+    self.cache.get_log_jsons([obj])
+    obj.name = "second"
+    self.cache.update_before_flush(_session(dirty=[obj]), None)
+    self.assertEqual(self.cache.get_log_jsons([obj]), [{"name": "second"}])
+
+  def test_deleted_object(self, _):
+    """Test deleted objects keep log JSON recorded before deletion."""
+    obj = LoggedObject("deleted")
+    self.cache.update_before_flush(_session(deleted=[obj]), None)
+    obj.name = "changed"
+    self.cache.update_before_flush(_session(deleted=[obj]), None)
+    self.assertEqual(self.cache.get_log_jsons([obj]), [{"name": "deleted"}])
+    self.assertEqual(obj.log_json.call_count, 1)
+
+  def test_orphan_object(self, _):
+    """Test objects deleted as orphans keep log JSON built before flush."""
+    # pylint: disable=protected-access
+    obj = LoggedObject("orphan")
+    obj._sa_instance_state = mock.sentinel.state
+    with mock.patch.object(cache_module, "_is_orphan", return_value=True):
+      self.cache.update_before_flush(_session(dirty=[obj]), None)
+    # Related objects of deleted objects are not available after the flush.
+    obj.name = "emptied"
+    flush_context = mock.Mock()
+    flush_context.is_deleted.return_value = True
+    self.cache.update_after_flush(None, flush_context)
+    self.assertEqual(self.cache.get_log_jsons([obj]), [{"name": "orphan"}])
+    self.assertEqual(obj.log_json.call_count, 1)
@@ -0,0 +1,66 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for process local caches with generation counters."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa pylint: disable=unused-import
+from ggrc.models import all_models
+from ggrc.models import cache_generation
+
+
+@mock.patch.object(cache_generation, "get_generation")
+class TestGenerationCache(unittest.TestCase):
+  """Tests for values rebuilt on generation changes."""
+
+  def setUp(self):
+    self.build = mock.Mock(side_effect=lambda: object())
+    self.cache = cache_generation.GenerationCache("propagation_graph",
+                                                  self.build)
+
+  def test_same_generation(self, get_generation):
+    """Test value is built once for the same generation."""
+    get_generation.return_value = 0
+    value = self.cache.get()
+    self.assertIs(self.cache.get(), value)
+    self.assertEqual(self.build.call_count, 1)
+    get_generation.assert_called_with("propagation_graph")
+
+  def test_changed_generation(self, get_generation):
+    """Test value is built again after the generation changes."""
+    get_generation.return_value = 0
+    value = self.cache.get()
+    get_generation.return_value = 1
+    self.assertIsNot(self.cache.get(), value)
+    self.assertEqual(self.build.call_count, 2)
+
+  def test_unknown_name(self, _):
+    """Test caches can use only known generation counters."""
+    with self.assertRaises(ValueError):
+      cache_generation.GenerationCache("unknown", self.build)
+
+
+class TestChangedGenerations(unittest.TestCase):
+  """Tests for generation counters affected by changed objects."""
+
+  def test_changed_generations(self):
+    """Test only generations of changed models are returned."""
+    self.assertEqual(
+        cache_generation.get_changed_generations([
+            all_models.AccessControlRole(), all_models.Label(),
+        ]),
+        {"propagation_graph"},
+    )
+    self.assertEqual(
+        cache_generation.get_changed_generations([all_models.Label()]),
+        set(),
+    )
+    self.assertEqual(
+        cache_generation.get_changed_generations([
+            all_models.Option(), all_models.CustomAttributeDefinition(),
+        ]),
+        {"snapshot_metadata"},
+    )
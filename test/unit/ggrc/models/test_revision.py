@@ -10,6 +10,7 @@ import ddt
 import mock
 
 from ggrc.models import all_models
+from ggrc.models import types
 
 
 @ddt.ddt
@@ -297,3 +298,24 @@ class TestCheckPopulatedContent(unittest.TestCase):
 
         for acl in revision.content["access_control_list"]:
           self.assertIsNone(acl.get("parent_id"))
+
+
+class TestRevisionContentStorage(unittest.TestCase):
+  """Unittests for lazy decoding of stored revision content."""
+
+  def test_lazy_decoding(self):
+    """Test stored content is decoded once on first access."""
+    obj = mock.Mock()
+    obj.id = 1
+    obj.__class__.__name__ = "Control"
+    revision = all_models.Revision(obj, mock.Mock(), mock.Mock(), {})
+    # pylint: disable=protected-access
+    revision._raw_content = types.compress_json(u'{"title": "Control"}')
+    with mock.patch("ggrc.models.types.decode_json",
+                    wraps=types.decode_json) as decode:
+      self.assertEqual(revision._content, {u"title": u"Control"})
+      self.assertIs(revision._content, revision._content)
+      self.assertEqual(decode.call_count, 1)
+      revision._raw_content = u'{"title": "New"}'
+      self.assertEqual(revision._content, {u"title": u"New"})
+      self.assertEqual(decode.call_count, 2)
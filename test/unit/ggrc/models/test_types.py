@@ -0,0 +1,47 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unittests for custom ORM data types."""
+
+import unittest
+
+import mock
+
+from ggrc.models import types
+
+
+class TestLazyJsonType(unittest.TestCase):
+  """Tests for plain and compressed Json storage."""
+
+  CONTENT = {u"title": u"Control \u2713", u"ids": [1, 2, 3]}
+
+  def test_compressed_roundtrip(self):
+    """Test compressed Json text is decoded to the original value."""
+    text = types.compress_json(u'{"title": "Control \\u2713"}')
+    self.assertTrue(text.startswith(types.COMPRESSED_JSON_PREFIX))
+    self.assertEqual(types.decode_json(text), {u"title": u"Control \u2713"})
+
+  def test_decode_legacy_text(self):
+    """Test plain Json text and decoded values are supported."""
+    self.assertEqual(types.decode_json(u'{"a": 1}'), {u"a": 1})
+    self.assertEqual(types.decode_json(self.CONTENT), self.CONTENT)
+    self.assertIsNone(types.decode_json(None))
+
+  def test_result_value_not_decoded(self):
+    """Test stored text is returned without decoding."""
+    column_type = types.LazyJsonType()
+    self.assertEqual(
+        column_type.process_result_value(u'{"a": 1}', None), u'{"a": 1}'
+    )
+
+  def test_bind_param(self):
+    """Test values are compressed only if compression is enabled."""
+    column_type = types.LazyJsonType()
+    with mock.patch("ggrc.settings.REVISION_CONTENT_COMPRESSION", False):
+      plain = column_type.process_bind_param(self.CONTENT, None)
+    with mock.patch("ggrc.settings.REVISION_CONTENT_COMPRESSION", True):
+      compressed = column_type.process_bind_param(self.CONTENT, None)
+    self.assertFalse(plain.startswith(types.COMPRESSED_JSON_PREFIX))
+    self.assertTrue(compressed.startswith(types.COMPRESSED_JSON_PREFIX))
+    self.assertEqual(types.decode_json(plain), self.CONTENT)
+    self.assertEqual(types.decode_json(compressed), self.CONTENT)
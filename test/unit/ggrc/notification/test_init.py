@@ -4,7 +4,7 @@
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 import unittest
-from mock import patch
+from mock import Mock, patch
 
 from ggrc import app  # noqa
 from ggrc.notifications import common
@@ -14,16 +14,42 @@ class TestNotificationsInit(unittest.TestCase):
 
   @patch("ggrc.notifications.common.deleted_task_rels_cache")
   @patch("ggrc.notifications.common.cycle_tasks_cache")
-  @patch("ggrc.notifications.common.get_filter_data")
-  def test_get_notification_data(self, get_filter_data, *cache_mocks):
+  @patch("ggrc.notifications.common.should_receive", return_value=True)
+  @patch("ggrc.notifications.common.load_people", return_value={})
+  @patch("ggrc.notifications.common.Services.call_service")
+  def test_get_notification_data(self, call_service, *mocks):
     """ Test that data does not contain empty emails """
-    for cache_func in cache_mocks:
+    for cache_func in mocks[2:]:
       cache_func.return_value = {}
 
-    get_filter_data.return_value = {
-        "email@example.com": {},
-        "": {},
+    call_service.side_effect = lambda *_, **__: {
+        "email@example.com": {"user": {"id": 1}},
+        "": {"user": {"id": -1}},
     }
     notification_data = common.get_notification_data([1, 2])
     self.assertIn("email@example.com", notification_data)
     self.assertNotIn("", notification_data)
+
+  @patch("ggrc.notifications.common.deleted_task_rels_cache", return_value={})
+  @patch("ggrc.notifications.common.cycle_tasks_cache", return_value={})
+  @patch("ggrc.notifications.common.load_people")
+  @patch("ggrc.notifications.common.Services.call_service")
+  def test_merge_per_recipient(self, call_service, load_people, *_):
+    """ Test data of all notifications is merged per recipient """
+    person = Mock(system_wide_role="Reader", notification_configs=[])
+    load_people.return_value = {1: person}
+    call_service.side_effect = [
+        {"email@example.com": {"user": {"id": 1}, "a": {1: "first"}}},
+        {"email@example.com": {"user": {"id": 1}, "a": {2: "second"}}},
+    ]
+    notification_data = common.get_notification_data(
+        [Mock(id=1), Mock(id=2)]
+    )
+    self.assertEqual(notification_data, {
+        "email@example.com": {
+            "user": {"id": 1},
+            "a": {1: "first", 2: "second"},
+        },
+    })
+    load_people.assert_called_once()
+    self.assertEqual(list(load_people.call_args[0][0]), [1, 1])
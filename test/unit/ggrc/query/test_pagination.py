@@ -0,0 +1,49 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unittests for keyset pagination helpers."""
+
+import datetime
+import unittest
+
+import ddt
+
+from ggrc import app  # noqa pylint: disable=unused-import
+from ggrc.query import pagination
+from ggrc.query.exceptions import BadQueryException
+
+
+@ddt.ddt
+class TestCursor(unittest.TestCase):
+  """Tests for continuation tokens."""
+
+  ORDER_BY = [{"name": "title", "desc": True}]
+
+  @ddt.data(
+      [1],
+      [u"title", None, 5],
+      [datetime.datetime(2018, 12, 1, 10, 20, 30), 7],
+      [datetime.date(2018, 12, 1), 8],
+  )
+  def test_roundtrip(self, values):
+    """Test cursor values are decoded to original values."""
+    cursor = pagination.encode_cursor(values, self.ORDER_BY)
+    self.assertEqual(pagination.decode_cursor(cursor, self.ORDER_BY), values)
+
+  @ddt.data("", "not a cursor", u"\u2713", "e30=")
+  def test_invalid_cursor(self, cursor):
+    """Test malformed cursor is rejected."""
+    with self.assertRaises(BadQueryException):
+      pagination.decode_cursor(cursor, self.ORDER_BY)
+
+  def test_other_order(self):
+    """Test cursor of another ordering is rejected."""
+    cursor = pagination.encode_cursor([1], self.ORDER_BY)
+    with self.assertRaises(BadQueryException):
+      pagination.decode_cursor(cursor, [{"name": "title"}])
+
+  @ddt.data(0, -1, "x", None)
+  def test_invalid_page_size(self, page_size):
+    """Test page size should be a positive number."""
+    with self.assertRaises(BadQueryException):
+      pagination.get_page_size(page_size)
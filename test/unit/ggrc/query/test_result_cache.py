@@ -0,0 +1,130 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the /query result cache."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa - this is needed for imports to work
+from ggrc.cache import object_cache
+from ggrc.cache import utils as cache_utils
+from ggrc.query import result_cache
+
+
+class FakeMemcacheClient(object):
+  """Dict based memcache client."""
+
+  def __init__(self):
+    self.data = {}
+
+  def get(self, key):
+    return self.data.get(key)
+
+  def add(self, key, value, time=0):
+    # pylint: disable=unused-argument,redefined-outer-name
+    if key in self.data:
+      return False
+    self.data[key] = value
+    return True
+
+  def get_multi(self, keys):
+    return {key: self.data[key] for key in keys if key in self.data}
+
+  def add_multi(self, mapping):
+    for key, value in mapping.iteritems():
+      self.data.setdefault(key, value)
+
+  def incr(self, key, initial_value=0):
+    self.data[key] = self.data.get(key, initial_value) + 1
+    return self.data[key]
+
+
+class TestResultCache(unittest.TestCase):
+  """Tests for keys and storage of cached query results."""
+
+  QUERY = [{
+      "object_name": "Control",
+      "type": "ids",
+      "filters": {"expression": {}},
+  }]
+
+  def setUp(self):
+    self.client = FakeMemcacheClient()
+    patchers = [
+        mock.patch("ggrc.query.result_cache.LOCAL_CACHE",
+                   object_cache.LocalLRUCache(10)),
+        mock.patch("ggrc.query.result_cache._get_client",
+                   return_value=self.client),
+        mock.patch("ggrc.cache.utils.get_cache_manager"),
+        mock.patch.multiple("ggrc.settings",
+                            QUERY_CACHE_ENABLED=True,
+                            MEMCACHE_MECHANISM=True,
+                            QUERY_CACHE_MAX_IDS=3,
+                            create=True),
+    ]
+    for patcher in patchers:
+      patcher.start()
+      self.addCleanup(patcher.stop)
+    cache_manager = cache_utils.get_cache_manager.return_value
+    cache_manager.cache_object.memcache_client = self.client
+
+  def test_uncacheable_queries(self):
+    """Test only ids and count queries get a cache key."""
+    self.assertIsNone(result_cache.get_key(
+        [{"object_name": "Control", "type": "values"}], 1
+    ))
+    self.assertIsNone(result_cache.get_key([], 1))
+    with mock.patch("ggrc.settings.QUERY_CACHE_ENABLED", False):
+      self.assertIsNone(result_cache.get_key(self.QUERY, 1))
+
+  def test_key_is_canonical(self):
+    """Test keys do not depend on the order of keys in the query."""
+    reordered = [dict(reversed(self.QUERY[0].items()))]
+    self.assertEqual(result_cache.get_key(self.QUERY, 1),
+                     result_cache.get_key(reordered, 1))
+    self.assertNotEqual(result_cache.get_key(self.QUERY, 1),
+                        result_cache.get_key(self.QUERY, 2))
+
+  def test_data_changes(self):
+    """Test bumping data generation changes the key."""
+    key = result_cache.get_key(self.QUERY, 1)
+    cache_utils.bump_data_generation()
+    self.assertNotEqual(result_cache.get_key(self.QUERY, 1), key)
+
+  def test_disabled_data_changes(self):
+    """Test data generation is not bumped with disabled query cache."""
+    key = result_cache.get_key(self.QUERY, 1)
+    with mock.patch("ggrc.settings.QUERY_CACHE_ENABLED", False):
+      cache_utils.bump_data_generation()
+    self.assertEqual(result_cache.get_key(self.QUERY, 1), key)
+
+  def test_permission_changes(self):
+    """Test user permission changes change only the key of that user."""
+    keys = [result_cache.get_key(self.QUERY, user_id) for user_id in (1, 2)]
+    self.client.incr(cache_utils.get_user_generation_key(1))
+    self.assertNotEqual(result_cache.get_key(self.QUERY, 1), keys[0])
+    self.assertEqual(result_cache.get_key(self.QUERY, 2), keys[1])
+
+  def test_add_and_get(self):
+    """Test results are found in memcache and in the local cache."""
+    key = result_cache.get_key(self.QUERY, 1)
+    results = [{"ids": [1, 2], "total": 2, "last_modified": None}]
+    stats = result_cache.QUERY_CACHE_STATS
+    self.assertIsNone(result_cache.get(key))
+    result_cache.add(key, results)
+    self.assertEqual(result_cache.get(key), results)
+    local_hits = stats["local_hits"]
+    result_cache.LOCAL_CACHE.clear()
+    memcache_hits = stats["memcache_hits"]
+    self.assertEqual(result_cache.get(key), results)
+    self.assertEqual(stats["memcache_hits"], memcache_hits + 1)
+    self.assertEqual(result_cache.get(key), results)
+    self.assertEqual(stats["local_hits"], local_hits + 1)
+
+  def test_large_results(self):
+    """Test results with too many ids are not stored."""
+    key = result_cache.get_key(self.QUERY, 1)
+    result_cache.add(key, [{"ids": [1, 2, 3, 4], "total": 4}])
+    self.assertIsNone(result_cache.get(key))
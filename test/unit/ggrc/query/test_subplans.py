@@ -0,0 +1,69 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unittests for reuse of query subexpressions."""
+
+import unittest
+
+import mock
+
+from ggrc import app  # noqa pylint: disable=unused-import
+from ggrc.query import subplans
+
+
+def _op(name, left, right):
+  return {"op": {"name": name}, "left": left, "right": right}
+
+
+class TestSubplans(unittest.TestCase):
+  """Tests for canonical keys and subplan cache."""
+
+  A = _op("=", "title", "a")
+  B = _op("=", "title", "b")
+  C = _op("~", "description", "c")
+
+  def _key(self, exp, query=None):
+    object_class = mock.Mock(__name__="Control")
+    return subplans.get_key(exp, object_class, object_class, query or [])
+
+  def test_commutative_key(self):
+    """Test order and nesting of AND operands don't change the key."""
+    self.assertEqual(
+        self._key(_op("AND", _op("AND", self.A, self.B), self.C)),
+        self._key(_op("AND", self.C, _op("AND", self.B, self.A))),
+    )
+    self.assertNotEqual(
+        self._key(_op("AND", self.A, self.B)),
+        self._key(_op("OR", self.A, self.B)),
+    )
+
+  def test_ids_key(self):
+    """Test order and duplicates of ids don't change the key."""
+    relevant = {"op": {"name": "relevant"}, "object_name": "Audit"}
+    self.assertEqual(
+        self._key(dict(relevant, ids=[3, 1, 1])),
+        self._key(dict(relevant, ids=[1, 3])),
+    )
+
+  def test_previous_key(self):
+    """Test references to previous queries are replaced with results."""
+    relevant = {"op": {"name": "relevant"}, "object_name": "__previous__",
+                "ids": [0]}
+    query = [{"object_name": "Audit", "ids": [2, 1]}]
+    self.assertEqual(
+        self._key(relevant, query),
+        self._key(dict(relevant, object_name="Audit", ids=[1, 2])),
+    )
+    self.assertIsNone(self._key(relevant, [{"object_name": "Audit"}]))
+
+  def test_cache(self):
+    """Test equal subexpressions are built once inside of a block."""
+    build = mock.Mock(return_value="filter")
+    with subplans.subplan_cache() as cache:
+      key = self._key(self.A)
+      self.assertEqual(cache.get_or_build(key, build), "filter")
+      self.assertEqual(cache.get_or_build(key, build), "filter")
+      cache.get_or_build(None, build)
+    self.assertEqual(build.call_count, 2)
+    self.assertEqual(cache.trace[0]["reused"], 1)
+    self.assertIsNone(subplans.get_cache())
@@ -61,6 +61,9 @@ class TestGetRevisionsList(TestCase):
       cache_mock.new = new
       cache_mock.deleted = deleted
       cache_mock.dirty = dirty
+      cache_mock.get_log_jsons.side_effect = lambda objects: [
+          obj.log_json() for obj in objects
+      ]
       yield cache_mock
       mock_get_cache.assert_called_once_with()
 